@@ -1,5 +1,5 @@
 import os
-from flask import Flask
+from flask import Flask, jsonify, render_template, request
 from config import config
 
 def create_app(config_name=None):
@@ -10,6 +10,10 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
     
+    # Uploads spool to disk past a threshold and are size-checked while they stream in
+    from app.utils.uploads import configure_uploads
+    configure_uploads(app)
+    
     # Ensure upload folder exists
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
@@ -18,4 +22,11 @@ def create_app(config_name=None):
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    @app.errorhandler(413)
+    def request_too_large(error):
+        message = error.description or "The request is too large."
+        if request.path.startswith('/api/'):
+            return jsonify({"error": message}), 413
+        return render_template('errors/413.html', message=message), 413
+    
     return app
\ No newline at end of file
@@ -4,4 +4,5 @@ main_bp = Blueprint('main', __name__)
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
 # Import routes after Blueprint creation to avoid circular imports
-from .main import main_bp
\ No newline at end of file
+from .main import main_bp
+from .api import api_bp
\ No newline at end of file
@@ -1,13 +1,12 @@
-from flask import Blueprint, request, jsonify, current_app
-from app.services import JobScraper, OpenAIService
-from app.utils.validators import validate_url
+import json
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context, url_for
+from app.services import resume_service, scraper, job_cache, resume_cache, openai_service, task_queue, document_executor
+from app.services.task_queue import QUEUED, public_record
+from app.utils.validators import validate_url, validate_callback_url
 
 # Create API blueprint
 api_bp = Blueprint('api', __name__)
 
-# Initialize services
-web_scraper = JobScraper()
-
 @api_bp.route("/extract-job", methods=["POST"])
 def extract_job_description():
     """API endpoint to extract job description from URL."""
@@ -22,14 +21,14 @@ def extract_job_description():
         if not validate_url(url):
             return jsonify({"error": "Invalid URL format"}), 400
         
-        job_description = web_scraper.extract_job_description_from_url(url)
+        result = resume_service.process_job_url(url)
         
-        if job_description.startswith("Error") or job_description.startswith("Could not extract"):
-            return jsonify({"error": job_description}), 400
+        if not result["success"]:
+            return jsonify({"error": result["message"]}), 400
         
         return jsonify({
             "success": True,
-            "job_description": job_description,
+            "job_description": result["job_description"],
             "url": url
         })
         
@@ -37,6 +36,46 @@ def extract_job_description():
         current_app.logger.error(f"Error in extract_job_description: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@api_bp.route("/extract-jobs", methods=["POST"])
+def extract_job_descriptions():
+    """API endpoint to extract many job descriptions concurrently.
+
+    Returns all results at once, or streams one JSON object per line as each
+    URL finishes when called with ?stream=1.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('urls'), list) or not data['urls']:
+            return jsonify({"error": "A non-empty list of URLs is required"}), 400
+        
+        max_urls = current_app.config['BATCH_MAX_URLS']
+        if len(data['urls']) > max_urls:
+            return jsonify({"error": f"At most {max_urls} URLs can be extracted at once"}), 400
+        
+        urls = [str(url).strip() for url in data['urls']]
+        invalid = [url for url in urls if not validate_url(url)]
+        if invalid:
+            return jsonify({"error": "Invalid URL format", "invalid_urls": invalid}), 400
+        
+        if request.args.get('stream'):
+            def generate():
+                for index, result in resume_service.iter_process_job_urls(urls):
+                    yield json.dumps({"index": index, "url": urls[index], **result}) + "\n"
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        results = resume_service.process_job_urls(urls)
+        
+        return jsonify({
+            "success": all(result["success"] for result in results),
+            "results": [{"url": url, **result} for url, result in zip(urls, results)]
+        })
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in extract_job_descriptions: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
 @api_bp.route("/tailor-resume", methods=["POST"])
 def tailor_resume_api():
     """API endpoint for resume tailoring."""
@@ -47,27 +86,97 @@ def tailor_resume_api():
         if not data or not all(field in data for field in required_fields):
             return jsonify({"error": "resume_text and job_description are required"}), 400
         
-        openai_service = OpenAIService(current_app.config['OPENAI_API_KEY'])
+        callback_url = data.get('callback_url')
+        if callback_url and not validate_callback_url(callback_url, current_app.config['TASK_CALLBACK_ALLOWED_HOSTS']):
+            return jsonify({"error": "callback_url must be an https URL on an allowed, public host"}), 400
         
-        success, result = openai_service.tailor_resume(
-            data['resume_text'], 
-            data['job_description'],
-            temperature=data.get('temperature', 0.7),
-            max_tokens=data.get('max_tokens', 1000)
+        # Runs on the task queue; poll the status URL or wait for the callback.
+        # API clients retry and double-submit, so identical requests are answered from the completion cache.
+        task_id = task_queue.submit(
+            'tailor_resume',
+            callback_url=callback_url,
+            resume_text=data['resume_text'],
+            job_description=data['job_description'],
+            use_cache=True
         )
         
-        if not success:
-            return jsonify({"error": result}), 500
-        
         return jsonify({
             "success": True,
-            "tailored_resume": result
-        })
+            "task_id": task_id,
+            "status": QUEUED,
+            "status_url": url_for('api.task_status', task_id=task_id)
+        }), 202
         
     except Exception as e:
         current_app.logger.error(f"Error in tailor_resume_api: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@api_bp.route("/tasks/<task_id>", methods=["GET"])
+def task_status(task_id):
+    """Status of a background task, with its result or error once it has finished."""
+    task = task_queue.get(task_id)
+    if task is None:
+        return jsonify({"error": "Task not found or expired"}), 404
+    return jsonify(public_record(task))
+
+@api_bp.route("/task-stats", methods=["GET"])
+def task_stats():
+    """Background tasks by status."""
+    return jsonify(task_queue.stats())
+
+@api_bp.route("/generate-bundle", methods=["POST"])
+def generate_bundle_api():
+    """Tailored resume, cover letter and fit analysis for one job in a single call."""
+    try:
+        data = request.get_json()
+        
+        if not data or not data.get('resume_text'):
+            return jsonify({"error": "resume_text is required"}), 400
+        if not data.get('job_description') and not data.get('job_url'):
+            return jsonify({"error": "job_description or job_url is required"}), 400
+        
+        result = resume_service.generate_application_bundle(
+            data['resume_text'],
+            job_description=data.get('job_description'),
+            job_url=data.get('job_url'),
+            company_name=data.get('company_name'),
+            use_cache=True
+        )
+        
+        if not result["success"]:
+            # 502 when the model's reply was the problem, 400 for a job URL or description we could not use
+            return jsonify({"error": result["message"]}), 502 if result.get("upstream_error") else 400
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in generate_bundle_api: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@api_bp.route("/selector-stats", methods=["GET"])
+def selector_stats():
+    """Per-site selector tries and hits, for pruning selectors that never match."""
+    return jsonify(scraper.selector_stats())
+
+@api_bp.route("/cache-stats", methods=["GET"])
+def cache_stats():
+    """Hit rates of the job description, resume text and completion caches."""
+    return jsonify({
+        "job_descriptions": job_cache.stats(),
+        "resume_texts": resume_cache.stats(),
+        "completions": openai_service.cache_stats()
+    })
+
+@api_bp.route("/openai-stats", methods=["GET"])
+def openai_stats():
+    """In-flight, queued and retried OpenAI calls for this worker."""
+    return jsonify(openai_service.client_stats())
+
+@api_bp.route("/document-stats", methods=["GET"])
+def document_stats():
+    """Completed, failed, timed-out and crashed document parsing/rendering tasks."""
+    return jsonify(document_executor.stats())
+
 @api_bp.route("/health", methods=["GET"])
 def api_health():
     """API health check."""
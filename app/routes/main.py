@@ -1,7 +1,10 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
-from app.services import resume_service
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, Response, stream_with_context
+from app.services import resume_service, task_queue
+from app.services.task_queue import SUCCEEDED, FAILED
+import json
 import logging
 import os
+from werkzeug.exceptions import HTTPException
 
 main_bp = Blueprint('main', __name__)
 logger = logging.getLogger(__name__)
@@ -24,73 +27,119 @@ def index():
 def generate():
     return render_template('generate.html')
 
+def _resume_form():
+    """Read and validate the resume form; returns (fields, error message)"""
+    # Collect user information
+    user_info = {
+        'full_name': request.form.get('full_name', '').strip(),
+        'email': request.form.get('email', '').strip(),
+        'phone': request.form.get('phone', '').strip(),
+        'location': request.form.get('location', '').strip(),
+        'linkedin': request.form.get('linkedin', '').strip(),
+        'professional_summary': request.form.get('professional_summary', '').strip(),
+        'work_experience': request.form.get('work_experience', '').strip(),
+        'education': request.form.get('education', '').strip(),
+        'skills': request.form.get('skills', '').strip(),
+    }
+    
+    # Validate required fields
+    required_fields = ['full_name', 'email', 'professional_summary', 'work_experience', 'education']
+    error = _validate_form(user_info, required_fields)
+    if error:
+        return None, error
+    
+    # Format user info for AI
+    formatted_user_info = f"""
+    Name: {user_info['full_name']}
+    Email: {user_info['email']}
+    Phone: {user_info['phone']}
+    Location: {user_info['location']}
+    LinkedIn: {user_info['linkedin']}
+    
+    Professional Summary:
+    {user_info['professional_summary']}
+    
+    Work Experience:
+    {user_info['work_experience']}
+    
+    Education:
+    {user_info['education']}
+    
+    Skills:
+    {user_info['skills']}
+    """
+    
+    return _with_job_fields({'user_info': formatted_user_info}), None
+
+def _cover_letter_form():
+    """Read and validate the cover letter form; returns (fields, error message)"""
+    # Collect user information
+    user_info = {
+        'full_name': request.form.get('full_name', '').strip(),
+        'email': request.form.get('email', '').strip(),
+        'phone': request.form.get('phone', '').strip(),
+        'company_name': request.form.get('company_name', '').strip(),
+        'background_summary': request.form.get('background_summary', '').strip(),
+        'key_achievements': request.form.get('key_achievements', '').strip(),
+    }
+    
+    # Validate required fields
+    required_fields = ['full_name', 'email', 'background_summary']
+    error = _validate_form(user_info, required_fields)
+    if error:
+        return None, error
+    
+    # Format user info for AI
+    formatted_user_info = f"""
+    Name: {user_info['full_name']}
+    Email: {user_info['email']}
+    Phone: {user_info['phone']}
+    
+    Professional Background:
+    {user_info['background_summary']}
+    
+    Key Achievements:
+    {user_info['key_achievements']}
+    """
+    
+    fields = {
+        'user_info': formatted_user_info,
+        'company_name': user_info['company_name'] if user_info['company_name'] else None
+    }
+    return _with_job_fields(fields), None
+
+def _validate_form(user_info, required_fields):
+    missing_fields = [field for field in required_fields if not user_info[field]]
+    if missing_fields:
+        return f'Please fill in required fields: {", ".join(missing_fields)}'
+    
+    if not request.form.get('job_description', '').strip() and not request.form.get('job_url', '').strip():
+        return 'Please provide either a job description or a job URL'
+    return None
+
+def _with_job_fields(fields):
+    # Get job information
+    job_description = request.form.get('job_description', '').strip()
+    job_url = request.form.get('job_url', '').strip()
+    fields['job_description'] = job_description if job_description else None
+    fields['job_url'] = job_url if job_url else None
+    return fields
+
 @main_bp.route('/generate-resume', methods=['POST'])
 def generate_resume():
     try:
-        # Collect user information
-        user_info = {
-            'full_name': request.form.get('full_name', '').strip(),
-            'email': request.form.get('email', '').strip(),
-            'phone': request.form.get('phone', '').strip(),
-            'location': request.form.get('location', '').strip(),
-            'linkedin': request.form.get('linkedin', '').strip(),
-            'professional_summary': request.form.get('professional_summary', '').strip(),
-            'work_experience': request.form.get('work_experience', '').strip(),
-            'education': request.form.get('education', '').strip(),
-            'skills': request.form.get('skills', '').strip(),
-        }
-        
-        # Get job information
-        job_description = request.form.get('job_description', '').strip()
-        job_url = request.form.get('job_url', '').strip()
-        
-        # Validate required fields
-        required_fields = ['full_name', 'email', 'professional_summary', 'work_experience', 'education']
-        missing_fields = [field for field in required_fields if not user_info[field]]
-        
-        if missing_fields:
-            flash(f'Please fill in required fields: {", ".join(missing_fields)}', 'error')
-            return redirect(url_for('main.generate'))
-        
-        if not job_description and not job_url:
-            flash('Please provide either a job description or a job URL', 'error')
+        fields, error = _resume_form()
+        if error:
+            flash(error, 'error')
             return redirect(url_for('main.generate'))
         
-        # Format user info for AI
-        formatted_user_info = f"""
-        Name: {user_info['full_name']}
-        Email: {user_info['email']}
-        Phone: {user_info['phone']}
-        Location: {user_info['location']}
-        LinkedIn: {user_info['linkedin']}
-        
-        Professional Summary:
-        {user_info['professional_summary']}
-        
-        Work Experience:
-        {user_info['work_experience']}
-        
-        Education:
-        {user_info['education']}
-        
-        Skills:
-        {user_info['skills']}
-        """
-        
-        # Generate resume using AI
-        result = resume_service.generate_tailored_resume(
-            user_info=formatted_user_info,
-            job_description=job_description if job_description else None,
-            job_url=job_url if job_url else None
-        )
-        
-        if result["success"]:
-            result["type"] = "resume"
-            return render_template('generated_result.html', result=result)
-        else:
-            flash(result["message"], 'error')
-            return redirect(url_for('main.generate'))
+        # Generate resume using AI in the background; the task page shows it when ready
+        task_id = task_queue.submit('generate_resume', **fields)
+        return redirect(url_for('main.task_status', task_id=task_id))
     
+    except HTTPException:
+        # e.g. 413 from an oversized upload, raised when the form is first read
+        raise
     except Exception as e:
         logger.error(f"Error in generate_resume route: {str(e)}")
         flash(f'An unexpected error occurred: {str(e)}', 'error')
@@ -99,65 +148,130 @@ def generate_resume():
 @main_bp.route('/generate-cover-letter', methods=['POST'])
 def generate_cover_letter():
     try:
-        # Collect user information
-        user_info = {
-            'full_name': request.form.get('full_name', '').strip(),
-            'email': request.form.get('email', '').strip(),
-            'phone': request.form.get('phone', '').strip(),
-            'company_name': request.form.get('company_name', '').strip(),
-            'background_summary': request.form.get('background_summary', '').strip(),
-            'key_achievements': request.form.get('key_achievements', '').strip(),
-        }
-        
-        # Get job information
-        job_description = request.form.get('job_description', '').strip()
-        job_url = request.form.get('job_url', '').strip()
-        
-        # Validate required fields
-        required_fields = ['full_name', 'email', 'background_summary']
-        missing_fields = [field for field in required_fields if not user_info[field]]
-        
-        if missing_fields:
-            flash(f'Please fill in required fields: {", ".join(missing_fields)}', 'error')
+        fields, error = _cover_letter_form()
+        if error:
+            flash(error, 'error')
             return redirect(url_for('main.generate'))
         
-        if not job_description and not job_url:
-            flash('Please provide either a job description or a job URL', 'error')
-            return redirect(url_for('main.generate'))
-        
-        # Format user info for AI
-        formatted_user_info = f"""
-        Name: {user_info['full_name']}
-        Email: {user_info['email']}
-        Phone: {user_info['phone']}
-        
-        Professional Background:
-        {user_info['background_summary']}
-        
-        Key Achievements:
-        {user_info['key_achievements']}
-        """
-        
-        # Generate cover letter using AI
-        result = resume_service.generate_cover_letter(
-            user_info=formatted_user_info,
-            job_description=job_description if job_description else None,
-            job_url=job_url if job_url else None,
-            company_name=user_info['company_name'] if user_info['company_name'] else None
-        )
-        
-        if result["success"]:
-            result["type"] = "cover letter"
-            return render_template('generated_result.html', result=result)
-        else:
-            flash(result["message"], 'error')
-            return redirect(url_for('main.generate'))
+        # Generate cover letter using AI in the background; the task page shows it when ready
+        task_id = task_queue.submit('generate_cover_letter', **fields)
+        return redirect(url_for('main.task_status', task_id=task_id))
     
+    except HTTPException:
+        # e.g. 413 from an oversized upload, raised when the form is first read
+        raise
     except Exception as e:
         logger.error(f"Error in generate_cover_letter route: {str(e)}")
         flash(f'An unexpected error occurred: {str(e)}', 'error')
         return redirect(url_for('main.generate'))
 
+# Result type shown on the result page for each generation task
+TASK_RESULT_TYPES = {
+    'generate_resume': 'resume',
+    'generate_cover_letter': 'cover letter',
+}
+
+@main_bp.route('/tasks/<task_id>', methods=['GET'])
+def task_status(task_id):
+    """Waiting page for a background generation, replaced by the result once it finishes"""
+    task = task_queue.get(task_id)
+    if task is None or task['name'] not in TASK_RESULT_TYPES:
+        flash('That generation was not found or has expired. Please try again.', 'error')
+        return redirect(url_for('main.generate'))
+    
+    if task['status'] == FAILED:
+        flash(f'An unexpected error occurred: {task["error"]}', 'error')
+        return redirect(url_for('main.generate'))
+    
+    if task['status'] != SUCCEEDED:
+        return render_template('task_pending.html', task=task, result_type=TASK_RESULT_TYPES[task['name']])
+    
+    result = task['result']
+    if result["success"]:
+        result["type"] = TASK_RESULT_TYPES[task['name']]
+        return render_template('generated_result.html', result=result)
+    else:
+        flash(result["message"], 'error')
+        return redirect(url_for('main.generate'))
+
+@main_bp.route('/generate-resume/stream', methods=['POST'])
+def generate_resume_stream():
+    """Server-sent events version of /generate-resume: tokens are pushed as the model writes them"""
+    fields, error = _resume_form()
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+    
+    def stream(job_description):
+        return resume_service.openai_service.stream_resume(fields['user_info'], job_description)
+    
+    return _event_stream(fields, stream, 'resume')
+
+@main_bp.route('/generate-cover-letter/stream', methods=['POST'])
+def generate_cover_letter_stream():
+    """Server-sent events version of /generate-cover-letter"""
+    fields, error = _cover_letter_form()
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+    
+    def stream(job_description):
+        return resume_service.openai_service.stream_cover_letter(
+            fields['user_info'], job_description, fields['company_name']
+        )
+    
+    return _event_stream(fields, stream, 'cover letter')
+
+def _event_stream(fields, stream, result_type):
+    """Relay text chunks as SSE: meta, one data event per chunk, then done or error.
+
+    The job URL is scraped inside the stream, behind a progress event, so the
+    browser hears back at once instead of waiting on the job site.
+    """
+    def events():
+        yield _sse({"type": result_type}, event='meta')
+        if fields['job_url'] and not fields['job_description']:
+            yield _sse({"message": "Fetching the job posting..."}, event='progress')
+        try:
+            prepared = resume_service.prepare_generation(fields['job_description'], fields['job_url'])
+            if not prepared["success"]:
+                yield _sse({"message": prepared["message"]}, event='error')
+                return
+            job_description = prepared["job_description"]
+            yield _sse({"job_description": job_description}, event='meta')
+            for chunk in stream(job_description):
+                yield _sse({"text": chunk})
+        except Exception as e:
+            logger.error(f"Error streaming {result_type}: {str(e)}")
+            yield _sse({"message": str(e)}, event='error')
+            return
+        yield _sse({"success": True}, event='done')
+    
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def _sse(data, event=None):
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+@main_bp.route('/generated-result', methods=['POST'])
+def generated_result():
+    """Render text assembled from a stream on the usual result page"""
+    result_type = request.form.get('type', 'resume')
+    content = request.form.get('content', '').strip()
+    result = {
+        "success": bool(content),
+        "type": result_type,
+        "job_description": request.form.get('job_description', ''),
+        "message": f"{result_type.capitalize()} generated successfully!" if content else "Nothing was generated",
+    }
+    if result_type == 'resume':
+        result["generated_resume"] = content
+    else:
+        result["generated_cover_letter"] = content
+    return render_template('generated_result.html', result=result)
+
 @main_bp.route('/process', methods=['POST'])
 def process():
     try:
@@ -205,6 +319,9 @@ def process():
                 flash(result["message"], 'error')
                 return redirect(url_for('main.index'))
         
+    except HTTPException:
+        # e.g. 413 from an oversized upload, raised when the form is first read
+        raise
     except Exception as e:
         logger.error(f"Error in process route: {str(e)}")
         flash(f'An unexpected error occurred: {str(e)}', 'error')
@@ -1,10 +1,120 @@
+from functools import partial
+from config import Config
+from app.services.http_client import PooledHttpClient
+from app.services.rate_limiter import HostRateLimiter, SqliteRateLimitBackend
+from app.services.debug_capture import DebugHtmlWriter
 from app.services.scraper import JobScraper
+from app.services.job_cache import JobDescriptionCache
+from app.services.completion_cache import CompletionCache
+from app.services.resume_text_cache import ResumeTextCache
 from app.services.document_service import DocumentService
+from app.services.document_executor import DocumentExecutor
+from app.utils.pdf_render import warm_up as warm_up_pdf_layouts
 from app.services.resume_service import ResumeService
+from app.services.task_queue import TaskQueue, MemoryTaskStore, SqliteTaskStore
+from app.utils.validators import validate_callback_url
+from app.services.openai_client import OpenAIClientManager, AsyncOpenAIClientManager
+from app.services.prompt_budget import PromptBudget
 from app.services.openai_service import OpenAIService
+from app.services.async_openai_service import AsyncOpenAIService
 
 # Create instances of services
-scraper = JobScraper()
-document_service = DocumentService()
-openai_service = OpenAIService()
-resume_service = ResumeService(scraper, document_service, openai_service)
\ No newline at end of file
+http_client = PooledHttpClient(
+    pool_connections=Config.SCRAPER_POOL_CONNECTIONS,
+    pool_maxsize=Config.SCRAPER_POOL_MAXSIZE,
+    max_retries=Config.SCRAPER_MAX_RETRIES,
+    backoff_factor=Config.SCRAPER_RETRY_BACKOFF,
+)
+rate_limiter = HostRateLimiter(
+    min_interval=Config.SCRAPER_HOST_MIN_INTERVAL,
+    burst=Config.SCRAPER_HOST_BURST,
+    backend=SqliteRateLimitBackend(Config.SCRAPER_RATE_LIMIT_DB) if Config.SCRAPER_RATE_LIMIT_DB else None,
+)
+scraper = JobScraper(
+    http_client,
+    rate_limiter,
+    batch_workers=Config.SCRAPER_BATCH_WORKERS,
+    per_host_limit=Config.SCRAPER_PER_HOST_CONCURRENCY,
+    debug_writer=DebugHtmlWriter(
+        mode=Config.SCRAPER_DEBUG_HTML,
+        sample_every=Config.SCRAPER_DEBUG_SAMPLE_EVERY,
+        debug_dir=Config.SCRAPER_DEBUG_DIR,
+        max_files=Config.SCRAPER_DEBUG_MAX_FILES,
+        max_bytes=Config.SCRAPER_DEBUG_MAX_BYTES,
+    ),
+)
+job_cache = JobDescriptionCache(
+    ttl=Config.JOB_CACHE_TTL,
+    stale_ttl=Config.JOB_CACHE_STALE_TTL,
+    max_entries=Config.JOB_CACHE_MAX_ENTRIES,
+    db_path=Config.JOB_CACHE_DB,
+    disk_max_entries=Config.JOB_CACHE_DB_MAX_ENTRIES,
+)
+# Parsing and PDF rendering run in worker processes, off the web worker's GIL
+document_executor = DocumentExecutor(
+    workers=Config.DOCUMENT_WORKERS,
+    timeout=Config.DOCUMENT_TASK_TIMEOUT,
+    max_pending=Config.DOCUMENT_MAX_PENDING,
+    max_tasks_per_child=Config.DOCUMENT_MAX_TASKS_PER_CHILD,
+    initializer=warm_up_pdf_layouts,
+)
+document_service = DocumentService(
+    pdf_max_pages=Config.PDF_MAX_PAGES,
+    pdf_max_chars=Config.PDF_MAX_CHARS,
+    executor=document_executor,
+    pdf_layout=Config.PDF_LAYOUT,
+)
+completion_cache = CompletionCache(
+    ttl=Config.COMPLETION_CACHE_TTL,
+    max_entries=Config.COMPLETION_CACHE_MAX_ENTRIES,
+    db_path=Config.COMPLETION_CACHE_DB,
+    disk_max_entries=Config.COMPLETION_CACHE_DB_MAX_ENTRIES,
+)
+openai_client = OpenAIClientManager(
+    api_key=Config.OPENAI_API_KEY,
+    base_url=Config.OPENAI_BASE_URL,
+    max_concurrency=Config.OPENAI_MAX_CONCURRENCY,
+    max_retries=Config.OPENAI_MAX_RETRIES,
+    backoff_base=Config.OPENAI_BACKOFF_BASE,
+    backoff_max=Config.OPENAI_BACKOFF_MAX,
+    timeout=Config.OPENAI_TIMEOUT,
+)
+prompt_budget = PromptBudget({
+    'tailor_resume': Config.PROMPT_BUDGET_TAILOR_RESUME,
+    'generate_resume': Config.PROMPT_BUDGET_GENERATE_RESUME,
+    'generate_cover_letter': Config.PROMPT_BUDGET_COVER_LETTER,
+    'analyze_resume_fit': Config.PROMPT_BUDGET_ANALYZE_FIT,
+    'generate_bundle': Config.PROMPT_BUDGET_BUNDLE,
+})
+openai_service = OpenAIService(completion_cache, openai_client, prompt_budget)
+# For asyncio callers (an ASGI app, batch jobs); bound to the first event loop that uses it
+async_openai_service = AsyncOpenAIService(completion_cache, AsyncOpenAIClientManager(
+    api_key=Config.OPENAI_API_KEY,
+    base_url=Config.OPENAI_BASE_URL,
+    max_concurrency=Config.OPENAI_ASYNC_MAX_CONCURRENCY,
+    max_retries=Config.OPENAI_MAX_RETRIES,
+    backoff_base=Config.OPENAI_BACKOFF_BASE,
+    backoff_max=Config.OPENAI_BACKOFF_MAX,
+    timeout=Config.OPENAI_TIMEOUT,
+), prompt_budget)
+resume_cache = ResumeTextCache(
+    ttl=Config.RESUME_CACHE_TTL,
+    max_entries=Config.RESUME_CACHE_MAX_ENTRIES,
+    db_path=Config.RESUME_CACHE_DB,
+    disk_max_entries=Config.RESUME_CACHE_DB_MAX_ENTRIES,
+)
+resume_service = ResumeService(
+    scraper, document_service, openai_service, job_cache,
+    stage_workers=Config.RESUME_STAGE_WORKERS or document_executor.max_pending, resume_cache=resume_cache
+)
+# Long-running generations run here so web workers return immediately
+task_queue = TaskQueue(
+    SqliteTaskStore(Config.TASK_STORE_DB, ttl=Config.TASK_RESULT_TTL, max_records=Config.TASK_MAX_RECORDS)
+    if Config.TASK_STORE_DB else MemoryTaskStore(ttl=Config.TASK_RESULT_TTL, max_records=Config.TASK_MAX_RECORDS),
+    workers=Config.TASK_WORKERS,
+    task_timeout=Config.TASK_TIMEOUT,
+    callback_validator=partial(validate_callback_url, allowed_hosts=Config.TASK_CALLBACK_ALLOWED_HOSTS),
+)
+task_queue.register('generate_resume', resume_service.generate_tailored_resume)
+task_queue.register('generate_cover_letter', resume_service.generate_cover_letter)
+task_queue.register('tailor_resume', openai_service.tailor_resume)
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import logging
+from app.services import prompts
+from app.services.openai_client import AsyncOpenAIClientManager
+
+class AsyncOpenAIService:
+    """asyncio version of OpenAIService: same prompts, cache and errors, awaitable methods"""
+
+    def __init__(self, completion_cache=None, client_manager=None, prompt_budget=None):
+        self.client_manager = client_manager or AsyncOpenAIClientManager(api_key=os.getenv('OPENAI_API_KEY'))
+        self.completion_cache = completion_cache
+        self.prompt_budget = prompt_budget
+        self.logger = logging.getLogger(__name__)
+
+    async def tailor_resume(self, resume_text, job_description, use_cache=False):
+        """Tailor existing resume content based on job description"""
+        try:
+            resume_text, job_description = self._fit('tailor_resume', resume_text, job_description)
+            return await self._complete(prompts.tailor_resume(resume_text, job_description), use_cache)
+        except Exception as e:
+            self.logger.error(f"Error tailoring resume with OpenAI: {str(e)}")
+            raise ValueError(f"Error processing resume with AI: {str(e)}")
+
+    async def generate_resume(self, user_info, job_description, use_cache=False):
+        """Generate a new resume from scratch based on user info and job description"""
+        try:
+            user_info, job_description = self._fit('generate_resume', user_info, job_description)
+            return await self._complete(prompts.generate_resume(user_info, job_description), use_cache)
+        except Exception as e:
+            self.logger.error(f"Error generating resume with OpenAI: {str(e)}")
+            raise ValueError(f"Error generating resume with AI: {str(e)}")
+
+    async def generate_cover_letter(self, user_info, job_description, company_name=None, use_cache=False):
+        """Generate a cover letter based on user info and job description"""
+        try:
+            user_info, job_description = self._fit('generate_cover_letter', user_info, job_description)
+            return await self._complete(
+                prompts.generate_cover_letter(user_info, job_description, company_name), use_cache
+            )
+        except Exception as e:
+            self.logger.error(f"Error generating cover letter with OpenAI: {str(e)}")
+            raise ValueError(f"Error generating cover letter with AI: {str(e)}")
+
+    async def analyze_resume_fit(self, resume_text, job_description, use_cache=True):
+        """Analyze how well a resume fits a job and provide improvement suggestions"""
+        try:
+            resume_text, job_description = self._fit('analyze_resume_fit', resume_text, job_description)
+            return await self._complete(prompts.analyze_resume_fit(resume_text, job_description), use_cache)
+        except Exception as e:
+            self.logger.error(f"Error analyzing resume fit with OpenAI: {str(e)}")
+            raise ValueError(f"Error analyzing resume with AI: {str(e)}")
+
+    async def generate_bundle(self, resume_text, job_description, company_name=None, use_cache=False):
+        """Tailored resume, cover letter and fit analysis from one JSON-mode completion.
+
+        A reply cut off at max_tokens is not valid JSON, so the documents are
+        then generated by separate calls, each with its own token budget.
+        """
+        try:
+            fitted_resume, fitted_job = self._fit('generate_bundle', resume_text, job_description)
+            request = prompts.generate_bundle(fitted_resume, fitted_job, company_name)
+            try:
+                content = await self._complete(request, use_cache, allow_truncated=False)
+            except prompts.TruncatedCompletion as e:
+                self.logger.warning(f"{str(e)}; generating the bundle's documents separately")
+                return await self._bundle_separately(resume_text, job_description, company_name, use_cache)
+            return prompts.parse_bundle(content)
+        except Exception as e:
+            self.logger.error(f"Error generating application bundle with OpenAI: {str(e)}")
+            raise ValueError(f"Error generating application bundle with AI: {str(e)}")
+
+    async def _bundle_separately(self, resume_text, job_description, company_name, use_cache):
+        tailored_resume, cover_letter, fit_analysis = await asyncio.gather(
+            self.tailor_resume(resume_text, job_description, use_cache),
+            self.generate_cover_letter(resume_text, job_description, company_name, use_cache),
+            self.analyze_resume_fit(resume_text, job_description, use_cache),
+        )
+        return {"tailored_resume": tailored_resume, "cover_letter": cover_letter, "fit_analysis": fit_analysis}
+
+    def stream_tailored_resume(self, resume_text, job_description):
+        """Async-iterate a tailored resume piece by piece as the model produces it"""
+        resume_text, job_description = self._fit('tailor_resume', resume_text, job_description)
+        return self._stream(
+            prompts.tailor_resume(resume_text, job_description),
+            "Error processing resume with AI"
+        )
+
+    def stream_resume(self, user_info, job_description):
+        """Async-iterate a newly generated resume piece by piece as the model produces it"""
+        user_info, job_description = self._fit('generate_resume', user_info, job_description)
+        return self._stream(
+            prompts.generate_resume(user_info, job_description),
+            "Error generating resume with AI"
+        )
+
+    def stream_cover_letter(self, user_info, job_description, company_name=None):
+        """Async-iterate a cover letter piece by piece as the model produces it"""
+        user_info, job_description = self._fit('generate_cover_letter', user_info, job_description)
+        return self._stream(
+            prompts.generate_cover_letter(user_info, job_description, company_name),
+            "Error generating cover letter with AI"
+        )
+
+    def _fit(self, method, text, job_description):
+        """Compress and trim the prompt inputs to the method's token budget, if one is set"""
+        if self.prompt_budget is None:
+            return text, job_description
+        return self.prompt_budget.fit(method, text, job_description)
+
+    async def _complete(self, request, use_cache=False, allow_truncated=True):
+        """Run one chat completion and return its text, going through the cache when asked.
+
+        A reply cut off at max_tokens is never cached, and raises
+        TruncatedCompletion unless allow_truncated.
+        """
+        cache = self.completion_cache if use_cache else None
+        if cache is not None:
+            # The SQLite tier does blocking file I/O, so it runs off the event loop
+            cached = await asyncio.to_thread(cache.get, request)
+            if cached is not None:
+                self.logger.info(f"Completion cache hit for {request['model']}")
+                return cached
+
+        response = await self.client_manager.complete(request)
+        choice = response.choices[0]
+        text = choice.message.content.strip()
+        if choice.finish_reason == 'length':
+            if not allow_truncated:
+                raise prompts.TruncatedCompletion(f"Completion stopped at max_tokens={request['max_tokens']}")
+            return text
+        if cache is not None:
+            await asyncio.to_thread(cache.set, request, text)
+        return text
+
+    async def _stream(self, request, error_prefix):
+        """Run a streaming chat completion, yielding text deltas as they arrive"""
+        try:
+            async for chunk in self.client_manager.stream(request):
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            self.logger.error(f"{error_prefix}: {str(e)}")
+            raise ValueError(f"{error_prefix}: {str(e)}")
+
+    def client_stats(self):
+        """Concurrency and retry counters of the shared async client"""
+        return self.client_manager.stats()
+
+    async def aclose(self):
+        """Close the running event loop's connections; call before the loop ends"""
+        await self.client_manager.aclose()
@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import statistics
+import time
+
+class BatchTailorPipeline:
+    """Tailors resumes for a JSONL file of jobs, offline, with bounded concurrency.
+
+    Each input line is a JSON object with an optional "id", a "job_description"
+    (or a "job_url" to scrape) and an optional "resume_text" (defaults to the
+    master resume). Results are appended to the output JSONL as they finish,
+    which doubles as the checkpoint: a rerun skips every id already recorded
+    as successful. Ids must be unique; a
+    repeated id is skipped and counted under "duplicates".
+    """
+
+    def __init__(self, openai_service, document_service=None, resume_service=None, concurrency=8, write_pdfs=True,
+                 pdf_layout=None):
+        self.logger = logging.getLogger(__name__)
+        self.openai_service = openai_service
+        self.document_service = document_service
+        self.resume_service = resume_service
+        self.concurrency = max(1, concurrency)
+        self.write_pdfs = write_pdfs and document_service is not None
+        self.pdf_layout = pdf_layout
+
+    def run(self, input_path, output_path, resume_text=None, retry_failed=True):
+        """Process input_path into output_path and return a throughput report"""
+        return asyncio.run(self._run_and_close(input_path, output_path, resume_text, retry_failed))
+
+    async def _run_and_close(self, *args):
+        try:
+            return await self.run_async(*args)
+        finally:
+            # The client's connections belong to this loop, which asyncio.run is about to close
+            await self.openai_service.aclose()
+
+    async def run_async(self, input_path, output_path, resume_text=None, retry_failed=True):
+        done = self._completed_ids(output_path, retry_failed)
+        jobs = asyncio.Queue(maxsize=self.concurrency * 2)
+        report = {'succeeded': 0, 'failed': 0, 'skipped': 0, 'duplicates': 0, 'latencies': []}
+        started = time.monotonic()
+
+        with open(output_path, 'a', encoding='utf-8') as output:
+            _end_partial_line(output_path, output)
+            workers = [
+                asyncio.create_task(self._worker(jobs, output, resume_text, report))
+                for _ in range(self.concurrency)
+            ]
+            for item_id, item in self._read_items(input_path, report):
+                if item_id in done:
+                    report['skipped'] += 1
+                    continue
+                # Blocks while the queue is full, so only a window of the input is held in memory
+                await jobs.put((item_id, item))
+            for _ in workers:
+                await jobs.put(None)
+            await asyncio.gather(*workers)
+
+        return self._summarise(report, time.monotonic() - started)
+
+    async def _worker(self, jobs, output, resume_text, report):
+        while True:
+            job = await jobs.get()
+            if job is None:
+                return
+            item_id, item = job
+            item_started = time.monotonic()
+            record = await self._process(item_id, item, resume_text)
+            record['seconds'] = round(time.monotonic() - item_started, 3)
+
+            # Single event loop thread, so lines are never interleaved
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+            if record['success']:
+                report['succeeded'] += 1
+                report['latencies'].append(record['seconds'])
+            else:
+                report['failed'] += 1
+                self.logger.warning(f"Batch item {item_id} failed: {record['message']}")
+
+    async def _process(self, item_id, item, resume_text):
+        try:
+            resume = item.get('resume_text') or resume_text
+            if not resume:
+                raise ValueError("No resume_text in the item and no master resume given")
+
+            job_description = item.get('job_description')
+            if not job_description and item.get('job_url'):
+                if self.resume_service is None:
+                    raise ValueError("job_url given but URL extraction is not available")
+                # Scraping is blocking and rate limited per host; keep it off the event loop
+                url_result = await asyncio.to_thread(self.resume_service.process_job_url, item['job_url'])
+                if not url_result['success']:
+                    raise ValueError(url_result['message'])
+                job_description = url_result['job_description']
+            if not job_description:
+                raise ValueError("No job_description or job_url in the item")
+
+            tailored = await self.openai_service.tailor_resume(resume, job_description)
+
+            record = {'id': item_id, 'success': True, 'tailored_resume': tailored}
+            if self.write_pdfs:
+                filename = f"tailored_resume_{_safe_filename(item_id)}.pdf"
+                record['pdf_path'] = await asyncio.to_thread(
+                    self.document_service.generate_pdf, tailored, filename, self.pdf_layout
+                )
+            return record
+
+        except Exception as e:
+            return {'id': item_id, 'success': False, 'message': str(e)}
+
+    def _read_items(self, input_path, report):
+        seen = set()
+        with open(input_path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"Skipping line {line_number} of {input_path}: {str(e)}")
+                    continue
+                item_id = str(item.get('id', line_number))
+                if item_id in seen:
+                    # Its result would be indistinguishable from the first one's in the checkpoint
+                    self.logger.error(f"Skipping line {line_number} of {input_path}: duplicate id {item_id}")
+                    report['duplicates'] += 1
+                    continue
+                seen.add(item_id)
+                yield item_id, item
+
+    def _completed_ids(self, output_path, retry_failed):
+        """Ids already in the output file: successes, plus failures unless they are to be retried"""
+        done = set()
+        if not os.path.exists(output_path):
+            return done
+        with open(output_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; that item runs again
+                    continue
+                # Not a record of ours (or not one with an id): nothing to skip
+                if not isinstance(record, dict) or record.get('id') is None:
+                    continue
+                if record.get('success') or not retry_failed:
+                    done.add(record['id'])
+        return done
+
+    def _summarise(self, report, elapsed):
+        latencies = sorted(report.pop('latencies'))
+        processed = report['succeeded'] + report['failed']
+        report.update({
+            'processed': processed,
+            'elapsed_seconds': round(elapsed, 2),
+            'items_per_minute': round(processed / elapsed * 60, 1) if elapsed else 0.0,
+            'median_item_seconds': round(statistics.median(latencies), 3) if latencies else None,
+            'p95_item_seconds': round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+            'concurrency': self.concurrency,
+        })
+        return report
+
+def _end_partial_line(output_path, output):
+    # If the last run died mid-line, start on a fresh line so the next record parses
+    if output.tell() == 0:
+        return
+    with open(output_path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            output.write('\n')
+
+def _safe_filename(value):
+    # Cleaning and truncating can map different ids to one name, so a hash of the id keeps them apart
+    digest = hashlib.sha1(value.encode('utf-8')).hexdigest()[:10]
+    return re.sub(r'[^\w.-]+', '_', value)[:60] + '_' + digest
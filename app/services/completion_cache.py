@@ -0,0 +1,37 @@
+import hashlib
+import json
+import logging
+from app.utils.cache import TieredCache
+
+# The request fields that determine a completion; anything else (stream, user, ...) is ignored
+FINGERPRINT_FIELDS = ('model', 'messages', 'temperature', 'max_tokens', 'response_format')
+
+class CompletionCache:
+    """Cache of chat completion text keyed on a fingerprint of the request"""
+
+    def __init__(self, ttl=86400, max_entries=128, db_path=None, disk_max_entries=1024):
+        self.logger = logging.getLogger(__name__)
+        self.cache = TieredCache(
+            ttl=ttl,
+            max_entries=max_entries,
+            db_path=db_path,
+            disk_max_entries=disk_max_entries,
+            table='completions',
+        )
+
+    @staticmethod
+    def fingerprint(request):
+        """SHA-256 of the model, system and user messages, temperature, max_tokens and response format"""
+        fields = {name: request[name] for name in FINGERPRINT_FIELDS if name in request}
+        payload = json.dumps(fields, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, request):
+        """Return the cached completion text for request, or None"""
+        return self.cache.get(self.fingerprint(request))
+
+    def set(self, request, text):
+        self.cache.set(self.fingerprint(request), text)
+
+    def stats(self):
+        return self.cache.stats()
@@ -0,0 +1,105 @@
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+
+class DebugHtmlWriter:
+    """Opt-in capture of scraped HTML, written off the request path.
+
+    Modes: 'off' captures nothing, 'failure' captures pages whose extraction
+    failed, 'sample' captures failures plus every `sample_every`-th success.
+    Pages are handed to a background thread through a bounded queue (pages
+    are dropped rather than blocking a scrape when it is full), written to
+    uniquely named files, and the directory is rotated by file count and size.
+    """
+
+    MODES = ('off', 'failure', 'sample')
+
+    def __init__(self, mode='off', sample_every=50, debug_dir='debug_html', max_files=20,
+                 max_bytes=20 * 1024 * 1024, queue_size=8):
+        self.logger = logging.getLogger(__name__)
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown debug capture mode: {mode}")
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self.debug_dir = debug_dir
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._counter = itertools.count(1)
+        self._sequence = itertools.count(1)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def capture_success(self, html, site_name):
+        """Queue a successfully extracted page if it falls in the sample"""
+        # itertools.count is atomic under the GIL, so no lock is needed for sampling
+        if self.mode == 'sample' and next(self._counter) % self.sample_every == 0:
+            self._enqueue(html, site_name, 'sample')
+
+    def capture_failure(self, html, site_name):
+        """Queue a page whose extraction failed"""
+        if self.mode != 'off':
+            self._enqueue(html, site_name, 'failure')
+
+    def _enqueue(self, html, site_name, reason):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((html, site_name, reason))
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    os.makedirs(self.debug_dir, exist_ok=True)
+                    self._thread = threading.Thread(target=self._run, name='debug-html-writer', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            html, site_name, reason = self._queue.get()
+            try:
+                self._write(html, site_name, reason)
+                self._rotate()
+            except Exception as e:
+                self.logger.warning(f"Could not save debug HTML: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, html, site_name, reason):
+        timestamp = time.strftime('%Y%m%d-%H%M%S')
+        filename = os.path.join(
+            self.debug_dir, f"{site_name}_{reason}_{timestamp}_{os.getpid()}_{next(self._sequence)}.html"
+        )
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(html)
+        self.logger.info(f"Debug HTML saved to {filename}")
+
+    def _rotate(self):
+        """Delete the oldest captures beyond max_files / max_bytes"""
+        entries = []
+        for name in os.listdir(self.debug_dir):
+            path = os.path.join(self.debug_dir, name)
+            if name.endswith('.html') and os.path.isfile(path):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_files or total > self.max_bytes):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def flush(self):
+        """Block until every queued page has been written"""
+        if self._thread is not None:
+            self._queue.join()
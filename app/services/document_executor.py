@@ -0,0 +1,126 @@
+import logging
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# ProcessPoolExecutor only takes max_tasks_per_child from Python 3.11; older versions never recycle workers
+RECYCLES_WORKERS = sys.version_info >= (3, 11)
+
+class DocumentExecutor:
+    """Bounded process pool for CPU-bound document work (PDF/DOCX parsing, PDF rendering).
+
+    Work run here does not hold the web worker's GIL. Each task has a
+    timeout: a task that overruns has its worker killed and the pool is
+    replaced, as is a pool whose worker crashed, so one malformed document
+    costs one failed request instead of a stuck worker. Tasks that were
+    only caught up in another task's pool replacement are retried once.
+    With workers=0 tasks run in the calling thread.
+    """
+
+    def __init__(self, workers=2, timeout=30, max_pending=None, max_tasks_per_child=100, initializer=None):
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        if max_tasks_per_child and not RECYCLES_WORKERS:
+            self.logger.info("Python < 3.11: document workers are not recycled after max_tasks_per_child tasks")
+        # Runs once in each new worker process, e.g. to build what every task reuses
+        self.initializer = initializer
+        # Callers past this many wait for a slot rather than piling up behind the pool
+        self.max_pending = max_pending or max(1, workers) * 4
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool = None
+        self._lock = threading.Lock()
+        self._stats = {'completed': 0, 'failed': 0, 'timeouts': 0, 'crashes': 0, 'restarts': 0, 'in_flight': 0}
+
+    def run(self, func, *args, timeout=None):
+        """Run func(*args) in a worker process and return its result.
+
+        func's own exceptions are re-raised unchanged; a timeout or a crashed
+        worker raises ValueError.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if not self.workers:
+            return func(*args)
+
+        name = getattr(func, '__name__', 'task')
+        if not self._slots.acquire(timeout=timeout):
+            raise ValueError(f"Document processing is busy; {name} did not start within {timeout}s")
+        self._count('in_flight')
+        try:
+            for attempt in range(2):
+                pool = self._get_pool()
+                try:
+                    result = pool.submit(func, *args).result(timeout=timeout)
+                except FuturesTimeoutError:
+                    self._count('timeouts')
+                    self.logger.warning(f"Document task {name} timed out after {timeout}s; restarting its pool")
+                    self._replace(pool, kill=True)
+                    raise ValueError(f"Document processing timed out after {timeout}s")
+                except BrokenProcessPool:
+                    # Someone else's timeout already replaced this pool: our task was collateral, so retry it
+                    if self._replace(pool) or attempt:
+                        self._count('crashes')
+                        self.logger.error(f"Document task {name} crashed its worker process")
+                        raise ValueError("Document processing failed: the worker process crashed")
+                    continue
+                except Exception:
+                    self._count('failed')
+                    raise
+                self._count('completed')
+                return result
+        finally:
+            self._count('in_flight', -1)
+            self._slots.release()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: forking a multi-threaded web worker can deadlock the child
+                options = {'max_tasks_per_child': self.max_tasks_per_child} if RECYCLES_WORKERS else {}
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self.initializer,
+                    **options,
+                )
+            return self._pool
+
+    def _replace(self, pool, kill=False):
+        """Drop pool so the next task gets a fresh one; False if it was already replaced"""
+        with self._lock:
+            if self._pool is not pool:
+                return False
+            self._pool = None
+            self._stats['restarts'] += 1
+        if kill:
+            # The executor has no way to cancel a running task, so its workers are stopped directly
+            for process in _worker_processes(pool):
+                process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self._stats[name] += delta
+
+    def stats(self):
+        """Task outcomes and pool restarts, for monitoring"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(workers=self.workers, timeout=self.timeout, max_pending=self.max_pending)
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+def _worker_processes(pool):
+    """The pool's worker processes, or none if this Python's executor doesn't expose them"""
+    # Only kept in a private attribute; without it a hung worker is abandoned rather than killed
+    processes = getattr(pool, '_processes', None)
+    return list(processes.values()) if isinstance(processes, dict) else []
@@ -2,18 +2,27 @@
 
 import os
 import logging
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from docx import Document
-import PyPDF2
 from werkzeug.datastructures import FileStorage
+from app.utils.uploads import upload_view, upload_source
+from app.utils.document_tasks import extract_pdf_text, extract_docx_text, render_pdf
+from app.utils.pdf_render import LAYOUTS, DEFAULT_LAYOUT, warm_up
 
 class DocumentService:
-    def __init__(self):
+    def __init__(self, pdf_max_pages=50, pdf_max_chars=100000, executor=None, pdf_layout=DEFAULT_LAYOUT):
         self.logger = logging.getLogger(__name__)
         
+        # Enough text for any prompt budget; pages past the caps are never read
+        self.pdf_max_pages = pdf_max_pages
+        self.pdf_max_chars = pdf_max_chars
+        # DocumentExecutor for parsing and rendering; None does the work in the calling thread
+        self.executor = executor
+        if pdf_layout not in LAYOUTS:
+            raise ValueError(f"Unknown PDF layout: {pdf_layout}")
+        self.pdf_layout = pdf_layout
+        if executor is None or not executor.workers:
+            # Rendering happens in this process: register fonts and build the layouts now
+            warm_up()
+        
         # Use absolute paths from the project root
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.upload_folder = os.path.join(project_root, 'uploads')
@@ -47,74 +56,43 @@ class DocumentService:
     def _extract_from_pdf(self, file):
         """Extract text from PDF file"""
         try:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            # Workers read the upload from its spool file; the bytes are never copied into this process
+            with upload_source(file) as source:
+                return self._run(extract_pdf_text, source, self.pdf_max_pages, self.pdf_max_chars)
         except Exception as e:
             raise ValueError(f"Error reading PDF file: {str(e)}")
     
     def _extract_from_docx(self, file):
         """Extract text from DOCX file"""
         try:
-            doc = Document(file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            with upload_source(file) as source:
+                return self._run(extract_docx_text, source)
         except Exception as e:
             raise ValueError(f"Error reading DOCX file: {str(e)}")
     
+    def _run(self, func, *args):
+        if self.executor is None:
+            return func(*args)
+        return self.executor.run(func, *args)
+    
     def _extract_from_txt(self, file):
         """Extract text from TXT file"""
         try:
-            return file.read().decode('utf-8').strip()
+            # Decoded straight from the spooled upload's buffer, without an intermediate bytes copy
+            with upload_view(file) as view:
+                return str(view, 'utf-8').strip()
         except Exception as e:
             raise ValueError(f"Error reading TXT file: {str(e)}")
     
-    def generate_pdf(self, content, filename):
-        """Generate PDF from text content"""
+    def generate_pdf(self, content, filename, layout=None):
+        """Generate PDF from text content in one of the layouts in pdf_render.LAYOUTS"""
         try:
+            layout = layout or self.pdf_layout
+            if layout not in LAYOUTS:
+                raise ValueError(f"Unknown PDF layout: {layout}")
             output_path = os.path.join(self.output_folder, filename)
-            
-            # Create PDF document
-            doc = SimpleDocTemplate(output_path, pagesize=letter)
-            styles = getSampleStyleSheet()
-            
-            # Create custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=30,
-            )
-            
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceAfter=12,
-            )
-            
-            # Build PDF content
-            story = []
-            
-            # Split content into sections
-            sections = content.split('\n\n')
-            
-            for i, section in enumerate(sections):
-                if section.strip():
-                    if i == 0:  # First section as title
-                        story.append(Paragraph(section.strip(), title_style))
-                    else:
-                        story.append(Paragraph(section.strip(), normal_style))
-                    story.append(Spacer(1, 12))
-            
-            # Build PDF
-            doc.build(story)
-            
-            return output_path
+            # ReportLab layout is pure-Python CPU work, so it runs on the executor
+            return self._run(render_pdf, content, output_path, layout)
             
         except Exception as e:
             self.logger.error(f"Error generating PDF: {str(e)}")
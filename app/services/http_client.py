@@ -0,0 +1,93 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class PooledHttpClient:
+    """Shared keep-alive HTTP session with per-host connection pools and retries"""
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_retries=2, backoff_factor=0.5, headers=None):
+        self.logger = logging.getLogger(__name__)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.headers = dict(headers or {})
+        self._adapter = None
+        self._sessions = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def adapter(self):
+        """Lazily build the shared adapter holding the per-host connection pools"""
+        if self._adapter is None:
+            with self._lock:
+                if self._adapter is None:
+                    self._adapter = self._build_adapter()
+        return self._adapter
+
+    @property
+    def session(self):
+        """Session for the calling thread, backed by the shared connection pools"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self.adapter)
+            session.mount('http://', self.adapter)
+            session.headers.update(self.headers)
+            with self._lock:
+                self._sessions.append(session)
+            self._local.session = session
+        return session
+
+    def _build_adapter(self):
+        """Create an adapter that keeps one connection pool per host"""
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # pool_connections = number of host pools kept alive,
+        # pool_maxsize = concurrent connections per host
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+
+        self.logger.info(
+            f"HTTP session pool created (hosts={self.pool_connections}, "
+            f"per_host={self.pool_maxsize}, retries={self.max_retries})"
+        )
+        return adapter
+
+    def get(self, url, headers=None, timeout=15, **kwargs):
+        """Issue a GET through the pooled session"""
+        session = self.session
+        try:
+            return session.get(url, headers=headers, timeout=timeout, **kwargs)
+        finally:
+            # Cookies set along this fetch's redirect chain were used above;
+            # scrapes are independent, so none of them carry over to the next one
+            session.cookies.clear()
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            adapter, self._adapter = self._adapter, None
+        for session in sessions:
+            session.cookies.clear()
+        if adapter is not None:
+            adapter.close()
+        self._local = threading.local()
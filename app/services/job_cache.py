@@ -0,0 +1,67 @@
+import hashlib
+import logging
+import time
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from app.utils.cache import TieredCache
+
+# Query parameters that only track where a click came from, never which job it is
+TRACKING_PARAMS = {'trk', 'trackingid', 'refid', 'gclid', 'fbclid'}
+
+class JobDescriptionCache:
+    """Cache of scraped job descriptions keyed on the normalised posting URL"""
+
+    def __init__(self, ttl=3600, max_entries=256, db_path=None, disk_max_entries=2048, stale_ttl=0):
+        self.logger = logging.getLogger(__name__)
+        # Stale entries are kept for stale_ttl past their TTL so they can be
+        # revalidated with a conditional GET instead of re-downloaded
+        self.cache = TieredCache(
+            ttl=ttl,
+            stale_ttl=stale_ttl,
+            max_entries=max_entries,
+            db_path=db_path,
+            disk_max_entries=disk_max_entries,
+            table='job_descriptions',
+        )
+
+    @staticmethod
+    def normalize_url(url):
+        """Canonical form of a posting URL: lowercase host, no fragment or tracking params"""
+        parts = urlparse(url.strip())
+        query = [
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name.lower() not in TRACKING_PARAMS and not name.lower().startswith('utm_')
+        ]
+        return urlunparse((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip('/') or '/',
+            parts.params,
+            urlencode(sorted(query)),
+            '',
+        ))
+
+    def key_for(self, url):
+        return hashlib.sha256(self.normalize_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url):
+        """Return the cached record for url if it is still fresh"""
+        return self.cache.get(self.key_for(url))
+
+    def lookup(self, url):
+        """Return the CacheEntry for url, fresh or stale, or None"""
+        return self.cache.lookup(self.key_for(url))
+
+    def set(self, url, job_description, **metadata):
+        """Store an extracted job description with its metadata"""
+        record = {
+            'url': self.normalize_url(url),
+            'job_description': job_description,
+            'extraction_length': len(job_description),
+            'fetched_at': time.time(),
+            **metadata,
+        }
+        self.cache.set(self.key_for(url), record)
+        return record
+
+    def stats(self):
+        return self.cache.stats()
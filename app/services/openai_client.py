@@ -0,0 +1,347 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+import weakref
+import httpx
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, APIStatusError
+
+# Statuses worth retrying: rate limited, or the API had a transient failure
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+# x-ratelimit-reset-* values look like "20ms", "1s" or "6m0s"
+_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+class OpenAIClientManager:
+    """One pooled OpenAI client per process, with a cap on in-flight completions.
+
+    The SDK's own retries are turned off; a 429, 5xx or connection error is
+    retried here instead. A 429 waits for whatever the rate-limit headers ask
+    (retry-after, x-ratelimit-reset-*); other failures use a full-jitter
+    exponential backoff. Requests beyond `max_concurrency` wait for a slot,
+    and stats() reports how many are waiting so bursts show up as queue
+    depth rather than errors. A slot is held while a request is being made,
+    and by a stream until it is exhausted or closed; it is given up before a
+    backoff sleep.
+    """
+
+    def __init__(self, api_key=None, base_url=None, max_concurrency=4, max_retries=4,
+                 backoff_base=0.5, backoff_max=30.0, timeout=60.0):
+        self.logger = logging.getLogger(__name__)
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._stats = {'waiting': 0, 'in_flight': 0, 'streaming': 0, 'completed': 0, 'retries': 0, 'failures': 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The shared OpenAI client, created on first use"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    http_client = httpx.Client(
+                        # Streams hold their slot until they end, so slots bound the connections too
+                        limits=httpx.Limits(
+                            max_connections=self.max_concurrency,
+                            max_keepalive_connections=self.max_concurrency,
+                        ),
+                        timeout=self.timeout,
+                    )
+                    self._client = OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        max_retries=0,
+                        timeout=self.timeout,
+                        http_client=http_client,
+                    )
+        return self._client
+
+    def complete(self, request):
+        """Run a chat completion once a slot is free, retrying transient failures"""
+        return self._with_retries(lambda: self.client.chat.completions.create(**request))
+
+    def stream(self, request):
+        """Yield chunks of a streaming chat completion"""
+        # Errors surface when the request is made, so only that step is retried. The slot is kept
+        # until the stream is exhausted or closed, so streams count against max_concurrency too.
+        chunks, slot = self._with_retries(
+            lambda: self.client.chat.completions.create(**request, stream=True), keep_slot=True
+        )
+        self._count('streaming')
+        failed = True
+        try:
+            yield from chunks
+            failed = False
+        finally:
+            self._count('streaming', -1)
+            # Closed early (client went away): drop the connection rather than read the rest
+            chunks.response.close()
+            slot.release(failed=failed)
+
+    def _with_retries(self, call, keep_slot=False):
+        """call() in a slot, retrying transient failures; with keep_slot, returns (result, held slot)"""
+        attempt = 0
+        while True:
+            slot = self._slot().acquire()
+            try:
+                result = call()
+            except BaseException as e:
+                slot.release(failed=True)
+                if not isinstance(e, (APIStatusError, APIConnectionError)):
+                    raise
+                status = getattr(e, 'status_code', None)
+                if not _retryable(status) or attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+                delay = _retry_delay(e, attempt, self.backoff_base, self.backoff_max)
+                attempt += 1
+                self._count('retries')
+                self.logger.warning(
+                    f"OpenAI call failed ({status or type(e).__name__}), retry {attempt} in {delay:.2f}s"
+                )
+                # The slot is already free, so other calls proceed while this one waits
+                time.sleep(delay)
+                continue
+            if keep_slot:
+                return result, slot
+            slot.release()
+            return result
+
+    def _slot(self):
+        return _Slot(self)
+
+    def _count(self, name, delta=1):
+        with self._stats_lock:
+            self._stats[name] += delta
+
+    def stats(self):
+        """In-flight and waiting completions plus retry counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['max_concurrency'] = self.max_concurrency
+        return stats
+
+class AsyncOpenAIClientManager:
+    """asyncio counterpart of OpenAIClientManager, built on AsyncOpenAI.
+
+    Waiting for a slot or a backoff suspends a coroutine instead of holding a
+    thread, so one event loop can keep hundreds of generations in flight.
+    An AsyncOpenAI client and its semaphore only work on the loop they were
+    first used on, so each event loop gets its own pair. One manager can
+    therefore serve successive asyncio.run() calls, for example one batch
+    after another. `max_concurrency` applies per loop.
+    """
+
+    def __init__(self, api_key=None, base_url=None, max_concurrency=100, max_retries=4,
+                 backoff_base=0.5, backoff_max=30.0, timeout=60.0):
+        self.logger = logging.getLogger(__name__)
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        # event loop -> (client, slots); entries go away with their loop
+        self._per_loop = weakref.WeakKeyDictionary()
+        self._per_loop_lock = threading.Lock()
+        self._stats = {'waiting': 0, 'in_flight': 0, 'streaming': 0, 'completed': 0, 'retries': 0, 'failures': 0}
+        self._stats_lock = threading.Lock()
+
+    def _for_loop(self):
+        loop = asyncio.get_running_loop()
+        with self._per_loop_lock:
+            state = self._per_loop.get(loop)
+            if state is None:
+                http_client = httpx.AsyncClient(
+                    # Streams hold their slot until they end, so slots bound the connections too
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrency,
+                        max_keepalive_connections=self.max_concurrency,
+                    ),
+                    timeout=self.timeout,
+                )
+                client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    max_retries=0,
+                    timeout=self.timeout,
+                    http_client=http_client,
+                )
+                state = self._per_loop[loop] = (client, asyncio.BoundedSemaphore(self.max_concurrency))
+            return state
+
+    @property
+    def client(self):
+        """The AsyncOpenAI client for the running event loop, created on first use"""
+        return self._for_loop()[0]
+
+    async def complete(self, request):
+        """Run a chat completion once a slot is free, retrying transient failures"""
+        return await self._with_retries(lambda: self.client.chat.completions.create(**request))
+
+    async def stream(self, request):
+        """Yield chunks of a streaming chat completion, holding a slot until it ends"""
+        chunks, slot = await self._with_retries(
+            lambda: self.client.chat.completions.create(**request, stream=True), keep_slot=True
+        )
+        self._count('streaming')
+        failed = True
+        try:
+            async for chunk in chunks:
+                yield chunk
+            failed = False
+        finally:
+            self._count('streaming', -1)
+            await chunks.response.aclose()
+            slot.release(failed=failed)
+
+    async def _with_retries(self, call, keep_slot=False):
+        """call() in a slot, retrying transient failures; with keep_slot, returns (result, held slot)"""
+        attempt = 0
+        while True:
+            slot = await self._slot().acquire()
+            try:
+                result = await call()
+            except BaseException as e:
+                slot.release(failed=True)
+                if not isinstance(e, (APIStatusError, APIConnectionError)):
+                    raise
+                status = getattr(e, 'status_code', None)
+                if not _retryable(status) or attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+                delay = _retry_delay(e, attempt, self.backoff_base, self.backoff_max)
+                attempt += 1
+                self._count('retries')
+                self.logger.warning(
+                    f"OpenAI call failed ({status or type(e).__name__}), retry {attempt} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            if keep_slot:
+                return result, slot
+            slot.release()
+            return result
+
+    def _slot(self):
+        return _AsyncSlot(self, self._for_loop()[1])
+
+    def _count(self, name, delta=1):
+        # Loops may run in different threads
+        with self._stats_lock:
+            self._stats[name] += delta
+
+    async def aclose(self):
+        """Close the running event loop's pooled connections"""
+        with self._per_loop_lock:
+            state = self._per_loop.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].close()
+
+    def stats(self):
+        """In-flight and waiting completions plus retry counters, across all loops"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['max_concurrency'] = self.max_concurrency
+        return stats
+
+class _Slot:
+    """One of the manager's concurrency slots, held from acquire() to release()"""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def acquire(self):
+        self.manager._count('waiting')
+        self.manager._slots.acquire()
+        self.manager._count('waiting', -1)
+        self.manager._count('in_flight')
+        return self
+
+    def release(self, failed=False):
+        self.manager._count('in_flight', -1)
+        if not failed:
+            self.manager._count('completed')
+        self.manager._slots.release()
+
+class _AsyncSlot:
+    """One slot of the running loop's semaphore, held from acquire() to release()"""
+
+    def __init__(self, manager, slots):
+        self.manager = manager
+        self.slots = slots
+
+    async def acquire(self):
+        self.manager._count('waiting')
+        try:
+            await self.slots.acquire()
+        finally:
+            self.manager._count('waiting', -1)
+        self.manager._count('in_flight')
+        return self
+
+    def release(self, failed=False):
+        self.manager._count('in_flight', -1)
+        if not failed:
+            self.manager._count('completed')
+        self.slots.release()
+
+def _retryable(status):
+    # No status means the request never got a response (connection error, timeout)
+    return status is None or status in RETRY_STATUSES
+
+def _retry_delay(error, attempt, backoff_base, backoff_max):
+    """Seconds to wait: a rate-limited response's hint if it gave one, else full-jitter exponential"""
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None)
+    hinted = None
+    if response is not None and status in (429, 503):
+        # x-ratelimit-reset-* comes on every response, so it only says when to retry after a 429
+        hinted = _header_delay(response.headers, rate_limited=status == 429)
+    if hinted is not None:
+        # A little jitter so workers told the same reset time don't retry in lockstep
+        return min(hinted, backoff_max) + random.uniform(0, backoff_base)
+    return random.uniform(0, min(backoff_max, backoff_base * 2 ** attempt))
+
+def _header_delay(headers, rate_limited=True):
+    """Delay in seconds requested by retry-after(-ms), or for a 429 also x-ratelimit-reset-* headers"""
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    if not rate_limited:
+        return None
+    resets = [
+        _parse_duration(headers.get(name))
+        for name in ('x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens')
+    ]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+def _parse_duration(value):
+    if not value:
+        return None
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
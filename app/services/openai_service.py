@@ -1,165 +1,162 @@
 import os
 import logging
-from openai import OpenAI
+from app.services import prompts
+from app.services.openai_client import OpenAIClientManager
 
 class OpenAIService:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    """OpenAI-backed generation.
+
+    use_cache answers a request identical to an earlier one from the
+    completion cache. It is on by default only for analyze_resume_fit.
+    The JSON API opts in for /api/tailor-resume and /api/generate-bundle,
+    because API clients retry and double-submit. The form and streaming
+    routes leave it off, since generating again there means asking for a
+    new draft.
+    """
+
+    def __init__(self, completion_cache=None, client_manager=None, prompt_budget=None):
+        self.client_manager = client_manager or OpenAIClientManager(api_key=os.getenv('OPENAI_API_KEY'))
+        self.completion_cache = completion_cache
+        self.prompt_budget = prompt_budget
         self.logger = logging.getLogger(__name__)
-    
-    def tailor_resume(self, resume_text, job_description):
+
+    def tailor_resume(self, resume_text, job_description, use_cache=False):
         """Tailor existing resume content based on job description"""
         try:
-            prompt = f"""
-            You are a professional resume writer. Please tailor the following resume to better match the job description provided.
-
-            RESUME:
-            {resume_text}
-
-            JOB DESCRIPTION:
-            {job_description}
-
-            Please rewrite the resume to:
-            1. Highlight relevant skills and experiences that match the job requirements
-            2. Use keywords from the job description where appropriate
-            3. Reorganize content to emphasize the most relevant qualifications
-            4. Maintain professional formatting and structure
-            5. Keep all factual information accurate - do not add false experience
-
-            Return only the tailored resume content, properly formatted for a professional document.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a professional resume writer with expertise in tailoring resumes for specific job applications."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-            
+            resume_text, job_description = self._fit('tailor_resume', resume_text, job_description)
+            return self._complete(prompts.tailor_resume(resume_text, job_description), use_cache)
         except Exception as e:
             self.logger.error(f"Error tailoring resume with OpenAI: {str(e)}")
             raise ValueError(f"Error processing resume with AI: {str(e)}")
 
-    def generate_resume(self, user_info, job_description):
+    def generate_resume(self, user_info, job_description, use_cache=False):
         """Generate a new resume from scratch based on user info and job description"""
         try:
-            prompt = f"""
-            You are a professional resume writer. Create a compelling resume based on the user information and job description provided.
-
-            USER INFORMATION:
-            {user_info}
-
-            JOB DESCRIPTION:
-            {job_description}
-
-            Please create a professional resume that:
-            1. Uses the user's actual information and experience
-            2. Highlights skills and experiences most relevant to the job
-            3. Incorporates keywords from the job description naturally
-            4. Follows modern resume best practices
-            5. Is formatted professionally with clear sections
-            6. Does not fabricate experience - only reorganizes and emphasizes existing qualifications
-
-            Return a complete, well-formatted resume ready for submission.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume writer who creates compelling, ATS-friendly resumes."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2500,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-            
+            user_info, job_description = self._fit('generate_resume', user_info, job_description)
+            return self._complete(prompts.generate_resume(user_info, job_description), use_cache)
         except Exception as e:
             self.logger.error(f"Error generating resume with OpenAI: {str(e)}")
             raise ValueError(f"Error generating resume with AI: {str(e)}")
 
-    def generate_cover_letter(self, user_info, job_description, company_name=None):
+    def generate_cover_letter(self, user_info, job_description, company_name=None, use_cache=False):
         """Generate a cover letter based on user info and job description"""
         try:
-            company_text = f" at {company_name}" if company_name else ""
-            
-            prompt = f"""
-            You are a professional career counselor. Write a compelling cover letter based on the user information and job description provided.
-
-            USER INFORMATION:
-            {user_info}
-
-            JOB DESCRIPTION:
-            {job_description}
-
-            Please create a cover letter that:
-            1. Opens with a strong, engaging introduction
-            2. Highlights the user's most relevant qualifications for this specific role
-            3. Shows enthusiasm for the position{company_text}
-            4. Uses specific examples from the user's background
-            5. Incorporates keywords from the job description naturally
-            6. Closes with a professional call to action
-            7. Is concise but impactful (3-4 paragraphs)
-
-            Return a complete, professional cover letter ready for submission.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert career counselor who writes compelling, personalized cover letters."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.7
+            user_info, job_description = self._fit('generate_cover_letter', user_info, job_description)
+            return self._complete(
+                prompts.generate_cover_letter(user_info, job_description, company_name), use_cache
             )
-            
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             self.logger.error(f"Error generating cover letter with OpenAI: {str(e)}")
             raise ValueError(f"Error generating cover letter with AI: {str(e)}")
 
-    def analyze_resume_fit(self, resume_text, job_description):
+    def analyze_resume_fit(self, resume_text, job_description, use_cache=True):
         """Analyze how well a resume fits a job and provide improvement suggestions"""
         try:
-            prompt = f"""
-            You are a hiring manager and resume expert. Analyze how well this resume matches the job description and provide specific improvement suggestions.
-
-            RESUME:
-            {resume_text}
-
-            JOB DESCRIPTION:
-            {job_description}
-
-            Please provide:
-            1. Overall fit score (1-10)
-            2. Top 3 strengths that match the job
-            3. Top 3 areas for improvement
-            4. Specific keywords/skills missing from the resume
-            5. Suggestions for better positioning of existing experience
-
-            Format your response as a structured analysis.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert hiring manager who provides detailed resume feedback."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content.strip()
-            
+            # Low temperature, so a repeated request gets an equally good answer from the cache
+            resume_text, job_description = self._fit('analyze_resume_fit', resume_text, job_description)
+            return self._complete(prompts.analyze_resume_fit(resume_text, job_description), use_cache)
         except Exception as e:
             self.logger.error(f"Error analyzing resume fit with OpenAI: {str(e)}")
             raise ValueError(f"Error analyzing resume with AI: {str(e)}")
+
+    def generate_bundle(self, resume_text, job_description, company_name=None, use_cache=False):
+        """Tailored resume, cover letter and fit analysis from one JSON-mode completion.
+
+        A reply cut off at max_tokens is not valid JSON, so the documents are
+        then generated by separate calls, each with its own token budget.
+        """
+        try:
+            fitted_resume, fitted_job = self._fit('generate_bundle', resume_text, job_description)
+            request = prompts.generate_bundle(fitted_resume, fitted_job, company_name)
+            try:
+                content = self._complete(request, use_cache, allow_truncated=False)
+            except prompts.TruncatedCompletion as e:
+                self.logger.warning(f"{str(e)}; generating the bundle's documents separately")
+                return self._bundle_separately(resume_text, job_description, company_name, use_cache)
+            return prompts.parse_bundle(content)
+        except Exception as e:
+            self.logger.error(f"Error generating application bundle with OpenAI: {str(e)}")
+            raise ValueError(f"Error generating application bundle with AI: {str(e)}")
+
+    def _bundle_separately(self, resume_text, job_description, company_name, use_cache):
+        return {
+            "tailored_resume": self.tailor_resume(resume_text, job_description, use_cache),
+            "cover_letter": self.generate_cover_letter(resume_text, job_description, company_name, use_cache),
+            "fit_analysis": self.analyze_resume_fit(resume_text, job_description, use_cache),
+        }
+
+    def stream_tailored_resume(self, resume_text, job_description):
+        """Yield a tailored resume piece by piece as the model produces it"""
+        resume_text, job_description = self._fit('tailor_resume', resume_text, job_description)
+        return self._stream(
+            prompts.tailor_resume(resume_text, job_description),
+            "Error processing resume with AI"
+        )
+
+    def stream_resume(self, user_info, job_description):
+        """Yield a newly generated resume piece by piece as the model produces it"""
+        user_info, job_description = self._fit('generate_resume', user_info, job_description)
+        return self._stream(
+            prompts.generate_resume(user_info, job_description),
+            "Error generating resume with AI"
+        )
+
+    def stream_cover_letter(self, user_info, job_description, company_name=None):
+        """Yield a cover letter piece by piece as the model produces it"""
+        user_info, job_description = self._fit('generate_cover_letter', user_info, job_description)
+        return self._stream(
+            prompts.generate_cover_letter(user_info, job_description, company_name),
+            "Error generating cover letter with AI"
+        )
+
+    def _fit(self, method, text, job_description):
+        """Compress and trim the prompt inputs to the method's token budget, if one is set"""
+        if self.prompt_budget is None:
+            return text, job_description
+        return self.prompt_budget.fit(method, text, job_description)
+
+    def _complete(self, request, use_cache=False, allow_truncated=True):
+        """Run one chat completion and return its text, going through the cache when asked.
+
+        A reply cut off at max_tokens is never cached, and raises
+        TruncatedCompletion unless allow_truncated.
+        """
+        cache = self.completion_cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(request)
+            if cached is not None:
+                self.logger.info(f"Completion cache hit for {request['model']}")
+                return cached
+
+        response = self.client_manager.complete(request)
+        choice = response.choices[0]
+        text = choice.message.content.strip()
+        if choice.finish_reason == 'length':
+            if not allow_truncated:
+                raise prompts.TruncatedCompletion(f"Completion stopped at max_tokens={request['max_tokens']}")
+            return text
+        if cache is not None:
+            cache.set(request, text)
+        return text
+
+    def client_stats(self):
+        """Concurrency and retry counters of the shared client"""
+        return self.client_manager.stats()
+
+    def cache_stats(self):
+        """Completion cache counters, or None when no cache is configured"""
+        return self.completion_cache.stats() if self.completion_cache is not None else None
+
+    def _stream(self, request, error_prefix):
+        """Run a streaming chat completion, yielding text deltas as they arrive"""
+        try:
+            stream = self.client_manager.stream(request)
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            self.logger.error(f"{error_prefix}: {str(e)}")
+            raise ValueError(f"{error_prefix}: {str(e)}")
@@ -0,0 +1,164 @@
+import logging
+import re
+from app.services.prompts import MODEL
+from app.utils.tokens import count_tokens, trim_to_tokens
+
+# Headings of the sections the model needs most when the posting has to be cut down
+REQUIREMENT_HEADINGS = re.compile(
+    r"requirement|qualification|responsibilit|what you.ll do|what you will do|skills|experience|"
+    r"must have|nice to have|the role|duties|you.ll need|who you are",
+    re.I,
+)
+
+# Headings of sections that never help tailor a resume
+BOILERPLATE_HEADINGS = re.compile(
+    r"benefits|perks|what we offer|about us|about the company|our story|equal opportunity|"
+    r"\beeo\b|diversity|privacy|cookie|how to apply|application process",
+    re.I,
+)
+# Legal and site text that can appear anywhere in a scraped posting
+BOILERPLATE_TEXT = re.compile(
+    r"equal opportunity employer|without regard to (?:race|color|religion|sex|age)|reasonable accommodation|"
+    r"e-verify|protected veteran status|privacy policy|cookie policy|use of cookies|all rights reserved",
+    re.I,
+)
+
+MAX_HEADING_LENGTH = 60
+# A single scraped paragraph longer than this is split into sentences before filtering
+MAX_PARAGRAPH_LENGTH = 600
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+# "- item", "* item", "• item", "1. item", "2) item"
+_LIST_MARKER_RE = re.compile(r'(?:[-*\u2022\u00b7\u2013\u25aa\u25cf]|\d{1,2}[.)])\s')
+# Lower-case words a title-cased heading may contain ("Benefits and Perks", "What You'll Do")
+_MINOR_WORDS = {'a', 'an', 'and', 'as', 'at', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'}
+
+# Share of the budget the job description may always claim, however long the other text is
+MIN_JOB_SHARE = 0.4
+
+# Input tokens (excluding the fixed prompt wording) allowed per OpenAIService method
+DEFAULT_BUDGETS = {
+    'tailor_resume': 3000,
+    'generate_resume': 3000,
+    'generate_cover_letter': 3000,
+    'analyze_resume_fit': 3000,
+    'generate_bundle': 3000,
+}
+
+def compress_job_description(text):
+    """Drop repeated paragraphs and boilerplate sections from a scraped posting.
+
+    Paragraphs are lines (or sentences of an over-long line). Boilerplate
+    sections (benefits, EEO, about us) are dropped from their heading up to
+    the next heading; requirements and everything else are kept in order.
+    """
+    kept = []
+    seen = set()
+    in_boilerplate = False
+    for paragraph, heading in _paragraphs(text):
+        key = ' '.join(paragraph.lower().split())
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if heading:
+            in_boilerplate = _is_boilerplate_heading(paragraph)
+            if in_boilerplate:
+                continue
+        if in_boilerplate or BOILERPLATE_TEXT.search(paragraph):
+            continue
+        kept.append(paragraph)
+    return '\n'.join(kept)
+
+def requirement_sections(text):
+    """Only the paragraphs under requirements/responsibilities-style headings, or '' if none"""
+    kept = []
+    in_requirements = False
+    for paragraph, heading in _paragraphs(text):
+        if heading:
+            in_requirements = bool(REQUIREMENT_HEADINGS.search(paragraph))
+        if in_requirements:
+            kept.append(paragraph)
+    return '\n'.join(kept)
+
+def _is_heading(line, isolated=False):
+    # "Benefits", "What we offer:" -- but not "Salary: $100k", a short sentence or a list item
+    if len(line) > MAX_HEADING_LENGTH or line.endswith('.') or _LIST_MARKER_RE.match(line):
+        return False
+    label, _, rest = line.partition(':')
+    if rest.strip() or len(label.split()) > 6:
+        return False
+    if line.endswith(':'):
+        return True
+    # Unmarked short lines are usually list items ("Health insurance", "5+ years with Python"), so one
+    # only opens a section when it stands apart or is title-cased, and names a section we know
+    return (isolated or _is_title_case(label)) and bool(
+        REQUIREMENT_HEADINGS.search(label) or BOILERPLATE_HEADINGS.search(label)
+    )
+
+def _is_boilerplate_heading(heading):
+    # "Experience with privacy regulations" is a requirement, not a privacy notice
+    return bool(BOILERPLATE_HEADINGS.search(heading)) and not REQUIREMENT_HEADINGS.search(heading)
+
+def _is_title_case(label):
+    words = [word for word in label.split() if word[0].isalpha() and word.lower() not in _MINOR_WORDS]
+    return bool(words) and all(word[0].isupper() for word in words)
+
+def _paragraphs(text):
+    """Yield (paragraph, is_heading); a heading may sit alone between blank lines"""
+    lines = [line.strip() for line in text.splitlines()]
+    for index, line in enumerate(lines):
+        if not line:
+            continue
+        if len(line) > MAX_PARAGRAPH_LENGTH:
+            for sentence in _SENTENCE_RE.split(line):
+                if sentence:
+                    yield sentence, False
+        else:
+            isolated = (index == 0 or not lines[index - 1]) and (index + 1 == len(lines) or not lines[index + 1])
+            yield line, _is_heading(line, isolated)
+
+class PromptBudget:
+    """Fits a method's prompt inputs into its token budget before the model is called"""
+
+    def __init__(self, budgets=None, model=MODEL):
+        self.logger = logging.getLogger(__name__)
+        self.budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        self.model = model
+
+    def fit(self, method, text, job_description):
+        """Return (text, job_description) compressed and trimmed to the budget for method.
+
+        `text` is the candidate's side of the prompt (resume or user info).
+        Inputs already within budget are returned unchanged. Otherwise the
+        job description is compressed first; if the pair is still over budget
+        the job description gives way first, down to MIN_JOB_SHARE of the
+        budget, narrowing to its requirements sections before it is cut, and
+        then the candidate text is trimmed.
+        """
+        budget = self.budgets.get(method)
+        if not budget or not job_description:
+            return text, job_description
+
+        text_tokens = count_tokens(text, self.model)
+        job_tokens = count_tokens(job_description, self.model)
+        if text_tokens + job_tokens <= budget:
+            return text, job_description
+
+        compressed = compress_job_description(job_description) or job_description
+        compressed_tokens = count_tokens(compressed, self.model)
+
+        if text_tokens + compressed_tokens > budget:
+            job_allowance = max(budget - text_tokens, int(budget * MIN_JOB_SHARE))
+            if compressed_tokens > job_allowance:
+                compressed = requirement_sections(compressed) or compressed
+                compressed = trim_to_tokens(compressed, job_allowance, self.model)
+                compressed_tokens = count_tokens(compressed, self.model)
+            if text_tokens + compressed_tokens > budget:
+                text = trim_to_tokens(text, budget - compressed_tokens, self.model)
+
+        after = count_tokens(text, self.model) + compressed_tokens
+        before = text_tokens + job_tokens
+        self.logger.info(
+            f"Prompt budget for {method}: {before} -> {after} input tokens ({before - after} saved, budget {budget})"
+        )
+        return text, compressed
@@ -0,0 +1,181 @@
+import json
+
+MODEL = "gpt-3.5-turbo"
+
+class TruncatedCompletion(ValueError):
+    """The model stopped at max_tokens, so its reply is incomplete"""
+
+def _request(system_message, prompt, max_tokens, temperature):
+    """Chat completion arguments for one generation"""
+    return {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": temperature
+    }
+
+def tailor_resume(resume_text, job_description):
+    """Request for tailoring an existing resume to a job description"""
+    prompt = f"""
+    You are a professional resume writer. Please tailor the following resume to better match the job description provided.
+
+    RESUME:
+    {resume_text}
+
+    JOB DESCRIPTION:
+    {job_description}
+
+    Please rewrite the resume to:
+    1. Highlight relevant skills and experiences that match the job requirements
+    2. Use keywords from the job description where appropriate
+    3. Reorganize content to emphasize the most relevant qualifications
+    4. Maintain professional formatting and structure
+    5. Keep all factual information accurate - do not add false experience
+
+    Return only the tailored resume content, properly formatted for a professional document.
+    """
+    
+    return _request(
+        "You are a professional resume writer with expertise in tailoring resumes for specific job applications.",
+        prompt,
+        max_tokens=2000,
+        temperature=0.7
+    )
+
+def generate_resume(user_info, job_description):
+    """Request for writing a new resume from user info and a job description"""
+    prompt = f"""
+    You are a professional resume writer. Create a compelling resume based on the user information and job description provided.
+
+    USER INFORMATION:
+    {user_info}
+
+    JOB DESCRIPTION:
+    {job_description}
+
+    Please create a professional resume that:
+    1. Uses the user's actual information and experience
+    2. Highlights skills and experiences most relevant to the job
+    3. Incorporates keywords from the job description naturally
+    4. Follows modern resume best practices
+    5. Is formatted professionally with clear sections
+    6. Does not fabricate experience - only reorganizes and emphasizes existing qualifications
+
+    Return a complete, well-formatted resume ready for submission.
+    """
+    
+    return _request(
+        "You are an expert resume writer who creates compelling, ATS-friendly resumes.",
+        prompt,
+        max_tokens=2500,
+        temperature=0.7
+    )
+
+def generate_cover_letter(user_info, job_description, company_name=None):
+    """Request for writing a cover letter from user info and a job description"""
+    company_text = f" at {company_name}" if company_name else ""
+    
+    prompt = f"""
+    You are a professional career counselor. Write a compelling cover letter based on the user information and job description provided.
+
+    USER INFORMATION:
+    {user_info}
+
+    JOB DESCRIPTION:
+    {job_description}
+
+    Please create a cover letter that:
+    1. Opens with a strong, engaging introduction
+    2. Highlights the user's most relevant qualifications for this specific role
+    3. Shows enthusiasm for the position{company_text}
+    4. Uses specific examples from the user's background
+    5. Incorporates keywords from the job description naturally
+    6. Closes with a professional call to action
+    7. Is concise but impactful (3-4 paragraphs)
+
+    Return a complete, professional cover letter ready for submission.
+    """
+    
+    return _request(
+        "You are an expert career counselor who writes compelling, personalized cover letters.",
+        prompt,
+        max_tokens=1500,
+        temperature=0.7
+    )
+
+def analyze_resume_fit(resume_text, job_description):
+    """Request for analysing how well a resume fits a job"""
+    prompt = f"""
+    You are a hiring manager and resume expert. Analyze how well this resume matches the job description and provide specific improvement suggestions.
+
+    RESUME:
+    {resume_text}
+
+    JOB DESCRIPTION:
+    {job_description}
+
+    Please provide:
+    1. Overall fit score (1-10)
+    2. Top 3 strengths that match the job
+    3. Top 3 areas for improvement
+    4. Specific keywords/skills missing from the resume
+    5. Suggestions for better positioning of existing experience
+
+    Format your response as a structured analysis.
+    """
+    
+    return _request(
+        "You are an expert hiring manager who provides detailed resume feedback.",
+        prompt,
+        max_tokens=1000,
+        temperature=0.3
+    )
+
+# Keys of the JSON object returned for a bundle request
+BUNDLE_KEYS = ("tailored_resume", "cover_letter", "fit_analysis")
+
+def generate_bundle(resume_text, job_description, company_name=None):
+    """Request for a tailored resume, cover letter and fit analysis in one JSON completion"""
+    company_text = f" at {company_name}" if company_name else ""
+    
+    prompt = f"""
+    You are a professional resume writer, career counselor and hiring manager. Using the resume and job description provided, produce three documents for this application.
+
+    RESUME:
+    {resume_text}
+
+    JOB DESCRIPTION:
+    {job_description}
+
+    Return a JSON object with exactly these string fields:
+    "tailored_resume": the resume rewritten to highlight the relevant skills and experience, use keywords from the job description where appropriate, and keep all factual information accurate - do not add false experience.
+    "cover_letter": a 3-4 paragraph cover letter showing enthusiasm for the position{company_text}, with specific examples from the resume and a professional call to action.
+    "fit_analysis": an overall fit score (1-10), top 3 strengths that match the job, top 3 areas for improvement, keywords/skills missing from the resume, and suggestions for better positioning of existing experience.
+
+    Use plain text with line breaks inside each field.
+    """
+    
+    request = _request(
+        "You are an expert resume writer, career counselor and hiring manager. You always reply with a single JSON object.",
+        prompt,
+        max_tokens=3500,
+        temperature=0.5
+    )
+    request["response_format"] = {"type": "json_object"}
+    return request
+
+def parse_bundle(content):
+    """The bundle's documents from a JSON-mode completion, checking every field is present"""
+    try:
+        bundle = json.loads(content)
+    except ValueError as e:
+        raise ValueError(f"Response is not valid JSON: {str(e)}")
+    if not isinstance(bundle, dict):
+        raise ValueError("Response is not a JSON object")
+    missing = [key for key in BUNDLE_KEYS if not isinstance(bundle.get(key), str) or not bundle[key].strip()]
+    if missing:
+        raise ValueError(f"Response is missing {', '.join(missing)}")
+    return {key: bundle[key].strip() for key in BUNDLE_KEYS}
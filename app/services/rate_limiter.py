@@ -0,0 +1,83 @@
+import logging
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+class MemoryRateLimitBackend:
+    """Per-process slot reservations, shared by all threads of a worker"""
+
+    def __init__(self):
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host, interval, burst):
+        """Reserve the next slot for host and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            wait, self._next_slot[host] = _schedule(self._next_slot.get(host), now, interval, burst)
+            return wait
+
+class SqliteRateLimitBackend:
+    """Slot reservations stored in SQLite so every worker process shares them"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS host_slots (host TEXT PRIMARY KEY, next_slot REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def reserve(self, host, interval, burst):
+        """Reserve the next slot for host and return how long to wait for it"""
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front so reservations serialise across processes
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT next_slot FROM host_slots WHERE host = ?", (host,)).fetchone()
+            now = time.time()
+            wait, next_slot = _schedule(row[0] if row else None, now, interval, burst)
+            conn.execute(
+                "INSERT OR REPLACE INTO host_slots (host, next_slot) VALUES (?, ?)", (host, next_slot)
+            )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+def _schedule(next_slot, now, interval, burst):
+    """Token-bucket (GCRA) step: return (wait, new next_slot) for one request"""
+    # next_slot is the theoretical time the bucket is empty again; up to `burst`
+    # requests may run ahead of it, each further one waits a full interval
+    theoretical = max(next_slot or now, now)
+    allowed_at = theoretical - (burst - 1) * interval
+    wait = max(0.0, allowed_at - now)
+    return wait, theoretical + interval
+
+class HostRateLimiter:
+    """Politeness scheduler that only delays requests to recently-hit hosts"""
+
+    def __init__(self, min_interval=1.0, burst=1, backend=None):
+        self.logger = logging.getLogger(__name__)
+        self.min_interval = min_interval
+        self.burst = max(1, burst)
+        self.backend = backend or MemoryRateLimitBackend()
+
+    def wait(self, url):
+        """Block until a request to url's host is allowed; return seconds waited"""
+        if self.min_interval <= 0:
+            return 0.0
+
+        host = (urlparse(url).hostname or '').lower()
+        delay = self.backend.reserve(host, self.min_interval, self.burst)
+        if delay > 0:
+            self.logger.info(f"Rate limiting {host}: waiting {delay:.2f}s")
+            time.sleep(delay)
+        return delay
@@ -1,12 +1,21 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from werkzeug.utils import secure_filename
 import re
+from app.utils.text_normalizer import keyword_tokens
 
 class ResumeService:
-    def __init__(self, scraper, document_service, openai_service=None):
+    def __init__(self, scraper, document_service, openai_service=None, job_cache=None, stage_workers=4,
+                 resume_cache=None):
         self.scraper = scraper
         self.document_service = document_service
         self.openai_service = openai_service
+        self.job_cache = job_cache
+        self.resume_cache = resume_cache
+        self.stage_workers = stage_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
 
     def process_job_url(self, url):
@@ -19,30 +28,109 @@ class ResumeService:
             if fixed_url != url:
                 self.logger.info(f"Fixed URL from {url} to {fixed_url}")
             
-            # Extract job description
-            job_description = self.scraper.extract_job_description(fixed_url)
+            # Reuse a recent extraction of the same posting if we have one
+            cached_result, stale = self._lookup_cached_job(fixed_url)
+            if cached_result:
+                return cached_result
             
-            return {
-                "success": True,
-                "job_description": job_description,
-                "message": f"Successfully extracted {len(job_description)} characters from job posting",
-                "url_used": fixed_url,
-                "extraction_length": len(job_description)
-            }
+            # Extract job description (revalidating the stale copy if there is one)
+            page = self.scraper.fetch_job_description(fixed_url, cached=stale)
+            return self._store_job_page(fixed_url, page)
             
         except Exception as e:
-            self.logger.warning(f"Failed to extract job description from {url}: {str(e)}")
-            
-            # Provide helpful error messages based on the site and error
-            error_message = self._get_helpful_error_message(url, str(e))
-            
-            return {
-                "success": False,
-                "job_description": "",
-                "message": error_message,
-                "error": str(e),
-                "url_used": url
-            }
+            return self._job_url_error(url, e)
+
+    def process_job_urls(self, urls):
+        """Process many job URLs concurrently, returning results in input order"""
+        results = [None] * len(urls)
+        for index, result in self.iter_process_job_urls(urls):
+            results[index] = result
+        return results
+
+    def iter_process_job_urls(self, urls):
+        """Yield (index, result) for each URL as soon as it is available.
+
+        Cache hits are yielded immediately; the remaining URLs are fetched
+        together through the scraper's bounded, per-host-capped batch pool.
+        """
+        # fixed URL -> [(index, original URL)], so duplicates are fetched once
+        pending = {}
+        stale = {}
+        for index, url in enumerate(urls):
+            fixed_url = self._fix_common_url_issues(url)
+            if fixed_url in pending:
+                pending[fixed_url].append((index, url))
+                continue
+            cached_result, stale_entry = self._lookup_cached_job(fixed_url)
+            if cached_result:
+                yield index, cached_result
+                continue
+            if stale_entry:
+                stale[fixed_url] = stale_entry
+            pending[fixed_url] = [(index, url)]
+        
+        if not pending:
+            return
+        
+        self.logger.info(f"Fetching {len(pending)} of {len(urls)} job URLs concurrently")
+        fixed_urls = list(pending)
+        for position, page in self.scraper.iter_extract_many(fixed_urls, cached=stale):
+            fixed_url = fixed_urls[position]
+            if page["success"]:
+                result = self._store_job_page(fixed_url, page)
+            for index, url in pending[fixed_url]:
+                yield index, result if page["success"] else self._job_url_error(url, page["error"])
+
+    def _lookup_cached_job(self, fixed_url):
+        """Return (fresh result or None, stale cached record or None)"""
+        if not self.job_cache:
+            return None, None
+        
+        entry = self.job_cache.lookup(fixed_url)
+        if entry and entry.fresh:
+            self.logger.info(f"Job description cache hit for {fixed_url}")
+            return self._job_url_result(entry.value["job_description"], fixed_url, cached=True), None
+        return None, entry.value if entry else None
+
+    def _store_job_page(self, fixed_url, page):
+        """Cache a freshly fetched (or revalidated) page and build its result"""
+        job_description = page["job_description"]
+        
+        if self.job_cache:
+            self.job_cache.set(
+                fixed_url,
+                job_description,
+                etag=page.get("etag"),
+                last_modified=page.get("last_modified")
+            )
+        
+        return self._job_url_result(job_description, fixed_url, cached=page.get("not_modified", False))
+
+    def _job_url_result(self, job_description, url_used, cached=False):
+        """Build the success payload returned by process_job_url"""
+        return {
+            "success": True,
+            "job_description": job_description,
+            "message": f"Successfully extracted {len(job_description)} characters from job posting",
+            "url_used": url_used,
+            "extraction_length": len(job_description),
+            "cached": cached
+        }
+
+    def _job_url_error(self, url, error):
+        """Build the failure payload returned by process_job_url"""
+        self.logger.warning(f"Failed to extract job description from {url}: {str(error)}")
+        
+        # Provide helpful error messages based on the site and error
+        error_message = self._get_helpful_error_message(url, str(error))
+        
+        return {
+            "success": False,
+            "job_description": "",
+            "message": error_message,
+            "error": str(error),
+            "url_used": url
+        }
 
     def _fix_common_url_issues(self, url):
         """Fix common URL format issues"""
@@ -83,15 +171,20 @@ class ResumeService:
     def process_resume(self, resume_file, job_description=None, job_url=None):
         """Process resume with job description or URL"""
         try:
-            # Extract text from resume
             resume_filename = secure_filename(resume_file.filename)
-            resume_text = self.document_service.extract_text_from_file(resume_file)
-            
-            # Get job description from URL if provided
             url_result = None
             if job_url and not job_description:
+                # The resume is parsed on the stage pool while this thread fetches the job page.
+                # The fetch stays here: it can sleep in the scraper's rate limiter, and a shared
+                # pool would make every request's fetch wait behind the others'
+                resume_stage = self._get_executor().submit(self._extract_resume, resume_file)
                 url_result = self.process_job_url(job_url)
-                
+                resume_text, resume_keywords = resume_stage.result()
+            else:
+                resume_text, resume_keywords = self._extract_resume(resume_file)
+            
+            # Get job description from URL if provided
+            if url_result is not None:
                 if url_result["success"]:
                     job_description = url_result["job_description"]
                     self.logger.info(f"Successfully extracted job description from URL: {len(job_description)} characters")
@@ -113,7 +206,7 @@ class ResumeService:
                 }
             
             # Process the resume and job description
-            analysis_result = self._analyze_resume_vs_job(resume_text, job_description)
+            analysis_result = self._analyze_resume_vs_job(resume_text, job_description, resume_keywords)
             
             return {
                 "success": True,
@@ -132,7 +225,30 @@ class ResumeService:
                 "message": f"Error processing resume: {str(e)}"
             }
 
-    def _analyze_resume_vs_job(self, resume_text, job_description):
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.stage_workers, thread_name_prefix='resume-stage'
+                )
+            return self._executor
+
+    def _extract_resume(self, resume_file):
+        """Resume text and its keywords, skipping the parse when these exact bytes were seen before"""
+        if self.resume_cache is None:
+            resume_text = self.document_service.extract_text_from_file(resume_file)
+            return resume_text, self._extract_keywords(resume_text)
+        
+        key = self.resume_cache.key_for(resume_file)
+        record = self.resume_cache.get(key)
+        if record is not None:
+            self.logger.info(f"Resume text cache hit for {resume_file.filename}")
+        else:
+            resume_text = self.document_service.extract_text_from_file(resume_file)
+            record = self.resume_cache.set(key, resume_text, self._extract_keywords(resume_text))
+        return record["text"], record["keywords"]
+
+    def _analyze_resume_vs_job(self, resume_text, job_description, resume_keywords=None):
         """Analyze resume against job description (placeholder for now)"""
         # TODO: Add your AI/ML analysis logic here
         # For now, return basic statistics
@@ -142,7 +258,8 @@ class ResumeService:
         
         # Simple keyword matching (you can enhance this)
         job_keywords = self._extract_keywords(job_description)
-        resume_keywords = self._extract_keywords(resume_text)
+        if resume_keywords is None:
+            resume_keywords = self._extract_keywords(resume_text)
         
         matching_keywords = set(job_keywords) & set(resume_keywords)
         
@@ -157,8 +274,8 @@ class ResumeService:
 
     def _extract_keywords(self, text):
         """Extract keywords from text (simple implementation)"""
-        # Convert to lowercase and split
-        words = text.lower().split()
+        # Lowercase, strip punctuation and split in one pass
+        words = keyword_tokens(text)
         
         # Remove common stop words
         stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
@@ -166,39 +283,49 @@ class ResumeService:
         # Filter words and count frequency
         word_freq = {}
         for word in words:
-            # Clean word (remove punctuation)
-            clean_word = re.sub(r'[^\w]', '', word)
-            if len(clean_word) > 3 and clean_word not in stop_words:
-                word_freq[clean_word] = word_freq.get(clean_word, 0) + 1
+            if len(word) > 3 and word not in stop_words:
+                word_freq[word] = word_freq.get(word, 0) + 1
         
         # Return top keywords sorted by frequency
         return sorted(word_freq.keys(), key=lambda x: word_freq[x], reverse=True)
 
-    def generate_tailored_resume(self, user_info, job_description=None, job_url=None):
-        """Generate a new resume from scratch using AI"""
-        try:
-            # Get job description from URL if provided
-            if job_url and not job_description:
-                url_result = self.process_job_url(job_url)
-                if url_result["success"]:
-                    job_description = url_result["job_description"]
-                else:
-                    return {
-                        "success": False,
-                        "message": url_result["message"]
-                    }
-            
-            if not job_description:
-                return {
-                    "success": False,
-                    "message": "Please provide a job description or valid job URL"
-                }
-            
-            if not self.openai_service:
+    def prepare_generation(self, job_description=None, job_url=None):
+        """Resolve the job description for a generation and check the AI service is available"""
+        # Get job description from URL if provided
+        if job_url and not job_description:
+            url_result = self.process_job_url(job_url)
+            if url_result["success"]:
+                job_description = url_result["job_description"]
+            else:
                 return {
                     "success": False,
-                    "message": "OpenAI service not available. Please check your API key."
+                    "message": url_result["message"]
                 }
+        
+        if not job_description:
+            return {
+                "success": False,
+                "message": "Please provide a job description or valid job URL"
+            }
+        
+        if not self.openai_service:
+            return {
+                "success": False,
+                "message": "OpenAI service not available. Please check your API key."
+            }
+        
+        return {
+            "success": True,
+            "job_description": job_description
+        }
+
+    def generate_tailored_resume(self, user_info, job_description=None, job_url=None):
+        """Generate a new resume from scratch using AI"""
+        try:
+            prepared = self.prepare_generation(job_description, job_url)
+            if not prepared["success"]:
+                return prepared
+            job_description = prepared["job_description"]
             
             # Generate resume using AI
             generated_resume = self.openai_service.generate_resume(user_info, job_description)
@@ -220,28 +347,10 @@ class ResumeService:
     def generate_cover_letter(self, user_info, job_description=None, job_url=None, company_name=None):
         """Generate a cover letter using AI"""
         try:
-            # Get job description from URL if provided
-            if job_url and not job_description:
-                url_result = self.process_job_url(job_url)
-                if url_result["success"]:
-                    job_description = url_result["job_description"]
-                else:
-                    return {
-                        "success": False,
-                        "message": url_result["message"]
-                    }
-            
-            if not job_description:
-                return {
-                    "success": False,
-                    "message": "Please provide a job description or valid job URL"
-                }
-            
-            if not self.openai_service:
-                return {
-                    "success": False,
-                    "message": "OpenAI service not available. Please check your API key."
-                }
+            prepared = self.prepare_generation(job_description, job_url)
+            if not prepared["success"]:
+                return prepared
+            job_description = prepared["job_description"]
             
             # Generate cover letter using AI
             generated_cover_letter = self.openai_service.generate_cover_letter(
@@ -261,3 +370,37 @@ class ResumeService:
                 "success": False,
                 "message": f"Error generating cover letter: {str(e)}"
             }
+
+    def generate_application_bundle(self, resume_text, job_description=None, job_url=None, company_name=None,
+                                    use_cache=False):
+        """Generate a tailored resume, cover letter and fit analysis with one AI call"""
+        try:
+            if not resume_text or not resume_text.strip():
+                return {
+                    "success": False,
+                    "message": "Please provide the resume text"
+                }
+            
+            prepared = self.prepare_generation(job_description, job_url)
+            if not prepared["success"]:
+                return prepared
+            job_description = prepared["job_description"]
+            
+            # One completion returns all three documents
+            bundle = self.openai_service.generate_bundle(resume_text, job_description, company_name, use_cache)
+            
+            return {
+                "success": True,
+                **bundle,
+                "job_description": job_description,
+                "message": "Resume, cover letter and analysis generated successfully!"
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error generating application bundle: {str(e)}")
+            # The input was fine; the AI call failed or replied with something unusable
+            return {
+                "success": False,
+                "upstream_error": True,
+                "message": f"Error generating application bundle: {str(e)}"
+            }
@@ -0,0 +1,50 @@
+import hashlib
+import logging
+import os
+from app.utils.cache import TieredCache
+from app.utils.uploads import upload_sha256
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class ResumeTextCache:
+    """Cache of extracted resume text and keywords keyed on a SHA-256 of the uploaded bytes"""
+
+    def __init__(self, ttl=30 * 24 * 3600, max_entries=128, db_path=None, disk_max_entries=1024):
+        self.logger = logging.getLogger(__name__)
+        # Content-addressed, so entries never go stale; the TTL only bounds how long resumes are kept
+        self.cache = TieredCache(
+            ttl=ttl,
+            max_entries=max_entries,
+            db_path=db_path,
+            disk_max_entries=disk_max_entries,
+            table='resume_texts',
+        )
+
+    @staticmethod
+    def key_for(file):
+        """SHA-256 of the upload's bytes plus its extension, leaving the stream rewound"""
+        # Spooled uploads were hashed while they were received
+        content_hash = upload_sha256(file)
+        if content_hash is None:
+            digest = hashlib.sha256()
+            stream = getattr(file, 'stream', file)
+            stream.seek(0)
+            for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+            stream.seek(0)
+            content_hash = digest.hexdigest()
+        # The same bytes under another extension would be parsed differently
+        extension = os.path.splitext(file.filename or '')[1].lower()
+        return f"{content_hash}{extension}"
+
+    def get(self, key):
+        """Return the cached {'text', 'keywords'} record for key, or None"""
+        return self.cache.get(key)
+
+    def set(self, key, text, keywords):
+        record = {'text': text, 'keywords': keywords}
+        self.cache.set(key, record)
+        return record
+
+    def stats(self):
+        return self.cache.stats()
@@ -1,11 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 import logging
-import time
-import os
+import threading
+from app.services.debug_capture import DebugHtmlWriter
+from app.services.http_client import PooledHttpClient
+from app.services.rate_limiter import HostRateLimiter
+from app.services.site_extractors import SiteExtractorRegistry
+from app.utils.content_extractor import best_content_block, text_blocks
+from app.utils.html_parser import parse_html
+from app.utils.text_normalizer import default_normalizer
 
 class JobScraper:
-    def __init__(self):
+    def __init__(self, http_client=None, rate_limiter=None, batch_workers=8, per_host_limit=2, registry=None,
+                 debug_writer=None):
         self.logger = logging.getLogger(__name__)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -14,23 +22,44 @@ class JobScraper:
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
+        # One pooled session shared by every extractor and worker thread
+        self.http = http_client or PooledHttpClient()
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # Job boards with dedicated selectors, looked up by hostname
+        self.registry = registry or SiteExtractorRegistry.default()
+        # Debug HTML capture is opt-in and written by a background thread
+        self.debug_writer = debug_writer or DebugHtmlWriter()
+        
+        # Batch extraction: a shared bounded pool plus a cap on concurrent fetches per host
+        self.batch_workers = batch_workers
+        self.per_host_limit = per_host_limit
+        self._executor = None
+        # host -> fetches running, and host -> fetches waiting for one of them to finish
+        self._host_active = {}
+        self._host_waiting = {}
+        self._batch_lock = threading.Lock()
 
     def extract_job_description(self, url):
         """Extract job description from various job sites"""
+        return self.fetch_job_description(url)["job_description"]
+
+    def fetch_job_description(self, url, cached=None):
+        """Extract job description plus the page's HTTP validators.
+
+        If `cached` (a previously returned result) carries an ETag or
+        Last-Modified, the page is revalidated with a conditional GET and its
+        job description is reused on a 304 without downloading or parsing.
+        """
         try:
             self.logger.info(f"Extracting job description from: {url}")
             
-            # Add delay to be respectful
-            time.sleep(1)
+            # Be respectful: only waits if this host was hit very recently
+            self.rate_limiter.wait(url)
             
-            if 'linkedin.com' in url:
-                return self._extract_from_linkedin(url)
-            elif 'indeed.com' in url:
-                return self._extract_from_indeed(url)
-            elif 'glassdoor.com' in url:
-                return self._extract_from_glassdoor(url)
-            else:
-                return self._extract_generic(url)
+            extractor = self.registry.for_url(url)
+            if extractor is not None:
+                return self._extract_from_site(extractor, url, cached)
+            return self._extract_generic(url, cached)
                 
         except Exception as e:
             self.logger.error(f"Error scraping job description: {str(e)}")
@@ -42,201 +71,190 @@ class JobScraper:
                 self.logger.error(f"Fallback extraction also failed: {str(fallback_error)}")
                 raise ValueError(f"Failed to extract job description: {str(e)}")
 
-    def _save_debug_html(self, html_content, site_name):
-        """Save HTML for debugging"""
-        debug_dir = "debug_html"
-        if not os.path.exists(debug_dir):
-            os.makedirs(debug_dir)
-        
-        filename = f"{debug_dir}/{site_name}_debug.html"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        self.logger.info(f"Debug HTML saved to {filename}")
+    def extract_many(self, urls, cached=None):
+        """Extract many job descriptions concurrently, returning results in input order"""
+        results = [None] * len(urls)
+        for index, result in self.iter_extract_many(urls, cached):
+            results[index] = result
+        return results
+
+    def iter_extract_many(self, urls, cached=None):
+        """Yield (index, result) pairs as each URL finishes.
+
+        Each result has the fields of fetch_job_description plus "url" and
+        "success", or "url", "success" and "error" if extraction failed.
+        `cached` optionally maps a URL to its previous result for revalidation.
+        """
+        cached = cached or {}
+        futures = {self._schedule(url, cached.get(url)): index for index, url in enumerate(urls)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
 
-    def _extract_from_indeed(self, url):
-        """Extract job description from Indeed"""
+    def _schedule(self, url, cached=None):
+        """Future for one URL's result, fetched once its host has a free slot.
+
+        At most per_host_limit fetches per host are handed to the pool at a
+        time (across every caller); the rest wait in a per-host queue, so a
+        pool thread never sits blocked on a busy host while other hosts wait.
+        """
+        future = Future()
+        host = (urlparse(url).hostname or '').lower()
+        with self._batch_lock:
+            if self._host_active.get(host, 0) >= self.per_host_limit:
+                self._host_waiting.setdefault(host, deque()).append((url, cached, future))
+                return future
+            self._host_active[host] = self._host_active.get(host, 0) + 1
+        self._start(host, url, cached, future)
+        return future
+
+    def _start(self, host, url, cached, future):
+        self._get_executor().submit(self._extract_for_host, host, url, cached, future)
+
+    def _extract_for_host(self, host, url, cached, future):
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            
-            # Save debug HTML
-            self._save_debug_html(response.text, "indeed")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Updated Indeed selectors (they change frequently)
-            selectors = [
-                'div[data-testid="jobsearch-JobComponent-description"]',
-                'div.jobsearch-jobDescriptionText',
-                'div.jobsearch-JobComponent-description',
-                'div#jobDescriptionText',
-                'div.jobsearch-SerpJobCard-description',
-                'div.job-snippet',
-                'span[title]',
-                'div.summary',
-                # More generic selectors
-                'div[class*="description"]',
-                'div[class*="job"]',
-                'div[id*="description"]',
-                'div[id*="job"]'
-            ]
-            
-            # Try each selector
-            for selector in selectors:
-                elements = soup.select(selector)
-                if elements:
-                    text = ' '.join([self._clean_text(el.get_text()) for el in elements])
-                    if len(text) > 100:  # Make sure we got substantial content
-                        self.logger.info(f"Found content with selector: {selector}")
-                        return text
-            
-            # If no specific selectors work, try to find the main content
-            return self._extract_main_content(soup, "Indeed")
-            
+            future.set_result(self._extract_one(url, cached))
         except Exception as e:
-            self.logger.error(f"Indeed extraction failed: {str(e)}")
-            raise ValueError(f"Could not find job description on Indeed page: {str(e)}")
+            future.set_exception(e)
+        finally:
+            # Hand this host's slot to its next waiting URL, if any
+            with self._batch_lock:
+                waiting = self._host_waiting.get(host)
+                if waiting:
+                    following = waiting.popleft()
+                    if not waiting:
+                        del self._host_waiting[host]
+                else:
+                    following = None
+                    self._host_active[host] -= 1
+                    if not self._host_active[host]:
+                        del self._host_active[host]
+            if following is not None:
+                self._start(host, *following)
 
-    def _extract_from_linkedin(self, url):
-        """Extract job description from LinkedIn"""
+    def _extract_one(self, url, cached=None):
+        """Fetch one URL of a batch"""
         try:
-            # LinkedIn requires more sophisticated headers
-            linkedin_headers = {
-                **self.headers,
-                'Referer': 'https://www.linkedin.com/',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'same-origin',
-            }
-            
-            response = requests.get(url, headers=linkedin_headers, timeout=15)
-            response.raise_for_status()
-            
-            # Save debug HTML
-            self._save_debug_html(response.text, "linkedin")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Updated LinkedIn selectors
-            selectors = [
-                'div.description__text',
-                'div.show-more-less-html__markup',
-                'div[data-test-id="job-description"]',
-                'div.jobs-description__content',
-                'div.jobs-box__html-content',
-                'section.jobs-description',
-                'div.jobs-description-content__text',
-                'div.job-view-layout',
-                'div.jobs-details__main-content',
-                # More generic
-                'div[class*="description"]',
-                'div[class*="job"]'
-            ]
-            
-            # Try each selector
-            for selector in selectors:
-                elements = soup.select(selector)
-                if elements:
-                    text = ' '.join([self._clean_text(el.get_text()) for el in elements])
-                    if len(text) > 100:
-                        self.logger.info(f"Found content with selector: {selector}")
-                        return text
-            
-            # If no specific selectors work, try to find the main content
-            return self._extract_main_content(soup, "LinkedIn")
-            
+            return {"url": url, "success": True, **self.fetch_job_description(url, cached)}
         except Exception as e:
-            self.logger.error(f"LinkedIn extraction failed: {str(e)}")
-            raise ValueError(f"Could not find job description on LinkedIn page: {str(e)}")
+            return {"url": url, "success": False, "error": str(e)}
+
+    def _get_executor(self):
+        with self._batch_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.batch_workers, thread_name_prefix='job-scraper'
+                )
+            return self._executor
 
-    def _extract_from_glassdoor(self, url):
-        """Extract job description from Glassdoor"""
+    def _scrape(self, url, site_name, headers, extractor, display_name, cached=None):
+        """Fetch a page (conditionally if we hold validators) and extract its description"""
+        request_headers = dict(headers)
+        if cached:
+            if cached.get("etag"):
+                request_headers['If-None-Match'] = cached["etag"]
+            if cached.get("last_modified"):
+                request_headers['If-Modified-Since'] = cached["last_modified"]
+        
+        response = self.http.get(url, headers=request_headers, timeout=15)
+        
+        if response.status_code == 304 and cached:
+            self.logger.info(f"{display_name} page not modified, reusing cached job description")
+            return {
+                "job_description": cached["job_description"],
+                "etag": response.headers.get('ETag') or cached.get("etag"),
+                "last_modified": response.headers.get('Last-Modified') or cached.get("last_modified"),
+                "not_modified": True
+            }
+        
+        response.raise_for_status()
+        
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            
-            # Save debug HTML
-            self._save_debug_html(response.text, "glassdoor")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            selectors = [
-                'div.jobDescriptionContent',
-                'div[data-test="jobDescription"]',
-                'div.desc',
-                'div.jobDescription',
-                'section[data-test="description"]'
-            ]
-            
-            for selector in selectors:
-                elements = soup.select(selector)
-                if elements:
-                    text = ' '.join([self._clean_text(el.get_text()) for el in elements])
-                    if len(text) > 100:
-                        return text
-            
-            return self._extract_main_content(soup, "Glassdoor")
-            
+            job_description = self._parse_page(response.text, extractor, display_name)
+        except Exception:
+            self.debug_writer.capture_failure(response.text, site_name)
+            raise
+        self.debug_writer.capture_success(response.text, site_name)
+        
+        return {
+            "job_description": job_description,
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "not_modified": False
+        }
+
+    def _parse_page(self, html, extractor, display_name):
+        """Parse only what the site's selectors can match, falling back to a full parse"""
+        normalizer = extractor.normalizer if extractor is not None else None
+        if extractor is not None:
+            # Targeted parse: builds just the candidate subtrees instead of the whole page
+            strainer = extractor.strainer
+            soup = parse_html(html, parse_only=strainer) if strainer else parse_html(html)
+            text = self._select_content(soup, extractor)
+            if text:
+                return text
+            if strainer is None:
+                return self._extract_main_content(soup, display_name, normalizer)
+        
+        # If no specific selectors work, try to find the main content
+        return self._extract_main_content(parse_html(html), display_name, normalizer)
+
+    def _select_content(self, soup, extractor):
+        """Return text from the first selector that yields substantial content"""
+        tried = []
+        for selector, pattern in extractor.candidates():
+            tried.append(selector)
+            elements = pattern.select(soup)
+            if not elements:
+                continue
+            # One line per block (heading, paragraph, list item), so section headings survive for PromptBudget
+            raw_text = '\n'.join(block for el in elements for block in text_blocks(el))
+            # Cleaning only ever shortens text, so skip it for matches that are already too short
+            if len(raw_text) <= extractor.min_length:
+                continue
+            # One normalisation pass over the joined text rather than one per element
+            text = extractor.normalizer.clean_lines(raw_text)
+            if len(text) > extractor.min_length:  # Make sure we got substantial content
+                self.logger.info(f"Found content with selector: {selector}")
+                extractor.record(tried, selector)
+                return text
+        extractor.record(tried, None)
+        return None
+
+    def _extract_from_site(self, extractor, url, cached=None):
+        """Extract job description from a board in the site registry"""
+        try:
+            headers = {**self.headers, **extractor.headers}
+            return self._scrape(url, extractor.name, headers, extractor, extractor.display_name, cached)
         except Exception as e:
-            self.logger.error(f"Glassdoor extraction failed: {str(e)}")
-            raise ValueError(f"Could not find job description on Glassdoor page: {str(e)}")
+            self.logger.error(f"{extractor.display_name} extraction failed: {str(e)}")
+            raise ValueError(f"Could not find job description on {extractor.display_name} page: {str(e)}")
 
-    def _extract_generic(self, url):
+    def _extract_generic(self, url, cached=None):
         """Generic extraction for other job sites"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            
-            # Save debug HTML
-            self._save_debug_html(response.text, "generic")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            return self._extract_main_content(soup, "Generic")
-            
+            return self._scrape(url, "generic", self.headers, None, "Generic", cached)
         except Exception as e:
             self.logger.error(f"Generic extraction failed: {str(e)}")
             raise ValueError(f"Could not extract content from URL: {str(e)}")
 
-    def _extract_main_content(self, soup, site_name):
+    def selector_stats(self):
+        """Which selectors have been tried and matched, per site"""
+        return self.registry.stats()
+
+    def _extract_main_content(self, soup, site_name, normalizer=None):
         """Extract main content when specific selectors fail"""
         try:
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # Try to find main content areas
-            main_selectors = [
-                'main',
-                'article',
-                'div[role="main"]',
-                'div.main-content',
-                'div.content',
-                'div.container',
-                'body'
-            ]
-            
-            for selector in main_selectors:
-                main_element = soup.select_one(selector)
-                if main_element:
-                    # Get all paragraphs and divs with substantial text
-                    text_elements = main_element.find_all(['p', 'div', 'li', 'span'])
-                    text_blocks = []
-                    
-                    for element in text_elements:
-                        text = self._clean_text(element.get_text())
-                        if len(text) > 50:  # Only substantial text blocks
-                            text_blocks.append(text)
-                    
-                    if text_blocks:
-                        content = '\n\n'.join(text_blocks)
-                        if len(content) > 200:  # Make sure we got meaningful content
-                            self.logger.info(f"Extracted content using main content strategy for {site_name}")
-                            return content
+            # Single pass over the tree to find the densest block of prose
+            main_element = best_content_block(soup)
+            if main_element is not None:
+                text_blocks_found = [self._clean_text(block, normalizer) for block in text_blocks(main_element)]
+                content = '\n\n'.join(block for block in text_blocks_found if block)
+                if len(content) > 200:  # Make sure we got meaningful content
+                    self.logger.info(f"Extracted content using main content strategy for {site_name}")
+                    return content
             
             # Last resort - get all text
-            all_text = soup.get_text()
-            lines = [line.strip() for line in all_text.splitlines() if line.strip()]
+            lines = [self._clean_text(block, normalizer) for block in text_blocks(soup)]
             meaningful_lines = [line for line in lines if len(line) > 30]
             
             if meaningful_lines:
@@ -250,27 +268,7 @@ class JobScraper:
         except Exception as e:
             raise ValueError(f"Main content extraction failed: {str(e)}")
 
-    def _clean_text(self, text):
+    def _clean_text(self, text, normalizer=None):
         """Clean extracted text"""
-        if not text:
-            return ""
-        
-        # Remove extra whitespace and normalize
-        text = ' '.join(text.split())
-        
-        # Remove common unwanted phrases
-        unwanted_phrases = [
-            'Sign in',
-            'Create account',
-            'Apply now',
-            'Save job',
-            'Share',
-            'Report job',
-            'Cookie policy',
-            'Privacy policy'
-        ]
-        
-        for phrase in unwanted_phrases:
-            text = text.replace(phrase, '')
-        
-        return text.strip()
\ No newline at end of file
+        # Whitespace and unwanted phrases are handled in one precompiled regex pass
+        return (normalizer or default_normalizer).clean(text)
@@ -0,0 +1,182 @@
+import threading
+from urllib.parse import urlparse
+import soupsieve
+from app.utils.html_parser import selector_strainer
+from app.utils.text_normalizer import default_normalizer
+
+class SiteExtractor:
+    """Selectors and request settings for one job board.
+
+    `selectors` are site-specific and get reordered by how often each one
+    wins; `fallback_selectors` are broad catch-alls that are always tried
+    last, in their given order, so they can't crowd out a precise match.
+    `unwanted_phrases` are site chrome removed on top of the default list.
+    """
+
+    def __init__(self, name, display_name, domains, selectors, fallback_selectors=(),
+                 headers=None, min_length=100, unwanted_phrases=()):
+        self.name = name
+        self.display_name = display_name
+        self.domains = tuple(domains)
+        self.headers = dict(headers or {})
+        self.min_length = min_length
+        self.selectors = list(selectors)
+        self.fallback_selectors = list(fallback_selectors)
+        self.normalizer = default_normalizer.extend(unwanted_phrases) if unwanted_phrases else default_normalizer
+
+        # Compile everything once instead of on every scrape
+        all_selectors = self.selectors + self.fallback_selectors
+        self._compiled = {selector: soupsieve.compile(selector) for selector in all_selectors}
+        self.strainer = selector_strainer(all_selectors)
+
+        self._hits = {selector: 0 for selector in all_selectors}
+        self._tries = {selector: 0 for selector in all_selectors}
+        self._order = list(self.selectors)
+        self._rank = {selector: index for index, selector in enumerate(self.selectors)}
+        self._lock = threading.Lock()
+
+    def candidates(self):
+        """(selector, compiled pattern) pairs in the order they should be tried"""
+        with self._lock:
+            order = self._order + self.fallback_selectors
+        return [(selector, self._compiled[selector]) for selector in order]
+
+    def record(self, tried, matched):
+        """Count the selectors tried for one page and which one (if any) matched"""
+        with self._lock:
+            for selector in tried:
+                self._tries[selector] += 1
+            if matched is None:
+                return
+            self._hits[matched] += 1
+            if matched in self._order:
+                # Ties keep the hand-written order
+                self._order.sort(key=lambda selector: (-self._hits[selector], self._rank[selector]))
+
+    def stats(self):
+        """Per-selector tries and hits; selectors with many tries and no hits are dead"""
+        with self._lock:
+            return {
+                selector: {"tries": self._tries[selector], "hits": self._hits[selector]}
+                for selector in self.selectors + self.fallback_selectors
+            }
+
+class SiteExtractorRegistry:
+    """Hostname-indexed lookup of SiteExtractors"""
+
+    def __init__(self, extractors=()):
+        self._by_domain = {}
+        self._extractors = []
+        for extractor in extractors:
+            self.register(extractor)
+
+    def register(self, extractor):
+        """Add a board; its domains also match any subdomain (www., uk., ...)"""
+        self._extractors.append(extractor)
+        for domain in extractor.domains:
+            self._by_domain[domain.lower()] = extractor
+
+    def for_url(self, url):
+        """Return the extractor for url's host, or None for unknown sites"""
+        host = (urlparse(url).hostname or '').lower()
+        # Walk up the domain: jobs.lever.co -> lever.co -> co
+        labels = host.split('.')
+        for index in range(len(labels) - 1):
+            extractor = self._by_domain.get('.'.join(labels[index:]))
+            if extractor is not None:
+                return extractor
+        return None
+
+    def stats(self):
+        return {extractor.name: extractor.stats() for extractor in self._extractors}
+
+    @classmethod
+    def default(cls):
+        return cls(default_extractors())
+
+def default_extractors():
+    """The job boards we know how to scrape"""
+    return [
+        SiteExtractor(
+            'linkedin', 'LinkedIn', ['linkedin.com'],
+            selectors=[
+                'div.description__text',
+                'div.show-more-less-html__markup',
+                'div[data-test-id="job-description"]',
+                'div.jobs-description__content',
+                'div.jobs-box__html-content',
+                'section.jobs-description',
+                'div.jobs-description-content__text',
+                'div.job-view-layout',
+                'div.jobs-details__main-content',
+            ],
+            fallback_selectors=[
+                'div[class*="description"]',
+                'div[class*="job"]',
+            ],
+            # LinkedIn requires more sophisticated headers
+            headers={
+                'Referer': 'https://www.linkedin.com/',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-Site': 'same-origin',
+            },
+            unwanted_phrases=['Show more', 'Show less', 'See who you know'],
+        ),
+        SiteExtractor(
+            'indeed', 'Indeed', ['indeed.com'],
+            # Indeed selectors change frequently
+            selectors=[
+                'div[data-testid="jobsearch-JobComponent-description"]',
+                'div.jobsearch-jobDescriptionText',
+                'div.jobsearch-JobComponent-description',
+                'div#jobDescriptionText',
+                'div.jobsearch-SerpJobCard-description',
+                'div.job-snippet',
+                'span[title]',
+                'div.summary',
+            ],
+            fallback_selectors=[
+                'div[class*="description"]',
+                'div[class*="job"]',
+                'div[id*="description"]',
+                'div[id*="job"]',
+            ],
+        ),
+        SiteExtractor(
+            'glassdoor', 'Glassdoor', ['glassdoor.com'],
+            selectors=[
+                'div.jobDescriptionContent',
+                'div[data-test="jobDescription"]',
+                'div.desc',
+                'div.jobDescription',
+                'section[data-test="description"]',
+            ],
+            unwanted_phrases=['Show More', 'Show Less'],
+        ),
+        SiteExtractor(
+            'lever', 'Lever', ['lever.co'],
+            selectors=[
+                'div[data-qa="job-description"]',
+                'div.section.page-centered',
+                'div.posting-page',
+            ],
+            unwanted_phrases=['Apply for this job'],
+        ),
+        SiteExtractor(
+            'greenhouse', 'Greenhouse', ['greenhouse.io'],
+            selectors=[
+                'div.job__description',
+                'div#content',
+                'div#app_body',
+            ],
+            unwanted_phrases=['Apply for this job', 'Apply for this Job'],
+        ),
+        SiteExtractor(
+            'workday', 'Workday', ['myworkdayjobs.com', 'myworkdaysite.com'],
+            selectors=[
+                'div[data-automation-id="jobPostingDescription"]',
+                'div[data-automation-id="job-posting-details"]',
+            ],
+        ),
+    ]
@@ -0,0 +1,264 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+# Task states, in the order a task moves through them
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+
+class MemoryTaskStore:
+    """Task records held in this process, dropped `ttl` seconds after they finish.
+
+    A store only needs save/get/update/counts. Only the process that ran a
+    task can answer for it, so this store suits a single worker process;
+    SqliteTaskStore shares task state between processes.
+    """
+
+    def __init__(self, ttl=3600, max_records=1000):
+        self.ttl = ttl
+        self.max_records = max_records
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def save(self, record):
+        with self._lock:
+            self._prune()
+            self._records[record['id']] = dict(record)
+
+    def get(self, task_id):
+        with self._lock:
+            record = self._records.get(task_id)
+            return dict(record) if record is not None else None
+
+    def update(self, task_id, **fields):
+        with self._lock:
+            record = self._records.get(task_id)
+            if record is not None:
+                record.update(fields)
+                return dict(record)
+            return None
+
+    def counts(self):
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for record in self._records.values():
+                counts[record['status']] += 1
+            return counts
+
+    def _prune(self):
+        now = time.time()
+        expired = [
+            task_id for task_id, record in self._records.items()
+            if record.get('finished_at') and now - record['finished_at'] > self.ttl
+        ]
+        for task_id in expired:
+            del self._records[task_id]
+        # Still full: drop the oldest finished records
+        if len(self._records) >= self.max_records:
+            finished = sorted(
+                (record['finished_at'], task_id) for task_id, record in self._records.items()
+                if record.get('finished_at')
+            )
+            for _, task_id in finished[:len(self._records) - self.max_records + 1]:
+                del self._records[task_id]
+
+class SqliteTaskStore:
+    """Task records in a SQLite file, so any worker process can answer a status poll.
+
+    Records (including results) are stored as JSON. Finished ones are
+    dropped `ttl` seconds after they finish, and only the newest
+    `max_records` finished ones are kept. Results hold personal details, so
+    a new database file is readable by its owner only.
+    """
+
+    def __init__(self, db_path, ttl=3600, max_records=1000, table='tasks'):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_records = max_records
+        self.table = table
+        self._local = threading.local()
+        _create_private_file(db_path)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "id TEXT PRIMARY KEY, record TEXT NOT NULL, status TEXT NOT NULL, finished_at REAL)"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_finished ON {table} (finished_at)")
+
+    def _conn(self):
+        # sqlite3 connections can't be shared between threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def save(self, record):
+        conn = self._conn()
+        self._prune(conn)
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (id, record, status, finished_at) VALUES (?, ?, ?, ?)",
+            (record['id'], json.dumps(record), record['status'], record.get('finished_at'))
+        )
+
+    def get(self, task_id):
+        row = self._conn().execute(f"SELECT record FROM {self.table} WHERE id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def update(self, task_id, **fields):
+        conn = self._conn()
+        # IMMEDIATE takes the write lock up front, so two processes can't interleave read-modify-write
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(f"SELECT record FROM {self.table} WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            record = json.loads(row[0])
+            record.update(fields)
+            conn.execute(
+                f"UPDATE {self.table} SET record = ?, status = ?, finished_at = ? WHERE id = ?",
+                (json.dumps(record), record['status'], record.get('finished_at'), task_id)
+            )
+            conn.execute("COMMIT")
+            return record
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def counts(self):
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+        for status, count in self._conn().execute(f"SELECT status, COUNT(*) FROM {self.table} GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def _prune(self, conn):
+        conn.execute(f"DELETE FROM {self.table} WHERE finished_at IS NOT NULL AND finished_at < ?",
+                     (time.time() - self.ttl,))
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE id IN ("
+            f"SELECT id FROM {self.table} WHERE finished_at IS NOT NULL ORDER BY finished_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_records,)
+        )
+
+def _create_private_file(path):
+    """Create path with mode 0600 unless it exists; SQLite gives its -wal/-shm files the same mode"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+    except FileExistsError:
+        pass
+
+class TaskQueue:
+    """Runs registered tasks on a local worker pool and tracks them by id.
+
+    Tasks are submitted by name with keyword arguments, never as callables,
+    so the queue can later be moved onto a broker without changing callers.
+    When a task finishes its record (status, result or error) is POSTed to
+    the task's callback URL, if it has one. A task that has not finished
+    `task_timeout` seconds after it was submitted is reported as failed, so
+    one whose process died doesn't stay running forever.
+    """
+
+    def __init__(self, store=None, workers=4, callback_timeout=5, callback_validator=None, task_timeout=None):
+        self.logger = logging.getLogger(__name__)
+        self.store = store or MemoryTaskStore()
+        self.workers = workers
+        self.task_timeout = task_timeout
+        self.callback_timeout = callback_timeout
+        # url -> bool; checked again just before sending, since a host's DNS can change after submit
+        self.callback_validator = callback_validator
+        self._tasks = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def register(self, name, func):
+        """Make func runnable as task `name`"""
+        self._tasks[name] = func
+
+    def submit(self, name, callback_url=None, **kwargs):
+        """Queue task `name` and return its id straight away"""
+        if name not in self._tasks:
+            raise ValueError(f"Unknown task: {name}")
+        if callback_url and self.callback_validator is not None and not self.callback_validator(callback_url):
+            raise ValueError(f"Callback URL not allowed: {callback_url}")
+        record = {
+            'id': uuid.uuid4().hex,
+            'name': name,
+            'status': QUEUED,
+            'result': None,
+            'error': None,
+            'callback_url': callback_url,
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+        }
+        self.store.save(record)
+        self._get_executor().submit(self._run, record['id'], name, kwargs)
+        return record['id']
+
+    def get(self, task_id):
+        """The task's record, or None if it is unknown or has expired"""
+        record = self.store.get(task_id)
+        if record is not None and self._is_stale(record):
+            self.logger.warning(f"Task {record['name']} ({task_id}) did not finish within {self.task_timeout}s")
+            record = self.store.update(
+                task_id, status=FAILED, finished_at=time.time(),
+                error=f"The task did not finish within {self.task_timeout} seconds. Please try again."
+            )
+        return record
+
+    def _is_stale(self, record):
+        return (
+            self.task_timeout is not None
+            and record['status'] in (QUEUED, RUNNING)
+            and time.time() - record['created_at'] > self.task_timeout
+        )
+
+    def _run(self, task_id, name, kwargs):
+        self.store.update(task_id, status=RUNNING, started_at=time.time())
+        try:
+            result = self._tasks[name](**kwargs)
+            record = self.store.update(task_id, status=SUCCEEDED, result=result, finished_at=time.time())
+        except Exception as e:
+            self.logger.error(f"Task {name} ({task_id}) failed: {str(e)}")
+            record = self.store.update(task_id, status=FAILED, error=str(e), finished_at=time.time())
+
+        if record is not None and record.get('callback_url'):
+            self._send_callback(record)
+
+    def _send_callback(self, record):
+        if self.callback_validator is not None and not self.callback_validator(record['callback_url']):
+            self.logger.warning(f"Callback for task {record['id']} to {record['callback_url']} skipped: URL not allowed")
+            return
+        try:
+            # Redirects are not followed: they could point the result at an address the check rejected
+            response = requests.post(
+                record['callback_url'], json=public_record(record), timeout=self.callback_timeout, allow_redirects=False
+            )
+            response.raise_for_status()
+        except Exception as e:
+            self.logger.warning(f"Callback for task {record['id']} to {record['callback_url']} failed: {str(e)}")
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='task-worker')
+            return self._executor
+
+    def stats(self):
+        """Task counts by status, for monitoring"""
+        stats = self.store.counts()
+        stats['workers'] = self.workers
+        return stats
+
+def public_record(record):
+    """The parts of a task record that are returned to clients"""
+    return {key: record[key] for key in ('id', 'name', 'status', 'result', 'error', 'created_at', 'finished_at')}
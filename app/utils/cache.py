@@ -0,0 +1,169 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# value plus the time it was stored; `fresh` is False once it is older than the TTL
+CacheEntry = namedtuple('CacheEntry', ['value', 'stored_at', 'fresh'])
+
+class MemoryCache:
+    """Size-bounded in-memory LRU with expiry"""
+
+    def __init__(self, max_entries=256, max_age=3600):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (value, stored_at) or None"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if time.time() - item[1] > self.max_age:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return item
+
+    def set(self, key, value, stored_at=None):
+        with self._lock:
+            self._data[key] = (value, stored_at if stored_at is not None else time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+class SqliteCache:
+    """On-disk LRU with expiry, shared by every process pointing at the same file"""
+
+    def __init__(self, db_path, max_entries=2048, max_age=3600, table='cache'):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.table = table
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+
+    def _conn(self):
+        # sqlite3 connections can't be shared between threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """Return (value, stored_at) or None"""
+        conn = self._conn()
+        row = conn.execute(
+            f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.max_age:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            return None
+        conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, stored_at=None):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), stored_at if stored_at is not None else now, now)
+        )
+        self._evict(conn, now)
+
+    def delete(self, key):
+        self._conn().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def _evict(self, conn, now):
+        """Drop expired rows, then the least recently used ones beyond max_entries"""
+        conn.execute(f"DELETE FROM {self.table} WHERE stored_at < ?", (now - self.max_age,))
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+class TieredCache:
+    """Memory LRU in front of an optional SQLite tier, with hit/miss counters
+
+    `ttl` is how long an entry counts as fresh; `stale_ttl` keeps it around
+    (marked not fresh) for that much longer so callers can revalidate it.
+    """
+
+    def __init__(self, ttl=3600, max_entries=256, db_path=None, disk_max_entries=2048,
+                 stale_ttl=0, table='cache'):
+        self.ttl = ttl
+        max_age = ttl + stale_ttl
+        self.memory = MemoryCache(max_entries=max_entries, max_age=max_age)
+        self.disk = SqliteCache(db_path, max_entries=disk_max_entries, max_age=max_age, table=table) if db_path else None
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'stale_hits': 0, 'misses': 0}
+        self._stats_lock = threading.Lock()
+
+    def lookup(self, key):
+        """Return a CacheEntry (possibly stale) or None"""
+        item = self.memory.get(key)
+        tier = 'memory_hits'
+        if item is None and self.disk is not None:
+            item = self.disk.get(key)
+            tier = 'disk_hits'
+            if item is not None:
+                # promote so the next lookup in this process stays in memory
+                self.memory.set(key, item[0], stored_at=item[1])
+
+        if item is None:
+            self._count('misses')
+            return None
+
+        value, stored_at = item
+        fresh = time.time() - stored_at <= self.ttl
+        self._count(tier if fresh else 'stale_hits')
+        return CacheEntry(value, stored_at, fresh)
+
+    def get(self, key):
+        """Return the cached value if it is still fresh"""
+        entry = self.lookup(key)
+        return entry.value if entry is not None and entry.fresh else None
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def delete(self, key):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        """Counters plus hit rate for monitoring"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = sum(stats.values())
+        hits = stats['memory_hits'] + stats['disk_hits']
+        stats['hit_rate'] = hits / lookups if lookups else 0.0
+        stats['memory_entries'] = len(self.memory)
+        return stats
@@ -0,0 +1,133 @@
+import re
+from bs4 import NavigableString, Tag
+from bs4.element import PreformattedString
+
+# Never content: dropped from every walk without being decomposed
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'nav', 'header', 'footer', 'aside',
+             'form', 'button', 'svg', 'iframe', 'select'}
+
+# Elements that start a new block of text
+BLOCK_TAGS = {'address', 'article', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figure',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'li', 'main', 'ol', 'p', 'pre', 'section',
+              'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul', 'br'}
+
+# Elements whose text counts as a paragraph when scoring their containers
+PARAGRAPH_TAGS = {'p', 'li', 'pre', 'td', 'blockquote', 'dd'}
+
+MIN_PARAGRAPH_LENGTH = 25
+
+POSITIVE_HINTS = re.compile(r'article|body|content|description|job|main|post|text|detail', re.I)
+NEGATIVE_HINTS = re.compile(r'comment|footer|sidebar|nav|menu|cookie|banner|share|social|related|promo|modal', re.I)
+
+def best_content_block(root):
+    """Return the element most likely to hold the page's main text, or None.
+
+    A single iterative post-order walk computes each element's visible text
+    length and link text length from its children's totals (no element's
+    text is ever serialised), scores paragraph-like elements and credits
+    their parent and grandparent, readability-style.
+    """
+    totals = {}      # id(tag) -> (text_length, link_length)
+    scores = {}      # id(tag) -> accumulated paragraph score
+    candidates = {}  # id(tag) -> tag
+
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children if _is_content_tag(child))
+            continue
+
+        text_length = link_length = 0
+        has_block_child = False
+        for child in node.children:
+            if isinstance(child, Tag):
+                if child.name in SKIP_TAGS:
+                    continue
+                child_text, child_links = totals[id(child)]
+                text_length += child_text
+                link_length += child_links
+                has_block_child = has_block_child or child.name in BLOCK_TAGS
+            elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+                text_length += len(child.strip())
+        if node.name == 'a':
+            link_length = text_length
+        totals[id(node)] = (text_length, link_length)
+
+        is_paragraph = node.name in PARAGRAPH_TAGS or (node.name == 'div' and not has_block_child)
+        if is_paragraph and text_length >= MIN_PARAGRAPH_LENGTH:
+            score = 1 + min(text_length / 100, 3)
+            parent = node.parent
+            if isinstance(parent, Tag):
+                _credit(parent, score, scores, candidates)
+                grandparent = parent.parent
+                if isinstance(grandparent, Tag):
+                    _credit(grandparent, score / 2, scores, candidates)
+
+    best, best_rank = None, (0, 0)
+    for key, tag in candidates.items():
+        text_length, link_length = totals.get(key, (0, 0))
+        if not text_length:
+            continue
+        link_density = link_length / text_length
+        score = (scores[key] + _class_weight(tag)) * (1 - link_density)
+        # Equal scores go to the element holding more text
+        rank = (round(score, 6), text_length)
+        if score > 0 and rank > best_rank:
+            best, best_rank = tag, rank
+    return best
+
+def text_blocks(root):
+    """Visible text of root split at block boundaries, in one pre-order walk"""
+    blocks = []
+    current = []
+    # None on the stack marks the end of a block element
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is None or (isinstance(node, Tag) and node.name in BLOCK_TAGS):
+            if current:
+                blocks.append(' '.join(current))
+                current = []
+            if node is None:
+                continue
+        if isinstance(node, Tag):
+            if node.name in BLOCK_TAGS:
+                stack.append(None)
+            stack.extend(reversed([child for child in node.children if _is_visible(child)]))
+        else:
+            text = node.strip()
+            if text:
+                current.append(text)
+    if current:
+        blocks.append(' '.join(current))
+    return blocks
+
+def _credit(tag, score, scores, candidates):
+    key = id(tag)
+    scores[key] = scores.get(key, 0) + score
+    candidates[key] = tag
+
+def _class_weight(tag):
+    """Bonus or penalty from the element's class and id, as readability does"""
+    classes = tag.get('class') or []
+    if isinstance(classes, str):
+        classes = [classes]
+    hints = ' '.join(classes) + ' ' + (tag.get('id') or '')
+    weight = 0
+    if POSITIVE_HINTS.search(hints):
+        weight += 5
+    if NEGATIVE_HINTS.search(hints):
+        weight -= 5
+    if tag.name in ('article', 'main'):
+        weight += 5
+    return weight
+
+def _is_content_tag(node):
+    return isinstance(node, Tag) and node.name not in SKIP_TAGS
+
+def _is_visible(node):
+    if isinstance(node, Tag):
+        return node.name not in SKIP_TAGS
+    return isinstance(node, NavigableString) and not isinstance(node, PreformattedString)
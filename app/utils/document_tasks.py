@@ -0,0 +1,28 @@
+"""Document parsing and rendering that runs in DocumentExecutor worker processes.
+
+Workers are started with spawn. Each imports this module and the `app`
+package (which only defines create_app), and re-runs the script that
+launched the parent as __mp_main__. Scripts that build the app or import
+app.services therefore do so behind a __name__ check (see run.py), or
+every worker would build the whole service graph. render_pdf comes from
+pdf_render.
+"""
+
+import io
+from docx import Document
+from app.utils.pdf_text import iter_pdf_pages
+from app.utils.pdf_render import render_pdf
+
+def extract_pdf_text(source, max_pages=None, max_chars=None):
+    """Text of a PDF given as a path or bytes, up to the page and character caps"""
+    with _open(source) as f:
+        return "\n".join(iter_pdf_pages(f, max_pages=max_pages, max_chars=max_chars)).strip()
+
+def extract_docx_text(source):
+    """Text of a DOCX given as a path or bytes"""
+    with _open(source) as f:
+        doc = Document(f)
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
+
+def _open(source):
+    return open(source, 'rb') if isinstance(source, str) else io.BytesIO(source)
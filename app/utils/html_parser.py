@@ -0,0 +1,82 @@
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+# tag, then any number of #id, .class or [attr], [attr="v"], [attr*="v"] ... parts
+_COMPOUND_RE = re.compile(r'^([a-zA-Z][\w-]*|\*)?((?:#[\w-]+|\.[\w-]+|\[[^\]]+\])*)$')
+_PART_RE = re.compile(r'#([\w-]+)|\.([\w-]+)|\[\s*([\w-]+)\s*(?:([*^$~|]?=)\s*["\']?([^"\'\]]*)["\']?\s*)?\]')
+
+def parse_html(html, parse_only=None):
+    """Parse html with the fastest installed parser, optionally only the strained parts"""
+    return BeautifulSoup(html, DEFAULT_PARSER, parse_only=parse_only)
+
+def selector_strainer(selectors):
+    """Build a SoupStrainer keeping only elements the given CSS selectors can match.
+
+    Only simple compound selectors (`div.a`, `div#b`, `span[title]`,
+    `div[class*="job"]`) are supported; returns None if any selector is more
+    complex, in which case the caller should parse the whole document.
+    """
+    predicates = []
+    for selector in selectors:
+        predicate = _compile_compound(selector.strip())
+        if predicate is None:
+            return None
+        predicates.append(predicate)
+
+    def match(name, attrs):
+        attrs = attrs or {}
+        return any(predicate(name, attrs) for predicate in predicates)
+
+    return SoupStrainer(match)
+
+def _compile_compound(selector):
+    """Turn one compound selector into a (tag name, attrs) -> bool predicate"""
+    compound = _COMPOUND_RE.match(selector)
+    if compound is None:
+        return None
+
+    tag = compound.group(1)
+    checks = []
+    for part in _PART_RE.finditer(compound.group(2) or ''):
+        element_id, class_name, attr, op, value = part.groups()
+        if element_id:
+            checks.append(('id', '=', element_id))
+        elif class_name:
+            checks.append(('class', '~=', class_name))
+        else:
+            checks.append((attr.lower(), op, value))
+
+    def predicate(name, attrs):
+        if tag and tag != '*' and name != tag:
+            return False
+        return all(_attr_matches(attrs.get(attr), op, value) for attr, op, value in checks)
+
+    return predicate
+
+def _attr_matches(actual, op, expected):
+    """Evaluate one attribute condition against a raw (or list-valued) attribute"""
+    if actual is None:
+        return False
+    if isinstance(actual, (list, tuple)):
+        actual = ' '.join(actual)
+    if op is None:
+        return True
+    if op == '=':
+        return actual == expected
+    if op == '~=':
+        return expected in actual.split()
+    if op == '*=':
+        return expected in actual
+    if op == '^=':
+        return actual.startswith(expected)
+    if op == '$=':
+        return actual.endswith(expected)
+    if op == '|=':
+        return actual == expected or actual.startswith(expected + '-')
+    return False
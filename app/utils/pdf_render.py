@@ -0,0 +1,158 @@
+"""PDF resume layouts with their fonts and styles built once per process.
+
+Fonts are registered and each layout's stylesheet is built the first time
+it is used (or up front by warm_up, which DocumentExecutor workers run when
+they start), so rendering a document only pays for the flowable layout.
+Styles are shared; frames and page templates keep per-build state, so a
+small set of them is made for every document.
+"""
+
+import abc
+import os
+import threading
+from xml.sax.saxutils import escape
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FONT_DIR = os.path.join(PROJECT_ROOT, 'fonts')
+# Registered name -> file in FONT_DIR; Helvetica is used when the file is missing
+FONTS = {'DejaVuSans': 'DejaVuSans.ttf'}
+FALLBACK_FONT = 'Helvetica'
+
+DEFAULT_LAYOUT = 'classic'
+
+_lock = threading.Lock()
+_fonts = None
+_layouts = {}
+
+def register_fonts():
+    """Register the bundled fonts once; returns the name of each font that is usable"""
+    global _fonts
+    with _lock:
+        if _fonts is None:
+            available = {}
+            for name, filename in FONTS.items():
+                path = os.path.join(FONT_DIR, filename)
+                if os.path.exists(path):
+                    pdfmetrics.registerFont(TTFont(name, path))
+                    # Only the regular face is bundled, so it also stands in for bold and italic markup
+                    pdfmetrics.registerFontFamily(name, normal=name, bold=name, italic=name, boldItalic=name)
+                    available[name] = name
+                else:
+                    available[name] = FALLBACK_FONT
+            _fonts = available
+        return _fonts
+
+class PdfLayout(abc.ABC):
+    """One resume design: page geometry, paragraph styles and how content maps onto them"""
+
+    name = None
+    margins = (inch, inch, inch, inch)  # left, right, top, bottom
+
+    def __init__(self, fonts):
+        self.styles = self.build_styles(fonts)
+
+    @abc.abstractmethod
+    def build_styles(self, fonts):
+        """Paragraph styles by name, given the usable name of each font in FONTS"""
+
+    @abc.abstractmethod
+    def build_story(self, content):
+        """Flowables for content"""
+
+    def on_page(self, canvas, doc):
+        pass
+
+    def render(self, content, output_path):
+        left, right, top, bottom = self.margins
+        doc = BaseDocTemplate(output_path, pagesize=letter,
+                              leftMargin=left, rightMargin=right, topMargin=top, bottomMargin=bottom)
+        frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='body')
+        doc.addPageTemplates([PageTemplate(id=self.name, frames=[frame], onPage=self.on_page)])
+        doc.build(self.build_story(content))
+        return output_path
+
+class ClassicLayout(PdfLayout):
+    """The original output: first section as the title, every other section as a paragraph"""
+
+    name = 'classic'
+
+    def build_styles(self, fonts):
+        # Kept in the sample stylesheet's Helvetica, so existing output looks the same
+        styles = getSampleStyleSheet()
+        return {
+            'title': ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=16, spaceAfter=30),
+            'normal': ParagraphStyle('CustomNormal', parent=styles['Normal'], fontSize=11, spaceAfter=12),
+        }
+
+    def build_story(self, content):
+        story = []
+        for i, section in enumerate(content.split('\n\n')):
+            if section.strip():
+                style = self.styles['title'] if i == 0 else self.styles['normal']
+                story.append(Paragraph(escape(section.strip()), style))
+                story.append(Spacer(1, 12))
+        return story
+
+class TailoredLayout(PdfLayout):
+    """The design of templates/resume_template.html: centred blue heading, line breaks kept, footer"""
+
+    name = 'tailored'
+    margins = (30, 30, 30, 50)  # 40px body margin; the bottom also holds the footer
+
+    def build_styles(self, fonts):
+        font = fonts['DejaVuSans']
+        return {
+            'heading': ParagraphStyle('TailoredHeading', fontName=font, fontSize=20, leading=24,
+                                      alignment=TA_CENTER, textColor=colors.HexColor('#004080'), spaceAfter=18),
+            'body': ParagraphStyle('TailoredBody', fontName=font, fontSize=10.5, leading=16.8,
+                                   textColor=colors.HexColor('#333333'), spaceAfter=8.4),
+            'footer': ParagraphStyle('TailoredFooter', fontName=font, fontSize=9,
+                                     alignment=TA_CENTER, textColor=colors.HexColor('#888888')),
+        }
+
+    def build_story(self, content):
+        story = [Paragraph('Tailored Resume', self.styles['heading'])]
+        # white-space: pre-wrap -- lines stay as written, blank lines separate paragraphs
+        for section in content.strip().split('\n\n'):
+            if section.strip():
+                lines = [escape(line.rstrip()) for line in section.strip('\n').split('\n')]
+                story.append(Paragraph('<br/>'.join(lines), self.styles['body']))
+        return story
+
+    def on_page(self, canvas, doc):
+        footer = self.styles['footer']
+        canvas.saveState()
+        canvas.setFont(footer.fontName, footer.fontSize)
+        canvas.setFillColor(footer.textColor)
+        canvas.drawCentredString(doc.pagesize[0] / 2, 24, 'Generated by rez.ai')
+        canvas.restoreState()
+
+LAYOUTS = {layout.name: layout for layout in (ClassicLayout, TailoredLayout)}
+
+def get_layout(name=None):
+    """The named layout, built on first use"""
+    name = name or DEFAULT_LAYOUT
+    if name not in LAYOUTS:
+        raise ValueError(f"Unknown PDF layout: {name}")
+    fonts = register_fonts()
+    with _lock:
+        if name not in _layouts:
+            _layouts[name] = LAYOUTS[name](fonts)
+        return _layouts[name]
+
+def warm_up():
+    """Register fonts and build every layout, so the first render in this process is not the slow one"""
+    for name in LAYOUTS:
+        get_layout(name)
+
+def render_pdf(content, output_path, layout=None):
+    """Write content to output_path as a PDF in the given layout"""
+    return get_layout(layout).render(content, output_path)
@@ -0,0 +1,18 @@
+import PyPDF2
+
+def iter_pdf_pages(stream, max_pages=None, max_chars=None):
+    """Yield the text of each page in order, stopping after max_pages pages or max_chars characters"""
+    reader = PyPDF2.PdfReader(stream)
+    page_count = len(reader.pages)
+    if max_pages:
+        page_count = min(page_count, max_pages)
+
+    remaining = max_chars
+    for index in range(page_count):
+        text = reader.pages[index].extract_text() or ''
+        if remaining is not None:
+            if len(text) >= remaining:
+                yield text[:remaining]
+                return
+            remaining -= len(text)
+        yield text
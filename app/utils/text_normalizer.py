@@ -0,0 +1,76 @@
+import re
+
+# Page chrome that shows up inside scraped job descriptions
+DEFAULT_UNWANTED_PHRASES = (
+    'Sign in',
+    'Create account',
+    'Apply now',
+    'Save job',
+    'Share',
+    'Report job',
+    'Cookie policy',
+    'Privacy policy',
+)
+
+_NON_WORD_RE = re.compile(r'[^\w\s]+')
+
+class TextNormalizer:
+    """Unwanted-phrase removal and whitespace collapsing in one regex pass plus one split/join.
+
+    The phrases are removed by a single scan of one precompiled alternation,
+    then whitespace (including the gaps left by removed phrases) is collapsed
+    with str.split/join, which runs in C and beats any regex. Phrases only
+    match as whole words, so 'Share' is removed but 'SharePoint' survives.
+    """
+
+    def __init__(self, unwanted_phrases=DEFAULT_UNWANTED_PHRASES):
+        self.unwanted_phrases = tuple(unwanted_phrases)
+        self._pattern = None
+        if self.unwanted_phrases:
+            # Longest first so a longer phrase wins over its prefix; inner spaces match any whitespace run
+            phrases = sorted(self.unwanted_phrases, key=len, reverse=True)
+            alternation = '|'.join(r'\s+'.join(map(re.escape, phrase.split())) for phrase in phrases)
+            # No leading \b: it would stop re from skipping ahead on the phrases' first characters.
+            # The leading word boundary is checked in _drop_phrase instead.
+            self._pattern = re.compile(rf'(?:{alternation})\b')
+
+    def clean(self, text):
+        """Collapse whitespace to single spaces and drop unwanted phrases"""
+        if not text:
+            return ""
+        if self._pattern is not None:
+            text = self._pattern.sub(self._drop_phrase, text)
+        return ' '.join(text.split())
+
+    def clean_lines(self, text):
+        """Like clean, but keeps line breaks: each line is collapsed and empty lines are dropped"""
+        if not text:
+            return ""
+        if self._pattern is not None:
+            text = self._pattern.sub(self._drop_phrase, text)
+        lines = (' '.join(line.split()) for line in text.splitlines())
+        return '\n'.join(line for line in lines if line)
+
+    @staticmethod
+    def _drop_phrase(match):
+        start = match.start()
+        if start and _is_word_char(match.string[start - 1]):
+            return match.group()
+        return ' '
+
+    def extend(self, phrases):
+        """A new normalizer that also removes `phrases`"""
+        return TextNormalizer(self.unwanted_phrases + tuple(phrases))
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+default_normalizer = TextNormalizer()
+
+def clean_text(text):
+    """Clean scraped text with the default phrase list"""
+    return default_normalizer.clean(text)
+
+def keyword_tokens(text):
+    """Lowercased words with punctuation stripped, e.g. for keyword matching"""
+    return _NON_WORD_RE.sub('', text.lower()).split()
@@ -0,0 +1,45 @@
+import math
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:
+    # tiktoken is in requirements.txt; without it every count below is an estimate, not exact
+    tiktoken = None
+
+# Rough characters-per-token for English prose when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+@lru_cache(maxsize=8)
+def _encoding(model):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('cl100k_base')
+
+def count_tokens(text, model='gpt-3.5-turbo'):
+    """Tokens in text for model: exact with tiktoken, otherwise a len/4 estimate"""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_encoding(model).encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def trim_to_tokens(text, max_tokens, model='gpt-3.5-turbo'):
+    """Cut text to at most max_tokens, preferring to end on a line or sentence break"""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    if tiktoken is not None:
+        encoding = _encoding(model)
+        cut = encoding.decode(encoding.encode(text)[:max_tokens])
+    else:
+        cut = text[:max_tokens * CHARS_PER_TOKEN]
+
+    # Back up to the last break if that keeps most of the text
+    for separator in ('\n', '. '):
+        position = cut.rfind(separator)
+        if position > len(cut) * 0.8:
+            return cut[:position + 1].rstrip()
+    return cut.rstrip()
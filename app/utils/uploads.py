@@ -0,0 +1,157 @@
+import hashlib
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+class SpooledUpload:
+    """Destination for one uploaded file while the request body is parsed.
+
+    Data stays in memory up to `spool_threshold` bytes and then moves to a
+    named temporary file, which other processes can open by `path`. The
+    upload is counted and hashed as it arrives, so the size limit is
+    enforced before the rest of an oversized file is read and the content
+    hash is known without reading the file again.
+    """
+
+    def __init__(self, spool_threshold=256 * 1024, max_bytes=None):
+        self.spool_threshold = spool_threshold
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._file = io.BytesIO()
+        self._digest = hashlib.sha256()
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise RequestEntityTooLarge(f"The uploaded file is larger than the {format_size(self.max_bytes)} limit.")
+        self._digest.update(data)
+        if not self.on_disk and self.size > self.spool_threshold:
+            self._rollover()
+        return self._file.write(data)
+
+    def _rollover(self):
+        spooled = tempfile.NamedTemporaryFile(prefix='upload-')
+        spooled.write(self._file.getbuffer())
+        spooled.seek(self._file.tell())
+        self._file = spooled
+
+    @property
+    def sha256(self):
+        return self._digest.hexdigest()
+
+    @property
+    def on_disk(self):
+        return not isinstance(self._file, io.BytesIO)
+
+    @property
+    def path(self):
+        """Path of the spool file once the upload is on disk, else None; it is removed when the upload is closed"""
+        if not self.on_disk:
+            return None
+        self._file.flush()
+        return self._file.name
+
+    @contextmanager
+    def view(self):
+        """The whole upload as a read-only buffer: an mmap of the spool file, or the in-memory buffer"""
+        if self.size == 0:
+            yield memoryview(b'')
+        elif self.on_disk:
+            self._file.flush()
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+        else:
+            buffer = self._file.getbuffer()
+            try:
+                yield buffer
+            finally:
+                buffer.release()
+
+    def __getattr__(self, name):
+        # read, seek, tell, readline, close, ... come from the current file
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+class UploadRequest(Request):
+    """Flask request that parses file uploads into SpooledUpload containers"""
+
+    upload_spool_threshold = 256 * 1024
+    upload_max_file_bytes = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if content_length is not None and self.upload_max_file_bytes is not None \
+                and content_length > self.upload_max_file_bytes:
+            raise RequestEntityTooLarge(f"The uploaded file is larger than the {format_size(self.upload_max_file_bytes)} limit.")
+        return SpooledUpload(self.upload_spool_threshold, self.upload_max_file_bytes)
+
+def configure_uploads(app):
+    """Make app parse uploads into SpooledUpload containers using its UPLOAD_* settings"""
+    app.request_class = type('SpooledUploadRequest', (UploadRequest,), {
+        'upload_spool_threshold': app.config['UPLOAD_SPOOL_THRESHOLD'],
+        'upload_max_file_bytes': app.config['MAX_UPLOAD_FILE_BYTES'],
+    })
+
+@contextmanager
+def upload_view(file):
+    """Read-only buffer over an uploaded file's bytes, zero-copy for SpooledUpload streams"""
+    stream = getattr(file, 'stream', file)
+    if isinstance(stream, SpooledUpload):
+        with stream.view() as view:
+            yield view
+    else:
+        stream.seek(0)
+        yield stream.read()
+        stream.seek(0)
+
+def upload_path(file):
+    """Path to an upload's bytes on disk if it has one (a spooled upload or a file opened from disk), else None"""
+    stream = getattr(file, 'stream', file)
+    if isinstance(stream, SpooledUpload):
+        return stream.path
+    name = getattr(stream, 'name', None)
+    return name if isinstance(name, str) and os.path.isfile(name) else None
+
+@contextmanager
+def upload_source(file):
+    """What another process reads an upload from: a path, or the bytes of an upload small enough to stay in memory.
+
+    Spooled and on-disk uploads are passed by path. Any other stream is
+    copied to a temporary file for the duration of the block rather than
+    into memory.
+    """
+    path = upload_path(file)
+    if path is not None:
+        yield path
+        return
+    stream = getattr(file, 'stream', file)
+    if isinstance(stream, SpooledUpload):
+        # Still in memory, so no larger than the spool threshold
+        with stream.view() as view:
+            data = bytes(view)
+        yield data
+        return
+    stream.seek(0)
+    with tempfile.NamedTemporaryFile(prefix='upload-') as tmp:
+        shutil.copyfileobj(stream, tmp)
+        tmp.flush()
+        stream.seek(0)
+        yield tmp.name
+
+def format_size(size):
+    """Byte count for messages: '900 bytes', '256 KB', '1.5 MB'"""
+    for unit, scale in (('MB', 1024 * 1024), ('KB', 1024)):
+        if size >= scale:
+            return f"{size / scale:.1f}".rstrip('0').rstrip('.') + f" {unit}"
+    return f"{size} bytes"
+
+def upload_sha256(file):
+    """SHA-256 of an upload if it was computed while the upload was received, else None"""
+    stream = getattr(file, 'stream', file)
+    return stream.sha256 if isinstance(stream, SpooledUpload) else None
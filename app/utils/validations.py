@@ -12,6 +12,10 @@ def validate_url(url):
 def validate_file_size(file, max_size_mb=16):
     """Validate file size."""
     if file:
+        # Spooled uploads counted their bytes as they arrived
+        size = getattr(getattr(file, 'stream', file), 'size', None)
+        if isinstance(size, int):
+            return size <= max_size_mb * 1024 * 1024
         file.seek(0, 2)  # Seek to end
         size = file.tell()
         file.seek(0)  # Reset to beginning
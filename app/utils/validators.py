@@ -1,4 +1,7 @@
+import ipaddress
+import os
 import re
+import socket
 from urllib.parse import urlparse
 
 def validate_url(url):
@@ -9,9 +12,34 @@ def validate_url(url):
     except Exception:
         return False
 
+def validate_callback_url(url, allowed_hosts=()):
+    """Whether the server may POST results to url: https, and an allowed host or one that is only on public addresses.
+
+    With allowed_hosts, the host must be one of them or a subdomain of one.
+    Without, the host is resolved and every address must be public, which
+    keeps callbacks away from loopback, private, link-local (cloud metadata)
+    and other internal addresses.
+    """
+    try:
+        result = urlparse(url)
+        host = result.hostname
+        if result.scheme != 'https' or not host:
+            return False
+        if allowed_hosts:
+            host = host.lower().rstrip('.')
+            return any(host == allowed or host.endswith('.' + allowed) for allowed in allowed_hosts)
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, result.port or 443, proto=socket.IPPROTO_TCP)}
+        return bool(addresses) and all(ipaddress.ip_address(address.split('%')[0]).is_global for address in addresses)
+    except (ValueError, OSError):
+        return False
+
 def validate_file_size(file, max_size_mb=16):
     """Validate file size."""
     if file:
+        # Spooled uploads counted their bytes as they arrived
+        size = getattr(getattr(file, 'stream', file), 'size', None)
+        if isinstance(size, int):
+            return size <= max_size_mb * 1024 * 1024
         file.seek(0, 2)  # Seek to end
         size = file.tell()
         file.seek(0)  # Reset to beginning
@@ -0,0 +1,56 @@
+"""Tailor one master resume against many job postings, offline.
+
+    python batch_tailor.py jobs.jsonl --resume master_resume.pdf --output results.jsonl
+
+Each line of jobs.jsonl is a JSON object with an optional "id" plus a
+"job_description" or "job_url" (and optionally "resume_text"). Rerunning with the same --output resumes where a crashed
+or interrupted run stopped. Set OPENAI_BASE_URL to point at a local
+OpenAI-compatible server.
+"""
+
+import argparse
+import json
+import logging
+from werkzeug.datastructures import FileStorage
+from app.utils.pdf_render import LAYOUTS
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batch-tailor a resume against a JSONL file of jobs")
+    parser.add_argument('input', help="JSONL file of jobs")
+    parser.add_argument('--resume', help="master resume (.pdf, .docx or .txt) used when an item has no resume_text")
+    parser.add_argument('--output', default='batch_results.jsonl', help="results JSONL, also the checkpoint")
+    parser.add_argument('--concurrency', type=int, default=8, help="items processed at once")
+    parser.add_argument('--no-pdf', action='store_true', help="skip writing a PDF per result")
+    parser.add_argument('--layout', choices=sorted(LAYOUTS), help="PDF layout (default: PDF_LAYOUT)")
+    parser.add_argument('--skip-failed', action='store_true', help="do not retry items that failed in an earlier run")
+    return parser.parse_args()
+
+def read_resume(document_service, path):
+    with open(path, 'rb') as f:
+        return document_service.extract_text_from_file(FileStorage(stream=f, filename=path))
+
+def main():
+    args = parse_args()
+    # Imported here, not at the top: document worker processes re-run this script and must not build the services
+    from app.services import async_openai_service, document_service, resume_service
+    from app.services.batch_pipeline import BatchTailorPipeline
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    pipeline = BatchTailorPipeline(
+        async_openai_service,
+        document_service=document_service,
+        resume_service=resume_service,
+        concurrency=args.concurrency,
+        write_pdfs=not args.no_pdf,
+        pdf_layout=args.layout,
+    )
+    report = pipeline.run(
+        args.input,
+        args.output,
+        resume_text=read_resume(document_service, args.resume) if args.resume else None,
+        retry_failed=not args.skip_failed,
+    )
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
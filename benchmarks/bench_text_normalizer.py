@@ -0,0 +1,65 @@
+"""Micro-benchmark: legacy JobScraper._clean_text vs TextNormalizer.
+
+Run from the project root:
+
+    python -m benchmarks.bench_text_normalizer
+
+Reports the cost per call on one snippet, and the cost per selector match
+(many elements), where the scraper now cleans the joined text once instead
+of cleaning every element separately.
+"""
+
+import random
+import timeit
+from app.utils.text_normalizer import DEFAULT_UNWANTED_PHRASES, TextNormalizer
+
+def legacy_clean_text(text):
+    """The split/join + one str.replace per phrase implementation it replaced"""
+    if not text:
+        return ""
+    text = ' '.join(text.split())
+    for phrase in DEFAULT_UNWANTED_PHRASES:
+        text = text.replace(phrase, '')
+    return text.strip()
+
+def make_samples(count, seed=42):
+    """Scraped-looking snippets: prose, ragged whitespace and page chrome"""
+    rng = random.Random(seed)
+    words = ('experience python flask engineering team build ship reliable services '
+             'requirements benefits remote hybrid senior data pipelines').split()
+    chrome = list(DEFAULT_UNWANTED_PHRASES)
+    samples = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(5, 120)):
+            parts.append(rng.choice(chrome) if rng.random() < 0.05 else rng.choice(words))
+            parts.append(rng.choice([' ', '  ', '\n', '\t ', ' \n\n ']))
+        samples.append(''.join(parts))
+    return samples
+
+def best_of(func, repeat, number):
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+def main(repeat=5, number=20):
+    samples = make_samples(2000)
+    normalizer = TextNormalizer()
+    # A selector match is a list of elements; group the snippets 40 to a match
+    matches = [samples[i:i + 40] for i in range(0, len(samples), 40)]
+
+    legacy_call = best_of(lambda: [legacy_clean_text(s) for s in samples], repeat, number)
+    new_call = best_of(lambda: [normalizer.clean(s) for s in samples], repeat, number)
+
+    legacy_match = best_of(
+        lambda: [' '.join([legacy_clean_text(s) for s in match]) for match in matches], repeat, number
+    )
+    new_match = best_of(lambda: [normalizer.clean(' '.join(match)) for match in matches], repeat, number)
+
+    print(f"per call ({len(samples)} snippets)")
+    print(f"  legacy _clean_text: {legacy_call * 1e6 / len(samples):8.2f} us")
+    print(f"  TextNormalizer:     {new_call * 1e6 / len(samples):8.2f} us   ({legacy_call / new_call:.2f}x)")
+    print(f"per selector match ({len(matches)} matches of 40 elements)")
+    print(f"  legacy, per element: {legacy_match * 1e6 / len(matches):8.2f} us")
+    print(f"  normalizer, joined:  {new_match * 1e6 / len(matches):8.2f} us   ({legacy_match / new_match:.2f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ class Config:
     """Base configuration class."""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL')  # e.g. a local OpenAI-compatible server
     
     # LinkedIn OAuth
     LINKEDIN_CLIENT_ID = os.environ.get('LINKEDIN_CLIENT_ID')
@@ -17,6 +18,95 @@ class Config:
     UPLOAD_FOLDER = 'uploads'
     ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.txt'}
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    MAX_UPLOAD_FILE_BYTES = int(os.environ.get('MAX_UPLOAD_FILE_BYTES', 16 * 1024 * 1024))  # checked while streaming
+    UPLOAD_SPOOL_THRESHOLD = int(os.environ.get('UPLOAD_SPOOL_THRESHOLD', 256 * 1024))  # larger uploads go to disk
+    
+    # PDF text extraction: stop after this much text
+    PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))
+    PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 100000))
+    PDF_LAYOUT = os.environ.get('PDF_LAYOUT', 'classic')  # layout for generated PDFs: classic or tailored
+    
+    # Process pool for PDF/DOCX parsing and PDF rendering
+    DOCUMENT_WORKERS = int(os.environ.get('DOCUMENT_WORKERS', os.environ.get('PDF_WORKERS', 2)))  # 0 works in the request thread
+    DOCUMENT_TASK_TIMEOUT = float(os.environ.get('DOCUMENT_TASK_TIMEOUT', 30))  # seconds before a worker is killed
+    DOCUMENT_MAX_PENDING = int(os.environ.get('DOCUMENT_MAX_PENDING', 0)) or None  # default: 4 per worker
+    DOCUMENT_MAX_TASKS_PER_CHILD = int(os.environ.get('DOCUMENT_MAX_TASKS_PER_CHILD', 100))
+    
+    # Scraper HTTP pooling
+    SCRAPER_POOL_CONNECTIONS = int(os.environ.get('SCRAPER_POOL_CONNECTIONS', 10))  # hosts kept alive
+    SCRAPER_POOL_MAXSIZE = int(os.environ.get('SCRAPER_POOL_MAXSIZE', 10))  # connections per host
+    SCRAPER_MAX_RETRIES = int(os.environ.get('SCRAPER_MAX_RETRIES', 2))
+    SCRAPER_RETRY_BACKOFF = float(os.environ.get('SCRAPER_RETRY_BACKOFF', 0.5))
+    
+    # Per-host politeness: at most SCRAPER_HOST_BURST requests per SCRAPER_HOST_MIN_INTERVAL seconds
+    SCRAPER_HOST_MIN_INTERVAL = float(os.environ.get('SCRAPER_HOST_MIN_INTERVAL', 1.0))
+    SCRAPER_HOST_BURST = int(os.environ.get('SCRAPER_HOST_BURST', 1))
+    SCRAPER_RATE_LIMIT_DB = os.environ.get('SCRAPER_RATE_LIMIT_DB')  # SQLite path to share across processes
+    
+    # Batch extraction
+    SCRAPER_BATCH_WORKERS = int(os.environ.get('SCRAPER_BATCH_WORKERS', 8))
+    SCRAPER_PER_HOST_CONCURRENCY = int(os.environ.get('SCRAPER_PER_HOST_CONCURRENCY', 2))
+    BATCH_MAX_URLS = int(os.environ.get('BATCH_MAX_URLS', 50))
+    
+    # Threads that parse a resume while the request thread fetches its job page; each one mostly
+    # waits on the document workers, so by default there is one per DOCUMENT_MAX_PENDING slot
+    RESUME_STAGE_WORKERS = int(os.environ.get('RESUME_STAGE_WORKERS', 0)) or None
+    
+    # Debug HTML capture: 'off', 'failure' (failed extractions) or 'sample' (failures + every Nth page)
+    SCRAPER_DEBUG_HTML = os.environ.get('SCRAPER_DEBUG_HTML', 'off').lower()
+    SCRAPER_DEBUG_SAMPLE_EVERY = int(os.environ.get('SCRAPER_DEBUG_SAMPLE_EVERY', 50))
+    SCRAPER_DEBUG_DIR = os.environ.get('SCRAPER_DEBUG_DIR', 'debug_html')
+    SCRAPER_DEBUG_MAX_FILES = int(os.environ.get('SCRAPER_DEBUG_MAX_FILES', 20))
+    SCRAPER_DEBUG_MAX_BYTES = int(os.environ.get('SCRAPER_DEBUG_MAX_BYTES', 20 * 1024 * 1024))
+    
+    # Scraped job description cache
+    JOB_CACHE_TTL = int(os.environ.get('JOB_CACHE_TTL', 3600))  # seconds
+    JOB_CACHE_STALE_TTL = int(os.environ.get('JOB_CACHE_STALE_TTL', 7 * 24 * 3600))  # kept for revalidation
+    JOB_CACHE_MAX_ENTRIES = int(os.environ.get('JOB_CACHE_MAX_ENTRIES', 256))  # in-memory, per process
+    JOB_CACHE_DB = os.environ.get('JOB_CACHE_DB')  # optional SQLite file shared by all workers
+    JOB_CACHE_DB_MAX_ENTRIES = int(os.environ.get('JOB_CACHE_DB_MAX_ENTRIES', 2048))
+    
+    # Shared OpenAI client: completions beyond the limit wait for a slot; 429/5xx are retried with backoff
+    OPENAI_MAX_CONCURRENCY = int(os.environ.get('OPENAI_MAX_CONCURRENCY', 4))  # per process
+    OPENAI_MAX_RETRIES = int(os.environ.get('OPENAI_MAX_RETRIES', 4))
+    OPENAI_BACKOFF_BASE = float(os.environ.get('OPENAI_BACKOFF_BASE', 0.5))  # seconds, doubled per retry
+    OPENAI_BACKOFF_MAX = float(os.environ.get('OPENAI_BACKOFF_MAX', 30.0))
+    OPENAI_TIMEOUT = float(os.environ.get('OPENAI_TIMEOUT', 60.0))
+    OPENAI_ASYNC_MAX_CONCURRENCY = int(os.environ.get('OPENAI_ASYNC_MAX_CONCURRENCY', 200))  # per event loop
+    
+    # Input-token budgets per generation (resume/user info plus job description, excluding prompt wording)
+    PROMPT_BUDGET_TAILOR_RESUME = int(os.environ.get('PROMPT_BUDGET_TAILOR_RESUME', 3000))
+    PROMPT_BUDGET_GENERATE_RESUME = int(os.environ.get('PROMPT_BUDGET_GENERATE_RESUME', 3000))
+    PROMPT_BUDGET_COVER_LETTER = int(os.environ.get('PROMPT_BUDGET_COVER_LETTER', 3000))
+    PROMPT_BUDGET_ANALYZE_FIT = int(os.environ.get('PROMPT_BUDGET_ANALYZE_FIT', 3000))
+    PROMPT_BUDGET_BUNDLE = int(os.environ.get('PROMPT_BUDGET_BUNDLE', 3000))
+    
+    # Background generation tasks
+    TASK_WORKERS = int(os.environ.get('TASK_WORKERS', 4))
+    TASK_RESULT_TTL = int(os.environ.get('TASK_RESULT_TTL', 3600))  # seconds a finished task stays readable
+    TASK_MAX_RECORDS = int(os.environ.get('TASK_MAX_RECORDS', 1000))
+    # SQLite file holding task state, so a status poll can land on any worker process (created owner-only,
+    # since results hold names and contact details); empty keeps task state in each process
+    TASK_STORE_DB = os.environ.get('TASK_STORE_DB', '')
+    # A task still queued or running this many seconds after it was submitted is reported as failed,
+    # e.g. because the process running it died
+    TASK_TIMEOUT = int(os.environ.get('TASK_TIMEOUT', 600))
+    # Hosts (and their subdomains) results may be POSTed to; empty allows any https host on public addresses
+    TASK_CALLBACK_ALLOWED_HOSTS = tuple(
+        host.strip().lower() for host in os.environ.get('TASK_CALLBACK_ALLOWED_HOSTS', '').split(',') if host.strip()
+    )
+    
+    # Extracted resume text, keyed on a hash of the uploaded file
+    RESUME_CACHE_TTL = int(os.environ.get('RESUME_CACHE_TTL', 30 * 24 * 3600))  # seconds
+    RESUME_CACHE_MAX_ENTRIES = int(os.environ.get('RESUME_CACHE_MAX_ENTRIES', 128))  # in-memory, per process
+    RESUME_CACHE_DB = os.environ.get('RESUME_CACHE_DB')  # optional SQLite file shared by all workers
+    RESUME_CACHE_DB_MAX_ENTRIES = int(os.environ.get('RESUME_CACHE_DB_MAX_ENTRIES', 1024))
+    
+    # OpenAI completion cache (identical prompts reuse the stored answer)
+    COMPLETION_CACHE_TTL = int(os.environ.get('COMPLETION_CACHE_TTL', 24 * 3600))  # seconds
+    COMPLETION_CACHE_MAX_ENTRIES = int(os.environ.get('COMPLETION_CACHE_MAX_ENTRIES', 128))  # in-memory, per process
+    COMPLETION_CACHE_DB = os.environ.get('COMPLETION_CACHE_DB')  # optional SQLite file shared by all workers
+    COMPLETION_CACHE_DB_MAX_ENTRIES = int(os.environ.get('COMPLETION_CACHE_DB_MAX_ENTRIES', 1024))
     
     # Mode settings
     SIMULATED_MODE = os.environ.get('SIMULATED_MODE', 'true').lower() == 'true'
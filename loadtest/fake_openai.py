@@ -0,0 +1,214 @@
+"""Local OpenAI-compatible chat completions stub for offline load tests.
+
+    python -m loadtest.fake_openai --port 8090 --latency-ms 400 --tokens-per-second 80 --rate-429 0.05
+
+Serves POST /v1/chat/completions, plain or streamed (server-sent events),
+with a log-normal time to first token, a fixed token rate, and randomly
+injected 429 (with retry-after-ms) and 500 responses. Point the app at it
+with OPENAI_BASE_URL=http://127.0.0.1:8090/v1.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = ('experienced engineer delivered scalable python services improved reliability led team '
+         'designed data pipelines reduced latency shipped features collaborated stakeholders').split()
+
+class FakeOpenAIConfig:
+    """Behaviour of the stub; every field maps to a command-line option"""
+
+    def __init__(self, latency_ms=300.0, latency_sigma=0.5, tokens_per_second=100.0, completion_tokens=400,
+                 rate_429=0.0, rate_500=0.0, retry_after_ms=200, seed=None):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.retry_after_ms = retry_after_ms
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.counts = {'requests': 0, 'completions': 0, 'streams': 0, '429': 0, '500': 0}
+
+    def first_token_delay(self):
+        """Seconds before the first token: log-normal around latency_ms"""
+        with self.lock:
+            return self.random.lognormvariate(math.log(max(self.latency_ms, 1) / 1000), self.latency_sigma)
+
+    def injected_error(self):
+        with self.lock:
+            roll = self.random.random()
+        if roll < self.rate_429:
+            return 429
+        if roll < self.rate_429 + self.rate_500:
+            return 500
+        return None
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    config = FakeOpenAIConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/stats'):
+            with self.config.lock:
+                self._send_json(200, dict(self.config.counts))
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        self.config.count('requests')
+
+        error = self.config.injected_error()
+        if error == 429:
+            self.config.count('429')
+            self._send_json(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                            {'retry-after-ms': str(self.config.retry_after_ms)})
+            return
+        if error == 500:
+            self.config.count('500')
+            self._send_json(500, {"error": {"message": "Injected server error", "type": "server_error"}})
+            return
+
+        tokens = min(request.get('max_tokens') or self.config.completion_tokens, self.config.completion_tokens)
+        words = [self.config.random.choice(WORDS) for _ in range(tokens)]
+        time.sleep(self.config.first_token_delay())
+
+        if request.get('stream'):
+            self.config.count('streams')
+            self._stream(request, words)
+        else:
+            self.config.count('completions')
+            time.sleep(tokens / self.config.tokens_per_second)
+            self._send_json(200, self._completion(request, ' '.join(words), len(words)))
+
+    def _completion(self, request, content, completion_tokens):
+        # An answer longer than max_tokens is cut off, as the real API does
+        truncated = completion_tokens < self.config.completion_tokens
+        if request.get('response_format', {}).get('type') == 'json_object':
+            content = json.dumps({key: content for key in ('tailored_resume', 'cover_letter', 'fit_analysis')})
+            if truncated:
+                content = content[:len(content) // 2]
+        prompt_tokens = sum(len(message.get('content', '')) for message in request.get('messages', [])) // 4
+        return {
+            "id": f"chatcmpl-fake-{next(self.config.ids)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get('model', 'fake'),
+            "choices": [{"index": 0, "finish_reason": "length" if truncated else "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def _stream(self, request, words):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        chunk_id = f"chatcmpl-fake-{next(self.config.ids)}"
+        interval = 1 / self.config.tokens_per_second
+        for index, word in enumerate(words):
+            self._write_event({
+                "id": chunk_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get('model', 'fake'),
+                "choices": [{"index": 0, "finish_reason": None,
+                             "delta": {"content": word if index == 0 else ' ' + word}}],
+            })
+            time.sleep(interval)
+        self._write_chunk(b'data: [DONE]\n\n')
+        self._write_chunk(b'')
+
+    def _write_event(self, data):
+        self._write_chunk(f"data: {json.dumps(data)}\n\n".encode('utf-8'))
+
+    def _write_chunk(self, payload):
+        self.wfile.write(f"{len(payload):x}\r\n".encode('ascii') + payload + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+def make_server(host='127.0.0.1', port=8090, config=None):
+    """A FakeOpenAIServer with its own handler config; call serve_forever() to run it"""
+    handler = type('ConfiguredFakeOpenAIHandler', (FakeOpenAIHandler,), {'config': config or FakeOpenAIConfig()})
+    return FakeOpenAIServer((host, port), handler)
+
+def start_in_thread(host='127.0.0.1', port=0, config=None):
+    """Start a server on a daemon thread and return it; port 0 picks a free port"""
+    server = make_server(host, port, config)
+    threading.Thread(target=server.serve_forever, name='fake-openai', daemon=True).start()
+    return server
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub for offline load tests")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    add_config_arguments(parser)
+    return parser.parse_args(argv)
+
+def add_config_arguments(parser):
+    parser.add_argument('--latency-ms', type=float, default=300.0, help="median time to first token")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="log-normal spread of that latency")
+    parser.add_argument('--tokens-per-second', type=float, default=100.0)
+    parser.add_argument('--completion-tokens', type=int, default=400, help="tokens per answer (capped by max_tokens)")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument('--rate-500', type=float, default=0.0, help="fraction of requests answered 500")
+    parser.add_argument('--retry-after-ms', type=int, default=200)
+    parser.add_argument('--seed', type=int)
+
+def config_from_args(args):
+    return FakeOpenAIConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        retry_after_ms=args.retry_after_ms,
+        seed=args.seed,
+    )
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = make_server(args.host, args.port, config_from_args(args))
+    print(f"Fake OpenAI API on http://{args.host}:{server.server_port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
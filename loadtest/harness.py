@@ -0,0 +1,217 @@
+"""Load generator for the generation routes, reporting latency percentiles and throughput.
+
+Against an app that is already running (pointed at a fake or real API):
+
+    python -m loadtest.harness --target http://127.0.0.1:5000 --scenario tailor-resume --concurrency 16 --requests 200
+
+Or self-contained: start the fake OpenAI server and the Flask app in this
+process on free ports, then drive them:
+
+    python -m loadtest.harness --spawn --scenario generate-resume --concurrency 32 --duration 30 --rate-429 0.05
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import requests
+from loadtest import fake_openai
+
+RESUME_FORM = {
+    'full_name': 'Jane Doe',
+    'email': 'jane@example.com',
+    'phone': '555-0100',
+    'location': 'Austin, TX',
+    'professional_summary': 'Backend engineer with eight years of Python and Flask experience.',
+    'work_experience': 'Senior Engineer, Acme (2019-2024): built and ran payment APIs.',
+    'education': 'BSc Computer Science',
+    'skills': 'Python, Flask, PostgreSQL, Redis, AWS',
+    'job_description': 'We are hiring a senior Python engineer to build Flask services on AWS.',
+}
+
+COVER_LETTER_FORM = {
+    'full_name': 'Jane Doe',
+    'email': 'jane@example.com',
+    'company_name': 'Acme',
+    'background_summary': 'Backend engineer with eight years of Python and Flask experience.',
+    'key_achievements': 'Cut checkout latency by 40%.',
+    'job_description': 'We are hiring a senior Python engineer to build Flask services on AWS.',
+}
+
+TAILOR_JSON = {
+    'resume_text': 'Jane Doe\nSenior Engineer, Acme (2019-2024)\nPython, Flask, PostgreSQL',
+    'job_description': 'We are hiring a senior Python engineer to build Flask services on AWS.',
+}
+
+# name -> (path, keyword arguments for requests.post)
+SCENARIOS = {
+    'generate-resume': ('/generate-resume', {'data': RESUME_FORM}),
+    'generate-cover-letter': ('/generate-cover-letter', {'data': COVER_LETTER_FORM}),
+    'generate-resume-stream': ('/generate-resume/stream', {'data': RESUME_FORM, 'stream': True}),
+    'tailor-resume': ('/api/tailor-resume', {'json': TAILOR_JSON}),
+}
+
+def run_load(target, scenario, concurrency=8, total_requests=None, duration=None, timeout=120, poll_interval=0.2):
+    """Closed-loop load: `concurrency` clients send requests back to back until done"""
+    path, options = SCENARIOS[scenario]
+    url = target.rstrip('/') + path
+    deadline = time.monotonic() + duration if duration else None
+    remaining = [total_requests if total_requests is not None else float('inf')]
+    lock = threading.Lock()
+    latencies, statuses = [], {}
+
+    def take_ticket():
+        with lock:
+            if remaining[0] <= 0 or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            remaining[0] -= 1
+            return True
+
+    def client():
+        session = requests.Session()
+        while take_ticket():
+            started = time.monotonic()
+            try:
+                # Redirects are how the form routes report failure, so they are not followed
+                response = session.post(url, allow_redirects=False, timeout=timeout, **options)
+                if options.get('stream') and response.status_code == 200:
+                    # The stream always answers 200; whether it worked is in its final event
+                    status = stream_status(response.iter_lines(decode_unicode=True))
+                else:
+                    response = wait_for_task(session, target, response, timeout, poll_interval)
+                    status = response.status_code if response.status_code != 302 else 'redirect'
+            except requests.RequestException as e:
+                status = type(e).__name__
+            elapsed = time.monotonic() - started
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    started = time.monotonic()
+    clients = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return summarise(scenario, concurrency, latencies, statuses, time.monotonic() - started)
+
+def stream_status(lines):
+    """200 if a server-sent event stream ended with `done`, else 'stream-error' or 'stream-incomplete'"""
+    last_event = None
+    for line in lines:
+        if line and line.startswith('event: '):
+            last_event = line[len('event: '):].strip()
+    if last_event == 'done':
+        return 200
+    return 'stream-error' if last_event == 'error' else 'stream-incomplete'
+
+def wait_for_task(session, target, response, timeout, poll_interval):
+    """Follow a queued generation to its end, so latency covers the whole generation.
+
+    The form routes redirect to /tasks/<id>, which keeps answering with a
+    refreshing waiting page; /api/tailor-resume answers 202 with a status URL.
+    Returns the final response (200 on success).
+    """
+    deadline = time.monotonic() + timeout
+    if response.status_code == 302 and '/tasks/' in response.headers.get('Location', ''):
+        task_url = requests.compat.urljoin(target + '/', response.headers['Location'])
+        while time.monotonic() < deadline:
+            response = session.get(task_url, allow_redirects=False, timeout=timeout)
+            if response.status_code != 200 or 'http-equiv="refresh"' not in response.text:
+                return response
+            time.sleep(poll_interval)
+    elif response.status_code == 202:
+        status_url = requests.compat.urljoin(target + '/', response.json()['status_url'])
+        while time.monotonic() < deadline:
+            response = session.get(status_url, timeout=timeout)
+            status = response.json().get('status') if response.status_code == 200 else None
+            if status == 'succeeded':
+                return response
+            if status not in ('queued', 'running'):
+                response.status_code = 500 if response.status_code == 200 else response.status_code
+                return response
+            time.sleep(poll_interval)
+    return response
+
+def summarise(scenario, concurrency, latencies, statuses, elapsed):
+    latencies.sort()
+    total = sum(statuses.values())
+    return {
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'requests': total,
+        'ok': len(latencies),
+        'statuses': {str(status): count for status, count in statuses.items()},
+        'elapsed_seconds': round(elapsed, 2),
+        'requests_per_second': round(total / elapsed, 2) if elapsed else 0.0,
+        'ok_per_second': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': _ms(sum(latencies) / len(latencies)) if latencies else None,
+            'p50': _ms(percentile(latencies, 50)),
+            'p95': _ms(percentile(latencies, 95)),
+            'p99': _ms(percentile(latencies, 99)),
+            'max': _ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+def spawn(args):
+    """Start the fake OpenAI server and the Flask app on free ports; return (app URL, fake server)"""
+    fake = fake_openai.start_in_thread(config=fake_openai.config_from_args(args))
+    # Services read their settings at import time, so the environment is set before importing the app
+    os.environ['OPENAI_BASE_URL'] = f"http://127.0.0.1:{fake.server_port}/v1"
+    os.environ.setdefault('OPENAI_API_KEY', 'fake-key')
+
+    from werkzeug.serving import make_server
+    from app import create_app
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, name='flask-app', daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", fake
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the generation routes and report latency/throughput")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='tailor-resume')
+    parser.add_argument('--target', default='http://127.0.0.1:5000', help="base URL of a running app")
+    parser.add_argument('--spawn', action='store_true', help="run the fake API and the app in this process")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, help="total requests (default 100 unless --duration is given)")
+    parser.add_argument('--duration', type=float, help="seconds to keep sending requests")
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--poll-interval', type=float, default=0.2, help="seconds between polls of a queued task")
+    fake_openai.add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.requests is None and args.duration is None:
+        args.requests = 100
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    target, fake = spawn(args) if args.spawn else (args.target, None)
+    report = run_load(
+        target, args.scenario, args.concurrency, args.requests, args.duration, args.timeout, args.poll_interval
+    )
+
+    # What the app saw: queueing and retries in the OpenAI client, cache hit rates, task and document worker counts
+    for name in ('openai-stats', 'cache-stats', 'task-stats', 'document-stats'):
+        try:
+            report[name] = requests.get(f"{target}/api/{name}", timeout=5).json()
+        except (requests.RequestException, ValueError):
+            pass
+    if fake is not None:
+        with fake.RequestHandlerClass.config.lock:
+            report['fake_api'] = dict(fake.RequestHandlerClass.config.counts)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
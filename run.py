@@ -1,7 +1,10 @@
 from app import create_app
 import ssl
 
-app = create_app()
+# Document worker processes are started with spawn, which re-runs this script as __mp_main__;
+# they only need the task functions, not another app and service graph
+if __name__ != '__mp_main__':
+    app = create_app()
 
 if __name__ == "__main__":
     # For development with self-signed certificate
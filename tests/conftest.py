@@ -0,0 +1,14 @@
+import pytest
+from loadtest import fake_openai
+
+@pytest.fixture
+def fake_api():
+    """A fake OpenAI server on a free port, with its .config and the .base_url to point a client at"""
+    server = fake_openai.start_in_thread(config=fake_openai.FakeOpenAIConfig(
+        latency_ms=5, latency_sigma=0.1, tokens_per_second=5000, completion_tokens=20, retry_after_ms=50, seed=1
+    ))
+    server.config = server.RequestHandlerClass.config
+    server.base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,34 @@
+import asyncio
+from app.services.async_openai_service import AsyncOpenAIService
+from app.services.completion_cache import CompletionCache
+from app.services.openai_client import AsyncOpenAIClientManager
+
+def make_service(fake_api, **kwargs):
+    manager = AsyncOpenAIClientManager(api_key='test', base_url=fake_api.base_url, backoff_base=0.01, **kwargs)
+    return AsyncOpenAIService(CompletionCache(), manager)
+
+def test_one_service_serves_successive_event_loops(fake_api):
+    service = make_service(fake_api, max_concurrency=2)
+
+    async def tailor():
+        # Several at once, so the semaphore is actually waited on
+        return await asyncio.gather(*(service.tailor_resume(f"resume {i}", "job") for i in range(4)))
+
+    # A second asyncio.run used to fail with "attached to a different loop"
+    assert len(asyncio.run(tailor())) == 4
+    assert len(asyncio.run(tailor())) == 4
+    assert service.client_stats()['completed'] == 8
+
+def test_async_cache_hits_skip_the_api(fake_api, tmp_path):
+    manager = AsyncOpenAIClientManager(api_key='test', base_url=fake_api.base_url)
+    service = AsyncOpenAIService(CompletionCache(db_path=str(tmp_path / 'completions.sqlite3')), manager)
+
+    async def twice():
+        first = await service.tailor_resume("resume", "job", use_cache=True)
+        second = await service.tailor_resume("resume", "job", use_cache=True)
+        await service.aclose()
+        return first, second
+
+    first, second = asyncio.run(twice())
+    assert first == second
+    assert fake_api.config.counts['completions'] == 1
@@ -0,0 +1,67 @@
+import json
+from app.services.async_openai_service import AsyncOpenAIService
+from app.services.batch_pipeline import BatchTailorPipeline
+from app.services.completion_cache import CompletionCache
+from app.services.document_service import DocumentService
+from app.services.openai_client import AsyncOpenAIClientManager
+
+IDS = ["a/b", "a_b", "x" * 100 + "1", "x" * 100 + "2", "plain"]
+
+def make_pipeline(fake_api, tmp_path):
+    manager = AsyncOpenAIClientManager(api_key='test', base_url=fake_api.base_url, backoff_base=0.01)
+    document_service = DocumentService()
+    document_service.output_folder = str(tmp_path)
+    return BatchTailorPipeline(AsyncOpenAIService(CompletionCache(), manager), document_service, concurrency=3)
+
+def write_jobs(path):
+    items = [{"id": item_id, "job_description": f"Python developer {item_id}"} for item_id in IDS]
+    items.append({"id": "plain", "job_description": "A second item with the same id"})
+    items.append({"id": "no-job"})
+    path.write_text("".join(json.dumps(item) + "\n" for item in items), encoding='utf-8')
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+def test_batch_run_writes_one_pdf_per_id(fake_api, tmp_path):
+    jobs, output = tmp_path / 'jobs.jsonl', tmp_path / 'results.jsonl'
+    write_jobs(jobs)
+
+    report = make_pipeline(fake_api, tmp_path).run(str(jobs), str(output), resume_text="My resume")
+
+    assert (report['succeeded'], report['failed'], report['duplicates']) == (5, 1, 1)
+    records = {record['id']: record for record in read_records(output)}
+    assert not records['no-job']['success']
+    # Ids that clean or truncate to the same name still get their own PDF
+    pdf_paths = {records[item_id]['pdf_path'] for item_id in IDS}
+    assert len(pdf_paths) == len(IDS)
+    assert all((tmp_path / path.split('/')[-1]).exists() for path in pdf_paths)
+    assert fake_api.config.counts['completions'] == 5
+
+def test_rerun_resumes_from_the_checkpoint(fake_api, tmp_path):
+    jobs, output = tmp_path / 'jobs.jsonl', tmp_path / 'results.jsonl'
+    write_jobs(jobs)
+    pipeline = make_pipeline(fake_api, tmp_path)
+    pipeline.run(str(jobs), str(output), resume_text="My resume")
+    # A run that died mid-write leaves half a line behind
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write('{"id": "plain", "succ')
+
+    report = pipeline.run(str(jobs), str(output), resume_text="My resume")
+    # Only the failed item runs again, and it fails before reaching the API
+    assert (report['skipped'], report['processed']) == (5, 1)
+    assert fake_api.config.counts['completions'] == 5
+
+    report = pipeline.run(str(jobs), str(output), resume_text="My resume", retry_failed=False)
+    assert (report['skipped'], report['processed']) == (6, 0)
+    # The rerun started on a fresh line after the partial one
+    lines = output.read_text(encoding='utf-8').splitlines()
+    assert lines[-2] == '{"id": "plain", "succ'
+    assert json.loads(lines[-1])['id'] == 'no-job'
+
+def test_checkpoint_lines_without_an_id_are_ignored(fake_api, tmp_path):
+    jobs, output = tmp_path / 'jobs.jsonl', tmp_path / 'results.jsonl'
+    write_jobs(jobs)
+    output.write_text('{"success": true}\n["not a record"]\n{"id": "plain", "success": true}\n', encoding='utf-8')
+
+    report = make_pipeline(fake_api, tmp_path).run(str(jobs), str(output), resume_text="My resume")
+    assert (report['skipped'], report['succeeded']) == (1, 4)
@@ -0,0 +1,43 @@
+import pytest
+from app import create_app
+from app.services import prompts, resume_service
+from app.services.completion_cache import CompletionCache
+from app.services.openai_client import OpenAIClientManager
+from app.services.openai_service import OpenAIService
+
+def make_service(fake_api):
+    manager = OpenAIClientManager(api_key='test', base_url=fake_api.base_url, backoff_base=0.01)
+    return OpenAIService(CompletionCache(), manager)
+
+def test_bundle_from_one_completion(fake_api):
+    bundle = make_service(fake_api).generate_bundle("My resume", "Python developer")
+    assert set(bundle) == set(prompts.BUNDLE_KEYS)
+    assert fake_api.config.counts['completions'] == 1
+
+def test_truncated_bundle_falls_back_to_separate_calls(fake_api):
+    # Longer than the bundle's max_tokens, so its JSON is cut off
+    fake_api.config.completion_tokens = 3600
+    service = make_service(fake_api)
+    bundle = service.generate_bundle("My resume", "Python developer", use_cache=True)
+    assert set(bundle) == set(prompts.BUNDLE_KEYS)
+    assert all(bundle.values())
+    assert fake_api.config.counts['completions'] == 4
+    # Nothing cut off was cached, so asking again goes back to the API
+    service.generate_bundle("My resume", "Python developer", use_cache=True)
+    assert fake_api.config.counts['completions'] == 8
+
+@pytest.mark.parametrize('content', ['{"tailored_resume": "x"', '["a list"]', '{"tailored_resume": "x"}'])
+def test_parse_bundle_rejects_unusable_replies(content):
+    with pytest.raises(ValueError):
+        prompts.parse_bundle(content)
+
+def test_unusable_bundle_is_a_bad_gateway(fake_api, monkeypatch):
+    def parse_bundle(content):
+        raise ValueError("Response is missing cover_letter")
+
+    monkeypatch.setattr(resume_service, 'openai_service', make_service(fake_api))
+    monkeypatch.setattr(prompts, 'parse_bundle', parse_bundle)
+    client = create_app().test_client()
+    response = client.post('/api/generate-bundle', json={'resume_text': "My resume", 'job_description': "Python"})
+    assert response.status_code == 502
+    assert "missing cover_letter" in response.get_json()['error']
@@ -0,0 +1,32 @@
+import importlib
+import time
+import pytest
+from app.services.document_executor import DocumentExecutor, _worker_processes
+
+# app.services also has a document_executor attribute (the shared instance), so fetch the module itself
+executor_module = importlib.import_module('app.services.document_executor')
+
+def test_hung_task_is_killed_and_the_pool_replaced():
+    executor = DocumentExecutor(workers=1, timeout=2)
+    try:
+        assert executor.run(abs, -3) == 3
+        with pytest.raises(ValueError, match="timed out"):
+            executor.run(time.sleep, 30, timeout=0.5)
+        assert executor.run(abs, -4) == 4
+        assert executor.stats()['restarts'] == 1
+    finally:
+        executor.shutdown()
+
+def test_pool_without_worker_recycling(monkeypatch):
+    # As on Python < 3.11, where ProcessPoolExecutor has no max_tasks_per_child
+    monkeypatch.setattr(executor_module, 'RECYCLES_WORKERS', False)
+    executor = DocumentExecutor(workers=1, timeout=10)
+    try:
+        assert executor.run(abs, -5) == 5
+    finally:
+        executor.shutdown()
+
+def test_worker_processes_tolerates_a_missing_attribute():
+    class Pool:
+        pass
+    assert _worker_processes(Pool()) == []
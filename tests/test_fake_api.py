@@ -0,0 +1,97 @@
+"""The OpenAI client, completion cache and batch job extraction against the local fake server"""
+
+import threading
+import time
+import uuid
+import pytest
+from openai import RateLimitError
+from app import create_app
+from app.services import scraper, task_queue
+from app.services.completion_cache import CompletionCache
+from app.services.openai_client import OpenAIClientManager
+from app.services.openai_service import OpenAIService
+
+def make_service(fake_api, **kwargs):
+    manager = OpenAIClientManager(api_key='test', base_url=fake_api.base_url, backoff_base=0.01, **kwargs)
+    return OpenAIService(CompletionCache(), manager)
+
+def test_retry_after_is_waited_out_before_retrying(fake_api):
+    # Rate limited once, then fine
+    errors = iter([429])
+    fake_api.config.injected_error = lambda: next(errors, None)
+    fake_api.config.retry_after_ms = 300
+    service = make_service(fake_api)
+
+    started = time.monotonic()
+    assert service.tailor_resume("My resume", "Python developer")
+    # backoff_base alone would have retried after about 10ms
+    assert time.monotonic() - started >= 0.3
+    assert fake_api.config.counts['429'] == 1
+    assert service.client_stats()['retries'] == 1
+
+def test_rate_limit_gives_up_after_max_retries(fake_api):
+    fake_api.config.rate_429 = 1.0
+    manager = OpenAIClientManager(api_key='test', base_url=fake_api.base_url, max_retries=2, backoff_base=0.01)
+    with pytest.raises(RateLimitError):
+        manager.complete({"model": "fake", "messages": [{"role": "user", "content": "hi"}], "max_tokens": 5})
+    assert fake_api.config.counts['429'] == 3
+    assert manager.stats()['failures'] == 1
+
+def test_completion_cache_answers_repeats(fake_api):
+    service = make_service(fake_api)
+    first = service.tailor_resume("My resume", "Python developer", use_cache=True)
+    assert service.tailor_resume("My resume", "Python developer", use_cache=True) == first
+    assert fake_api.config.counts['completions'] == 1
+    assert service.cache_stats()['memory_hits'] == 1
+    # Off by default for tailoring: a new draft every time
+    service.tailor_resume("My resume", "Python developer")
+    assert fake_api.config.counts['completions'] == 2
+
+def test_double_submitted_api_tailor_is_served_from_the_cache(fake_api, monkeypatch):
+    monkeypatch.setitem(task_queue._tasks, 'tailor_resume', make_service(fake_api).tailor_resume)
+    client = create_app().test_client()
+    body = {'resume_text': f"My resume {uuid.uuid4()}", 'job_description': "Python developer"}
+
+    results = []
+    for _ in range(2):
+        status_url = client.post('/api/tailor-resume', json=body).get_json()['status_url']
+        deadline = time.monotonic() + 10
+        while (task := client.get(status_url).get_json())['status'] not in ('succeeded', 'failed'):
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+        results.append(task['result'])
+
+    assert results[0] == results[1]
+    assert fake_api.config.counts['completions'] == 1
+
+def test_extract_jobs_fetches_concurrently_within_the_per_host_cap(monkeypatch):
+    delay = 0.2
+    running = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def fetch_job_description(url, cached=None):
+        host = url.split('/')[2]
+        with lock:
+            running[host] = running.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), running[host])
+        time.sleep(delay)
+        with lock:
+            running[host] -= 1
+        return {"job_description": f"Job posting at {url}"}
+
+    monkeypatch.setattr(scraper, 'fetch_job_description', fetch_job_description)
+    run = uuid.uuid4().hex
+    urls = [f"https://jobs{i % 4}.example.com/{run}/{i}" for i in range(8)]
+    client = create_app().test_client()
+
+    started = time.monotonic()
+    response = client.post('/api/extract-jobs', json={'urls': urls})
+    elapsed = time.monotonic() - started
+
+    body = response.get_json()
+    assert body['success']
+    assert [result['url'] for result in body['results']] == urls
+    # Eight fetches over four hosts overlap instead of taking 8 * delay
+    assert elapsed < 4 * delay
+    assert max(peak.values()) <= scraper.per_host_limit
@@ -0,0 +1,7 @@
+from loadtest.harness import stream_status
+
+def test_stream_counts_as_ok_only_when_it_ends_with_done():
+    assert stream_status(['event: meta', 'data: {}', '', 'data: {"text": "Hi"}', '', 'event: done', 'data: {}']) == 200
+    assert stream_status(['event: meta', 'data: {}', '', 'event: error', 'data: {"message": "x"}']) == 'stream-error'
+    # Cut off before the server said anything final
+    assert stream_status(['event: meta', 'data: {}', '', 'data: {"text": "Hi"}']) == 'stream-incomplete'
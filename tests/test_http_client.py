@@ -0,0 +1,70 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.http_client import PooledHttpClient
+
+
+class RedirectHandler(BaseHTTPRequestHandler):
+    """Sets a session cookie on redirect and only serves the page when it comes back"""
+
+    def do_GET(self):
+        if self.path == '/start':
+            self.send_response(302)
+            self.send_header('Location', '/page')
+            self.send_header('Set-Cookie', 'guest=1; Path=/')
+            self.end_headers()
+            return
+        status = 200 if 'guest=1' in (self.headers.get('Cookie') or '') else 403
+        body = (self.headers.get('Cookie') or '').encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def redirect_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RedirectHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_cookie_set_on_redirect_is_sent_on_next_hop(redirect_server):
+    client = PooledHttpClient(max_retries=0)
+    try:
+        response = client.get(f"{redirect_server}/start")
+        assert response.status_code == 200
+        assert response.text == 'guest=1'
+    finally:
+        client.close()
+
+
+def test_cookies_do_not_carry_over_between_fetches(redirect_server):
+    client = PooledHttpClient(max_retries=0)
+    try:
+        client.get(f"{redirect_server}/start")
+        assert len(client.session.cookies) == 0
+        assert client.get(f"{redirect_server}/page").status_code == 403
+    finally:
+        client.close()
+
+
+def test_threads_share_connection_pools_but_not_sessions(redirect_server):
+    client = PooledHttpClient(max_retries=0)
+    seen = []
+    try:
+        thread = threading.Thread(target=lambda: seen.append(client.session))
+        thread.start()
+        thread.join()
+        assert seen[0] is not client.session
+        assert seen[0].get_adapter('http://x') is client.session.get_adapter('http://x')
+    finally:
+        client.close()
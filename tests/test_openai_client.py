@@ -0,0 +1,74 @@
+import threading
+import time
+import httpx
+from openai import APIStatusError
+from app.services.openai_client import OpenAIClientManager, _retry_delay
+
+def status_error(status, headers):
+    request = httpx.Request('POST', 'https://api.example.test/v1/chat/completions')
+    response = httpx.Response(status, headers=headers, request=request)
+    return APIStatusError("error", response=response, body=None)
+
+RESET_HEADERS = {'x-ratelimit-reset-requests': '30s', 'x-ratelimit-reset-tokens': '20s'}
+
+def test_rate_limit_reset_headers_only_apply_to_429():
+    assert _retry_delay(status_error(429, RESET_HEADERS), 0, 0.5, 60) >= 30
+    # The same headers on a 5xx are just the usual rate-limit report
+    assert _retry_delay(status_error(500, RESET_HEADERS), 0, 0.5, 60) <= 0.5
+    assert _retry_delay(status_error(502, RESET_HEADERS), 2, 0.5, 60) <= 2.0
+
+def test_retry_after_is_honoured_for_429_and_503():
+    assert 1.5 <= _retry_delay(status_error(429, {'retry-after-ms': '1500'}), 0, 0.1, 60) <= 1.6
+    assert 2.0 <= _retry_delay(status_error(503, {'retry-after': '2'}), 0, 0.1, 60) <= 2.1
+    assert _retry_delay(status_error(429, {'retry-after': '120'}), 0, 0.1, 30) <= 30.1
+
+def test_slot_is_released_while_backing_off():
+    manager = OpenAIClientManager(max_concurrency=1, max_retries=1, backoff_base=0.5, backoff_max=0.5)
+    calls = []
+
+    def flaky():
+        calls.append('flaky')
+        if len(calls) == 1:
+            raise status_error(429, {'retry-after-ms': '500'})
+        return 'retried'
+
+    thread = threading.Thread(target=lambda: calls.append(manager._with_retries(flaky)))
+    thread.start()
+    time.sleep(0.1)
+    # The only slot is free while the first call sleeps, so this one doesn't wait for it
+    started = time.monotonic()
+    assert manager._with_retries(lambda: 'other') == 'other'
+    assert time.monotonic() - started < 0.3
+    thread.join()
+    assert calls[-1] == 'retried'
+
+STREAM_REQUEST = {"model": "fake", "messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+
+def test_stream_holds_its_slot_until_it_ends(fake_api):
+    fake_api.config.tokens_per_second = 50
+    fake_api.config.completion_tokens = 10
+    manager = OpenAIClientManager(api_key='test', base_url=fake_api.base_url, max_concurrency=1)
+    chunks = manager.stream(STREAM_REQUEST)
+    next(chunks)
+
+    waited = []
+    thread = threading.Thread(target=lambda: waited.append(manager.complete(STREAM_REQUEST)))
+    thread.start()
+    time.sleep(0.05)
+    # The only slot belongs to the open stream
+    assert manager.stats()['waiting'] == 1
+    assert not waited
+
+    list(chunks)
+    thread.join(timeout=5)
+    assert waited
+    assert manager.stats()['in_flight'] == 0
+
+def test_closing_a_stream_early_frees_its_slot(fake_api):
+    fake_api.config.tokens_per_second = 50
+    manager = OpenAIClientManager(api_key='test', base_url=fake_api.base_url, max_concurrency=1)
+    chunks = manager.stream(STREAM_REQUEST)
+    next(chunks)
+    chunks.close()
+    assert manager.stats()['in_flight'] == 0
+    assert manager.complete(STREAM_REQUEST)
@@ -0,0 +1,24 @@
+import pytest
+from app.utils.pdf_render import LAYOUTS, PdfLayout, get_layout, register_fonts, render_pdf
+
+def test_layouts_must_implement_styles_and_story():
+    with pytest.raises(TypeError):
+        PdfLayout(register_fonts())
+
+    class Incomplete(PdfLayout):
+        def build_styles(self, fonts):
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete(register_fonts())
+
+def test_classic_layout_keeps_helvetica():
+    styles = get_layout('classic').styles
+    assert styles['title'].fontName == 'Helvetica-Bold'
+    assert styles['normal'].fontName == 'Helvetica'
+
+@pytest.mark.parametrize('layout', sorted(LAYOUTS))
+def test_every_layout_renders(layout, tmp_path):
+    path = render_pdf("Ada Lovelace\n\nSkills: Python & <C>\nAnalytical Engine", str(tmp_path / 'out.pdf'), layout)
+    with open(path, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
@@ -0,0 +1,74 @@
+from app.services.prompt_budget import PromptBudget, compress_job_description, requirement_sections
+from app.services.scraper import JobScraper
+
+# Short lines with no blank lines between them, the way many postings are scraped
+POSTING = "\n".join([
+    "Requirements",
+    "5+ years with Python",
+    "Experience with privacy regulations",
+    "Strong SQL skills",
+    "Benefits",
+    "Health insurance",
+    "401k match",
+])
+
+def test_short_bullets_do_not_end_a_section():
+    compressed = compress_job_description(POSTING)
+    assert "Experience with privacy regulations" in compressed
+    assert "5+ years with Python" in compressed
+    assert "Health insurance" not in compressed
+    assert "401k match" not in compressed
+    assert "Benefits" not in compressed
+
+def test_requirement_sections_keep_every_requirement():
+    assert requirement_sections(POSTING).splitlines() == [
+        "Requirements",
+        "5+ years with Python",
+        "Experience with privacy regulations",
+        "Strong SQL skills",
+    ]
+
+def test_colon_and_blank_line_headings():
+    posting = "What we offer:\nUnlimited PTO\n\nwho you are\n\nA Python engineer\n- Snacks and perks"
+    compressed = compress_job_description(posting)
+    assert "Unlimited PTO" not in compressed
+    assert "A Python engineer" in compressed
+    # A list item is never a heading, whatever it says
+    assert "- Snacks and perks" in compressed
+
+def test_list_markers_are_not_headings():
+    posting = "Requirements:\n- Benefits administration experience\n- Python"
+    assert requirement_sections(posting).splitlines() == posting.splitlines()
+
+def test_boilerplate_text_dropped_anywhere():
+    posting = "Requirements:\nPython\nWe are an equal opportunity employer and value diversity."
+    assert "equal opportunity" not in compress_job_description(posting)
+
+def test_fit_leaves_text_under_budget_alone():
+    budget = PromptBudget({'tailor_resume': 1000})
+    job_description = POSTING + "\nRequirements\nRequirements"
+    assert budget.fit('tailor_resume', "My resume", job_description) == ("My resume", job_description)
+
+def test_fit_compresses_and_trims_over_budget():
+    budget = PromptBudget({'tailor_resume': 100})
+    job_description = POSTING + "\n" + "\n".join(f"Benefit number {i} is great" for i in range(100))
+    resume = "Resume line\n" * 200
+    text, compressed = budget.fit('tailor_resume', resume, job_description)
+    assert "Experience with privacy regulations" in compressed
+    assert "Benefit number" not in compressed
+    assert len(text) < len(resume)
+
+def test_scraped_postings_keep_their_headings():
+    scraper = JobScraper()
+    html = """<html><body><div class="description__text">
+        <h3>Requirements</h3><ul><li>5+ years with Python</li><li>Experience with privacy regulations</li></ul>
+        <h3>Benefits</h3><ul><li>Health insurance</li><li>401k match</li></ul>
+        <p>Apply now to join a team that ships reliable data pipelines every week.</p>
+    </div></body></html>"""
+    extractor = scraper.registry.for_url('https://www.linkedin.com/jobs/view/1')
+    text = scraper._parse_page(html, extractor, extractor.display_name)
+
+    assert text.splitlines()[:3] == ["Requirements", "5+ years with Python", "Experience with privacy regulations"]
+    compressed = compress_job_description(text)
+    assert "5+ years with Python" in compressed
+    assert "Health insurance" not in compressed
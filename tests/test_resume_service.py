@@ -0,0 +1,44 @@
+import threading
+import time
+from app.services.resume_service import ResumeService
+
+class SlowJobSite:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def fetch(self, url):
+        time.sleep(self.delay)
+        return {"success": True, "job_description": "Python developer with Flask and SQL experience " * 3}
+
+class TextDocuments:
+    def extract_text_from_file(self, file):
+        return file.read().decode('utf-8')
+
+class Upload:
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.data = data
+
+    def read(self):
+        return self.data
+
+def test_job_page_fetches_do_not_queue_behind_one_pool():
+    service = ResumeService(scraper=None, document_service=TextDocuments(), stage_workers=1)
+    service.process_job_url = SlowJobSite(0.3).fetch
+    results = []
+
+    def process(i):
+        upload = Upload(f"resume{i}.txt", b"Python Flask engineer")
+        results.append(service.process_resume(upload, job_url=f"https://jobs.example.com/{i}"))
+
+    threads = [threading.Thread(target=process, args=(i,)) for i in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Each request fetches on its own thread, so four fetches take about as long as one
+    assert time.monotonic() - start < 0.9
+    assert [result["success"] for result in results] == [True] * 4
+    assert results[0]["resume_text"] == "Python Flask engineer"
@@ -0,0 +1,144 @@
+import threading
+import time
+from app.services.job_cache import JobDescriptionCache
+from app.services.rate_limiter import HostRateLimiter, SqliteRateLimitBackend
+from app.services.resume_service import ResumeService
+from app.services.scraper import JobScraper
+
+PAGE = "<html><body><article>" + "".join(
+    f"<p>Responsibility {i}: build and run reliable Python services for our hiring platform.</p>" for i in range(6)
+) + "</article></body></html>"
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ValueError(f"HTTP {self.status_code}")
+
+class FakeHttp:
+    """Stands in for PooledHttpClient: returns queued responses and records each request's headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=15, **kwargs):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+def make_scraper(*responses):
+    return JobScraper(http_client=FakeHttp(*responses), rate_limiter=HostRateLimiter(min_interval=0))
+
+def slow_fetches(scraper, delay):
+    """Replace the scraper's fetch with one that sleeps; returns the per-host peak concurrency"""
+    running, peak = {}, {}
+    lock = threading.Lock()
+
+    def fetch_job_description(url, cached=None):
+        host = url.split('/')[2]
+        with lock:
+            running[host] = running.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), running[host])
+        time.sleep(delay)
+        with lock:
+            running[host] -= 1
+        return {"job_description": f"Job posting at {url}"}
+
+    scraper.fetch_job_description = fetch_job_description
+    return peak
+
+def test_busy_host_does_not_hold_up_other_hosts():
+    scraper = JobScraper(batch_workers=8, per_host_limit=2)
+    peak = slow_fetches(scraper, 0.2)
+    urls = [f"https://a.example.com/{i}" for i in range(16)]
+    urls += ["https://b.example.com/1", "https://c.example.com/1"]
+
+    started = time.monotonic()
+    finished = {}
+    for index, result in scraper.iter_extract_many(urls):
+        assert result["success"]
+        finished[urls[index]] = time.monotonic() - started
+
+    # Only two of the 16 a.example.com fetches run at once, and no pool thread waits on them
+    assert finished["https://b.example.com/1"] < 0.35
+    assert finished["https://c.example.com/1"] < 0.35
+    assert peak["a.example.com"] == 2
+    assert max(finished.values()) >= 8 * 0.2
+
+def test_host_cap_is_shared_between_batches():
+    scraper = JobScraper(batch_workers=8, per_host_limit=2)
+    peak = slow_fetches(scraper, 0.05)
+    batches = [[f"https://a.example.com/{batch}/{i}" for i in range(4)] for batch in range(3)]
+    results = []
+    threads = [threading.Thread(target=lambda urls=urls: results.append(scraper.extract_many(urls))) for urls in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak["a.example.com"] == 2
+    assert sorted(result["url"] for batch in results for result in batch) == sorted(sum(batches, []))
+    assert not scraper._host_active and not scraper._host_waiting
+
+def test_200_stores_validators_and_304_reuses_the_description():
+    validators = {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+    scraper = make_scraper(FakeResponse(200, PAGE, validators), FakeResponse(304))
+    url = "https://careers.example.com/jobs/1"
+
+    page = scraper.fetch_job_description(url)
+    assert (page['etag'], page['last_modified'], page['not_modified']) == ('"v1"', validators['Last-Modified'], False)
+    assert 'If-None-Match' not in scraper.http.requests[0]
+
+    revalidated = scraper.fetch_job_description(url, cached=page)
+    assert scraper.http.requests[1]['If-None-Match'] == '"v1"'
+    assert scraper.http.requests[1]['If-Modified-Since'] == validators['Last-Modified']
+    assert revalidated['not_modified']
+    assert revalidated['job_description'] == page['job_description']
+    assert revalidated['etag'] == '"v1"'
+
+def test_process_job_url_revalidates_a_stale_cache_entry():
+    scraper = make_scraper(FakeResponse(200, PAGE, {'ETag': '"v1"'}), FakeResponse(304, headers={'ETag': '"v2"'}))
+    job_cache = JobDescriptionCache(ttl=0.05, stale_ttl=60)
+    service = ResumeService(scraper, None, job_cache=job_cache)
+    url = "https://careers.example.com/jobs/2"
+
+    first = service.process_job_url(url)
+    time.sleep(0.1)
+    second = service.process_job_url(url)
+
+    assert second['success'] and second['job_description'] == first['job_description']
+    assert scraper.http.requests[1]['If-None-Match'] == '"v1"'
+    # The 304 refreshed the entry, with the validator it sent
+    entry = job_cache.lookup(url)
+    assert entry.fresh and entry.value['etag'] == '"v2"'
+    assert len(scraper.http.requests) == 2
+
+def test_rate_limiter_spaces_one_host_but_not_others():
+    limiter = HostRateLimiter(min_interval=0.2)
+    assert limiter.wait("https://a.example.com/1") == 0
+    assert limiter.wait("https://b.example.com/1") == 0
+
+    started = time.monotonic()
+    waited = limiter.wait("https://a.example.com/2")
+    assert 0.1 < waited <= 0.2
+    assert time.monotonic() - started >= waited
+    assert limiter.wait("https://c.example.com/1") == 0
+
+def test_rate_limiter_burst_allows_back_to_back_requests():
+    limiter = HostRateLimiter(min_interval=0.2, burst=2)
+    assert limiter.wait("https://a.example.com/1") == 0
+    assert limiter.wait("https://a.example.com/2") == 0
+    assert limiter.wait("https://a.example.com/3") > 0.1
+
+def test_sqlite_backend_spaces_requests_across_limiters(tmp_path):
+    # Two limiters on one file stand in for two web worker processes
+    db_path = str(tmp_path / 'rate.sqlite3')
+    first = HostRateLimiter(min_interval=0.2, backend=SqliteRateLimitBackend(db_path))
+    second = HostRateLimiter(min_interval=0.2, backend=SqliteRateLimitBackend(db_path))
+    assert first.wait("https://a.example.com/1") == 0
+    assert second.wait("https://a.example.com/2") > 0.1
+    assert second.wait("https://b.example.com/1") == 0
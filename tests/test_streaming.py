@@ -0,0 +1,55 @@
+import json
+from app import create_app
+from app.services import resume_service
+from app.services.completion_cache import CompletionCache
+from app.services.openai_client import OpenAIClientManager
+from app.services.openai_service import OpenAIService
+
+FORM = {
+    'full_name': "Ada Lovelace",
+    'email': "ada@example.com",
+    'professional_summary': "Engineer",
+    'work_experience': "Analytical Engine",
+    'education': "Private tutors",
+    'background_summary': "Engineer",
+}
+
+def events(response):
+    parsed = []
+    for raw in response.get_data(as_text=True).strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in raw.split('\n'))
+        parsed.append((lines.get('event', 'message'), json.loads(lines['data'])))
+    return parsed
+
+def use_fake_api(monkeypatch, fake_api):
+    manager = OpenAIClientManager(api_key='test', base_url=fake_api.base_url)
+    monkeypatch.setattr(resume_service, 'openai_service', OpenAIService(CompletionCache(), manager))
+
+def test_job_url_is_fetched_inside_the_stream(fake_api, monkeypatch):
+    use_fake_api(monkeypatch, fake_api)
+    fetched = []
+
+    def process_job_url(url):
+        fetched.append(url)
+        return {"success": True, "job_description": "Python developer"}
+
+    monkeypatch.setattr(resume_service, 'process_job_url', process_job_url)
+    client = create_app().test_client()
+    response = client.post('/generate-resume/stream', data={**FORM, 'job_url': "https://jobs.example.com/1"},
+                           buffered=False)
+    # The response has started before the job page is fetched
+    assert response.status_code == 200
+    assert fetched == []
+
+    names = [name for name, _ in events(response)]
+    assert fetched == ["https://jobs.example.com/1"]
+    assert names[:3] == ['meta', 'progress', 'meta']
+    assert names[-1] == 'done'
+
+def test_failed_job_url_is_an_error_event(fake_api, monkeypatch):
+    use_fake_api(monkeypatch, fake_api)
+    monkeypatch.setattr(resume_service, 'process_job_url',
+                        lambda url: {"success": False, "message": "Could not read that job posting"})
+    client = create_app().test_client()
+    response = client.post('/generate-cover-letter/stream', data={**FORM, 'job_url': "https://jobs.example.com/1"})
+    assert events(response)[-1] == ('error', {"message": "Could not read that job posting"})
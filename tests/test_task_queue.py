@@ -0,0 +1,80 @@
+import time
+import pytest
+from app.services.task_queue import TaskQueue, SqliteTaskStore, RUNNING, SUCCEEDED, FAILED
+from app.utils.validators import validate_callback_url
+
+def wait_for(queue, task_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        record = queue.get(task_id)
+        if record['status'] in (SUCCEEDED, FAILED):
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"task {task_id} did not finish")
+
+def test_sqlite_store_is_shared_between_queues(tmp_path):
+    db_path = str(tmp_path / 'tasks.sqlite3')
+    # Two queues on one file stand in for two web worker processes
+    first = TaskQueue(SqliteTaskStore(db_path), workers=1)
+    second = TaskQueue(SqliteTaskStore(db_path), workers=1)
+    first.register('double', lambda value: {'value': value * 2})
+
+    task_id = first.submit('double', value=21)
+    assert wait_for(second, task_id)['result'] == {'value': 42}
+    assert second.stats()[SUCCEEDED] == 1
+
+def test_sqlite_store_records_failures(tmp_path):
+    queue = TaskQueue(SqliteTaskStore(str(tmp_path / 'tasks.sqlite3')), workers=1)
+
+    def fail():
+        raise ValueError("no job description")
+    queue.register('fail', fail)
+    record = wait_for(queue, queue.submit('fail'))
+    assert record['status'] == FAILED
+    assert record['error'] == "no job description"
+
+def test_sqlite_store_drops_expired_and_excess_records(tmp_path):
+    store = SqliteTaskStore(str(tmp_path / 'tasks.sqlite3'), ttl=60, max_records=2)
+    now = time.time()
+    for index, finished_at in enumerate([now - 120, now - 3, now - 2, now - 1]):
+        store.save({'id': str(index), 'status': SUCCEEDED, 'finished_at': finished_at})
+    store.save({'id': 'running', 'status': RUNNING, 'finished_at': None})
+    assert store.get('0') is None
+    assert store.get('1') is None
+    assert store.get('2') and store.get('3') and store.get('running')
+
+def test_callback_urls_must_be_https_on_public_hosts():
+    for url in ('http://example.com/hook', 'https://127.0.0.1/hook', 'https://169.254.169.254/latest/meta-data',
+                'https://localhost:8080/hook', 'https://10.1.2.3/hook', 'https://[::1]/hook', 'not a url'):
+        assert not validate_callback_url(url), url
+    assert validate_callback_url('https://8.8.8.8/hook')
+
+def test_callback_allowlist():
+    allowed = ('example.com',)
+    assert validate_callback_url('https://hooks.example.com/x', allowed)
+    assert not validate_callback_url('https://example.com.evil.net/x', allowed)
+    assert not validate_callback_url('http://example.com/x', allowed)
+
+def test_queue_rejects_disallowed_callbacks(tmp_path):
+    queue = TaskQueue(SqliteTaskStore(str(tmp_path / 'tasks.sqlite3')), callback_validator=validate_callback_url)
+    queue.register('noop', lambda: None)
+    with pytest.raises(ValueError):
+        queue.submit('noop', callback_url='https://169.254.169.254/latest')
+
+def test_sqlite_store_file_is_private(tmp_path):
+    db_path = tmp_path / 'tasks.sqlite3'
+    SqliteTaskStore(str(db_path))
+    assert db_path.stat().st_mode & 0o777 == 0o600
+
+def test_task_left_running_is_reported_failed_after_the_timeout():
+    queue = TaskQueue(task_timeout=60)
+    # As left behind by a worker process that died mid-task
+    queue.store.save({'id': 'lost', 'name': 'tailor_resume', 'status': RUNNING, 'result': None, 'error': None,
+                      'created_at': time.time() - 120, 'started_at': time.time() - 120, 'finished_at': None})
+    queue.store.save({'id': 'busy', 'name': 'tailor_resume', 'status': RUNNING, 'result': None, 'error': None,
+                      'created_at': time.time() - 5, 'started_at': time.time() - 5, 'finished_at': None})
+
+    lost = queue.get('lost')
+    assert lost['status'] == FAILED
+    assert "did not finish within 60 seconds" in lost['error']
+    assert queue.get('busy')['status'] == RUNNING
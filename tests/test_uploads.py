@@ -0,0 +1,49 @@
+import hashlib
+import io
+import pytest
+from flask import request
+from app import create_app
+from app.utils.uploads import SpooledUpload, configure_uploads, format_size
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, MAX_UPLOAD_FILE_BYTES=512 * 1024, UPLOAD_SPOOL_THRESHOLD=1024)
+    configure_uploads(app)
+    return app
+
+def test_oversized_upload_to_process_is_413(app):
+    response = app.test_client().post('/process', data={
+        'job_description': 'Python engineer',
+        'resume': (io.BytesIO(b'x' * (600 * 1024)), 'resume.txt'),
+    })
+    assert response.status_code == 413
+    assert b'512 KB' in response.data
+
+def test_oversized_upload_to_api_is_json_413(app):
+    @app.route('/api/echo-upload', methods=['POST'])
+    def echo_upload():
+        return {'size': request.files['file'].stream.size}
+
+    response = app.test_client().post('/api/echo-upload', data={'file': (io.BytesIO(b'x' * (600 * 1024)), 'a.txt')})
+    assert response.status_code == 413
+    assert response.get_json() == {'error': 'The uploaded file is larger than the 512 KB limit.'}
+
+def test_large_uploads_spool_to_a_named_file():
+    upload = SpooledUpload(spool_threshold=1024)
+    data = b'resume ' * 1000
+    upload.write(data[:500])
+    assert not upload.on_disk and upload.path is None
+    upload.write(data[500:])
+    assert upload.on_disk
+    with open(upload.path, 'rb') as f:
+        assert f.read() == data
+    with upload.view() as view:
+        assert bytes(view) == data
+    assert upload.sha256 == hashlib.sha256(data).hexdigest()
+    upload.close()
+
+@pytest.mark.parametrize('size, text', [(900, '900 bytes'), (1024, '1 KB'), (256 * 1024, '256 KB'),
+                                        (1536 * 1024, '1.5 MB'), (16 * 1024 * 1024, '16 MB')])
+def test_format_size(size, text):
+    assert format_size(size) == text